@@ -302,10 +302,12 @@ async def handle_slash_command(command: str, agent: Agent, thread: Any) -> Optio
 
     # Handle /clear command (doesn't require copilot)
     if cmd == "clear":
-        from agent.workflows import get_result_store
+        from agent.workflows import flush_pending_stores, get_result_store
         from agent.activity import get_activity_tracker
         from agent.utils.terminal import clear_screen
 
+        # Let in-flight stores land first so they are cleared too
+        await flush_pending_stores()
         result_store = get_result_store()
         await result_store.clear()
 
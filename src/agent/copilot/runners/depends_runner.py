@@ -626,11 +626,11 @@ IMPORTANT: "core" is always analyzed as the base dependency. Providers are: core
                 )
                 continue
 
-            # Get service-level counts
-            major = data.get("major_updates", 0)
-            minor = data.get("minor_updates", 0)
-            patch = data.get("patch_updates", 0)
-            total = data.get("total_dependencies", 0)
+            # Get service-level counts (always initialized by the tracker)
+            major = data["major_updates"]
+            minor = data["minor_updates"]
+            patch = data["patch_updates"]
+            total = data["total_dependencies"]
 
             total_major += major
             total_minor += minor
@@ -1106,9 +1106,10 @@ class StatusRunner(BaseRunner):
             with console.status(spinner_msg, spinner="dots"):
                 if is_gitlab:
                     gitlab_client = GitLabDirectClient(agent_config)
-                    status_data = await gitlab_client.get_all_status(
-                        self.services, self.providers or ["Azure", "Core"]
-                    )
+                    async with gitlab_client:
+                        status_data = await gitlab_client.get_all_status(
+                            self.services, self.providers or ["Azure", "Core"]
+                        )
                 else:
                     github_client = GitHubDirectClient(agent_config)
                     status_data = await github_client.get_all_status(self.services)
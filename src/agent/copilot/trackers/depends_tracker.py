@@ -50,25 +50,26 @@ class DependsTracker(BaseTracker):
             **kwargs: Additional fields (major_updates, minor_updates, patch_updates,
                      total_dependencies, outdated_dependencies, report_id, top_updates)
         """
-        self.services[service]["status"] = status
-        self.services[service]["details"] = details
-        self.services[service]["icon"] = self.get_icon(status)
+        service_data = self.services[service]
+        service_data["status"] = status
+        service_data["details"] = details
+        service_data["icon"] = self.get_icon(status)
 
         # Update dependency counts if provided
         if "major_updates" in kwargs:
-            self.services[service]["major_updates"] = kwargs["major_updates"]
+            service_data["major_updates"] = kwargs["major_updates"]
         if "minor_updates" in kwargs:
-            self.services[service]["minor_updates"] = kwargs["minor_updates"]
+            service_data["minor_updates"] = kwargs["minor_updates"]
         if "patch_updates" in kwargs:
-            self.services[service]["patch_updates"] = kwargs["patch_updates"]
+            service_data["patch_updates"] = kwargs["patch_updates"]
         if "total_dependencies" in kwargs:
-            self.services[service]["total_dependencies"] = kwargs["total_dependencies"]
+            service_data["total_dependencies"] = kwargs["total_dependencies"]
         if "outdated_dependencies" in kwargs:
-            self.services[service]["outdated_dependencies"] = kwargs["outdated_dependencies"]
+            service_data["outdated_dependencies"] = kwargs["outdated_dependencies"]
         if "report_id" in kwargs:
-            self.services[service]["report_id"] = kwargs["report_id"]
+            service_data["report_id"] = kwargs["report_id"]
         if "top_updates" in kwargs:
-            self.services[service]["top_updates"] = kwargs["top_updates"]
+            service_data["top_updates"] = kwargs["top_updates"]
 
     def get_table(self) -> Table:
         """Generate Rich table of dependency analysis status"""
@@ -129,12 +130,13 @@ class DependsTracker(BaseTracker):
             "error_services": 0,
         }
 
+        # Every count key is set by _initialize_services, so index directly
         for data in self.services.values():
-            summary["major_updates"] += data.get("major_updates", 0)
-            summary["minor_updates"] += data.get("minor_updates", 0)
-            summary["patch_updates"] += data.get("patch_updates", 0)
-            summary["total_dependencies"] += data.get("total_dependencies", 0)
-            summary["outdated_dependencies"] += data.get("outdated_dependencies", 0)
+            summary["major_updates"] += data["major_updates"]
+            summary["minor_updates"] += data["minor_updates"]
+            summary["patch_updates"] += data["patch_updates"]
+            summary["total_dependencies"] += data["total_dependencies"]
+            summary["outdated_dependencies"] += data["outdated_dependencies"]
 
             if data["status"] in ["success", "complete"]:
                 summary["completed_services"] += 1
@@ -2,9 +2,12 @@
 
 import asyncio
 import logging
+import time
 from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, cast
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, cast
+
+from gitlab.exceptions import GitlabError
 
 from agent.config import AgentConfig
 from agent.gitlab.direct_client import GitLabDirectClient
@@ -15,6 +18,48 @@ logger = logging.getLogger(__name__)
 # ADR label variants used in OSDU
 ADR_LABELS = ["ADR", "ADR::Proposed", "ADR::Approved", "Issue::ADR"]
 
+# Analysis results keyed by (kind, projects, start, end). Reports run back to back
+# (comparison, then trends, then contributions) share periods, so results are kept
+# briefly to skip refetching them from GitLab without serving stale data for long.
+_ANALYSIS_CACHE_TTL_SECONDS = 5 * 60
+_analysis_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+
+
+def _analysis_cache_key(
+    kind: str,
+    project_paths: List[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> Tuple[Any, ...]:
+    """Build the cache key for an analysis over the given projects and period."""
+    return (kind, tuple(sorted(project_paths)), start_date, end_date)
+
+
+def _get_cached_analysis(key: Tuple[Any, ...]) -> Optional[Any]:
+    """Return a cached analysis result if it has not expired."""
+    entry = _analysis_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _ANALYSIS_CACHE_TTL_SECONDS:
+        return entry[1]
+    return None
+
+
+def _store_cached_analysis(key: Tuple[Any, ...], value: Any) -> None:
+    """Cache an analysis result, dropping expired entries so the cache cannot grow unbounded."""
+    now = time.monotonic()
+    expired = [
+        cached_key
+        for cached_key, (stored_at, _) in _analysis_cache.items()
+        if now - stored_at >= _ANALYSIS_CACHE_TTL_SECONDS
+    ]
+    for cached_key in expired:
+        del _analysis_cache[cached_key]
+    _analysis_cache[key] = (now, value)
+
+
+def clear_analysis_cache() -> None:
+    """Drop all cached analysis results."""
+    _analysis_cache.clear()
+
 
 class GitLabContributionAnalyzer:
     """Analyzer for GitLab contribution patterns and ADR tracking."""
@@ -30,8 +75,59 @@ class GitLabContributionAnalyzer:
         self.config = config
         self.client = gitlab_client
 
+    async def stream_contributions(
+        self,
+        project_paths: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> AsyncIterator[Tuple[str, ProjectStats]]:
+        """
+        Analyze projects in parallel, yielding each one as soon as it completes.
+
+        Projects that fail are logged and skipped. Closing the iterator early
+        cancels the analyses still running.
+
+        Args:
+            project_paths: List of GitLab project paths
+            start_date: Period start date
+            end_date: Period end date
+            progress_callback: Optional callback(completed, total) invoked as each
+                project finishes, including projects that failed
+
+        Yields:
+            (project_path, ProjectStats) tuples in completion order
+        """
+
+        async def analyze(project_path: str) -> Tuple[str, Any]:
+            try:
+                stats = await self._analyze_project_contributions(
+                    project_path, start_date, end_date
+                )
+            except Exception as e:
+                return project_path, e
+            return project_path, stats
+
+        tasks = [asyncio.ensure_future(analyze(project_path)) for project_path in project_paths]
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                project_path, result = await next_done
+                if progress_callback:
+                    progress_callback(completed, len(tasks))
+                if isinstance(result, Exception):
+                    logger.error(f"Error analyzing {project_path}: {result}")
+                    continue
+                yield project_path, result
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def analyze_contributions(
-        self, project_paths: List[str], start_date: datetime, end_date: datetime
+        self,
+        project_paths: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
     ) -> PeriodStats:
         """
         Analyze contributions across multiple projects for a time period.
@@ -40,32 +136,36 @@ class GitLabContributionAnalyzer:
             project_paths: List of GitLab project paths
             start_date: Period start date
             end_date: Period end date
+            progress_callback: Optional callback(completed, total) invoked as each
+                project's analysis finishes, for live progress display
 
         Returns:
             PeriodStats with aggregated contribution data
         """
+        cache_key = _analysis_cache_key("contributions", project_paths, start_date, end_date)
+        cached = _get_cached_analysis(cache_key)
+        if cached is not None:
+            return cast(PeriodStats, cached)
+
         # Calculate days in period
         days = (end_date - start_date).days
 
         # Create period stats
         period_stats = PeriodStats(start_date=start_date, end_date=end_date, days=days)
 
-        # Analyze each project in parallel
-        tasks = [
-            self._analyze_project_contributions(project_path, start_date, end_date)
-            for project_path in project_paths
-        ]
-
-        project_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Aggregate results
-        for project_path, result in zip(project_paths, project_results):
-            if isinstance(result, Exception):
-                logger.error(f"Error analyzing {project_path}: {result}")
+        # Analyze each project in parallel, reporting progress as they finish
+        project_results: Dict[str, ProjectStats] = {}
+        async for project_path, stats in self.stream_contributions(
+            project_paths, start_date, end_date, progress_callback
+        ):
+            project_results[project_path] = stats
+
+        # Aggregate results in project order so the breakdown is stable
+        for project_path in project_paths:
+            project_stats = project_results.get(project_path)
+            if project_stats is None:
                 continue
 
-            # Type narrowing - result is ProjectStats (not BaseException)
-            project_stats = cast(ProjectStats, result)
             period_stats.project_breakdown[project_path] = project_stats
 
             # Aggregate contributions
@@ -79,6 +179,11 @@ class GitLabContributionAnalyzer:
             all_contributors.update(project_stats.contributions.contributors.keys())
         period_stats.contributions.active_contributors = len(all_contributors)
 
+        # Only cache complete results so a transient GitLab failure is retried next time
+        if len(project_results) == len(set(project_paths)) and all(
+            project_stats.complete for project_stats in project_results.values()
+        ):
+            _store_cached_analysis(cache_key, period_stats)
         return period_stats
 
     async def _analyze_project_contributions(
@@ -87,6 +192,9 @@ class GitLabContributionAnalyzer:
         """
         Analyze contributions for a single project.
 
+        GitLab errors leave the affected counts empty, as before, but mark the
+        stats incomplete so they are not cached.
+
         Args:
             project_path: GitLab project path
             start_date: Period start date
@@ -99,7 +207,13 @@ class GitLabContributionAnalyzer:
         project_stats = ProjectStats(project_name=project_name, project_path=project_path)
 
         # Fetch merge requests for period
-        mrs = await self.client.get_merge_requests_for_period(project_path, start_date, end_date)
+        mrs = await self._fetch_or_mark_incomplete(
+            project_stats,
+            "merge requests",
+            self.client.get_merge_requests_for_period(
+                project_path, start_date, end_date, raise_errors=True
+            ),
+        )
 
         # Analyze MRs
         contributions = ContributionStats()
@@ -130,14 +244,22 @@ class GitLabContributionAnalyzer:
                 continue
 
             # Fetch approvals (formal GitLab approvals - identifies maintainers)
-            approved_by = await self.client.get_merge_request_approvals(project_path, mr_iid)
+            approved_by = await self._fetch_or_mark_incomplete(
+                project_stats,
+                f"approvals for MR !{mr_iid}",
+                self.client.get_merge_request_approvals(project_path, mr_iid, raise_errors=True),
+            )
             for approver_username in approved_by:
                 if approver_username and approver_username != "unknown":
                     contributions.approvals += 1
                     contributors[approver_username]["approvals"] += 1
 
             # Fetch discussions for comment tracking
-            discussions = await self.client.get_merge_request_discussions(project_path, mr_iid)
+            discussions = await self._fetch_or_mark_incomplete(
+                project_stats,
+                f"discussions for MR !{mr_iid}",
+                self.client.get_merge_request_discussions(project_path, mr_iid, raise_errors=True),
+            )
 
             for discussion in discussions:
                 # Skip system notes
@@ -158,6 +280,28 @@ class GitLabContributionAnalyzer:
 
         return project_stats
 
+    @staticmethod
+    async def _fetch_or_mark_incomplete(
+        project_stats: ProjectStats, what: str, fetch: Awaitable[List[Any]]
+    ) -> List[Any]:
+        """
+        Await a GitLab fetch, treating a failure as an empty result on incomplete stats.
+
+        Args:
+            project_stats: Stats to mark incomplete if the fetch fails
+            what: Description of the fetched data for the log message
+            fetch: Client call made with raise_errors=True
+
+        Returns:
+            The fetched list, or an empty list if GitLab returned an error
+        """
+        try:
+            return await fetch
+        except GitlabError as e:
+            logger.warning(f"Error fetching {what} for {project_stats.project_path}: {e}")
+            project_stats.complete = False
+            return []
+
     async def analyze_adrs(
         self,
         project_paths: List[str],
@@ -175,6 +319,11 @@ class GitLabContributionAnalyzer:
         Returns:
             ADRStats with ADR analysis
         """
+        cache_key = _analysis_cache_key("adrs", project_paths, start_date, end_date)
+        cached = _get_cached_analysis(cache_key)
+        if cached is not None:
+            return cast(ADRStats, cached)
+
         adr_stats = ADRStats()
         seen_adr_iids: set = set()
         participants: set = set()
@@ -185,9 +334,11 @@ class GitLabContributionAnalyzer:
         project_results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Aggregate results
+        complete = True
         for result in project_results:
             if isinstance(result, Exception):
                 logger.error(f"Error analyzing ADRs: {result}")
+                complete = False
                 continue
 
             # Type narrowing - result is List[Dict] (not BaseException)
@@ -252,25 +403,45 @@ class GitLabContributionAnalyzer:
                 )
 
         adr_stats.participants = len(participants)
+
+        # Only cache complete results so a transient project failure is retried next time
+        if complete:
+            _store_cached_analysis(cache_key, adr_stats)
         return adr_stats
 
     async def _analyze_project_adrs(self, project_path: str) -> List[Dict]:
         """
         Analyze ADRs for a single project.
 
+        The fetch does not depend on the analysis window (dates are filtered by
+        the caller), so the issue list is cached per project and shared by every
+        window analyzed while it is fresh. GitLab errors are raised rather than
+        read as "no ADRs", so a failed fetch is never cached.
+
         Args:
             project_path: GitLab project path
 
         Returns:
-            List of ADR issue dictionaries
+            List of ADR issue dictionaries (shared; do not modify)
+
+        Raises:
+            GitlabError: If any label query fails
         """
+        cache_key = _analysis_cache_key("project_adrs", [project_path], None, None)
+        cached = _get_cached_analysis(cache_key)
+        if cached is not None:
+            return cast(List[Dict], cached)
+
         all_adrs = []
 
         # Fetch issues with all ADR label variants
         for label in ADR_LABELS:
-            issues = await self.client.get_issues_by_labels(project_path, [label], state="all")
+            issues = await self.client.get_issues_by_labels(
+                project_path, [label], state="all", raise_errors=True
+            )
             all_adrs.extend(issues)
 
+        _store_cached_analysis(cache_key, all_adrs)
         return all_adrs
 
     async def analyze_trends(
@@ -279,6 +450,9 @@ class GitLabContributionAnalyzer:
         """
         Analyze contribution trends across multiple time periods.
 
+        Periods are analyzed concurrently, so a 12-month trend takes roughly as
+        long as its slowest period.
+
         Args:
             project_paths: List of GitLab project paths
             periods: List of (start_date, end_date) tuples for each period
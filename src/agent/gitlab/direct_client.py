@@ -2,12 +2,15 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 from urllib.parse import urlparse
 
 import gitlab
+import requests
 from gitlab.exceptions import GitlabError
+from requests.adapters import HTTPAdapter
 
 from agent.config import AgentConfig
 
@@ -23,6 +26,70 @@ PROVIDER_LABEL_MAPPING = {
     "IBM": ["IBM"],
 }
 
+# Keep-alive connections held for community.opengroup.org. Requests run through
+# asyncio.to_thread, so concurrency is bounded by the default executor (at most 32
+# workers); a pool this size lets every worker reuse a connection instead of
+# discarding it once requests' default pool of 10 fills up. Also caps the number
+# of in-flight requests per client.
+_HTTP_POOL_MAXSIZE = 32
+
+# Retries for failed connection attempts (not for HTTP error responses)
+_HTTP_CONNECT_RETRIES = 2
+
+# GitLab rate limits the pipeline endpoints separately (10,000 requests per hour);
+# pipeline and job listings are throttled to stay under it
+_PIPELINE_REQUESTS_PER_HOUR = 10_000
+
+_T = TypeVar("_T")
+
+
+class _RateLimiter:
+    """Async token bucket allowing max_rate acquisitions per time_period seconds.
+
+    The full rate is available as an initial burst, then refills continuously.
+    Only used from the event loop thread, so no lock is needed.
+    """
+
+    def __init__(self, max_rate: float, time_period: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_rate: Acquisitions allowed per period (also the burst size)
+            time_period: Period length in seconds
+        """
+        self._max_rate = max_rate
+        self._rate_per_second = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            now = time.monotonic()
+            self._level = max(0.0, self._level - (now - self._last_check) * self._rate_per_second)
+            self._last_check = now
+            if self._level + 1 <= self._max_rate:
+                self._level += 1
+                return
+            await asyncio.sleep((self._level + 1 - self._max_rate) / self._rate_per_second)
+
+
+def _build_http_session() -> requests.Session:
+    """Build the pooled keep-alive HTTP session shared by all GitLab API calls.
+
+    Returns:
+        requests Session with an enlarged connection pool mounted for HTTPS
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=_HTTP_POOL_MAXSIZE,
+        max_retries=_HTTP_CONNECT_RETRIES,
+    )
+    session.mount("https://", adapter)
+    return session
+
 
 class GitLabDirectClient:
     """
@@ -32,34 +99,104 @@ class GitLabDirectClient:
     Uses python-gitlab library with async/await for parallel API calls.
     """
 
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, authenticate: bool = True):
         """
         Initialize GitLab direct client.
 
         Args:
             config: Agent configuration with GitLab settings
+            authenticate: Verify the token immediately. Pass False to defer the
+                blocking round-trip to authenticate(), e.g. to run it off the event loop.
         """
         self.config = config
 
         # All OSDU services use community.opengroup.org
         gitlab_url = "https://community.opengroup.org"
 
+        # One pooled session so parallel calls reuse TLS connections
+        self._session = _build_http_session()
+
+        # At most one in-flight request per pooled connection, and pipeline
+        # endpoints throttled to GitLab's per-hour limit
+        self._request_slots = asyncio.Semaphore(_HTTP_POOL_MAXSIZE)
+        self._pipeline_limiter = _RateLimiter(_PIPELINE_REQUESTS_PER_HOUR, 3600)
+
         # Initialize GitLab client
         if config.gitlab_token:
             self.gitlab = gitlab.Gitlab(
                 url=gitlab_url,
                 private_token=config.gitlab_token,
+                session=self._session,
             )
-            try:
-                self.gitlab.auth()
-                logger.info(f"Authenticated to {gitlab_url}")
-            except GitlabError as e:
-                logger.warning(f"GitLab authentication warning: {e}")
+            if authenticate:
+                self.authenticate()
         else:
             # Try without authentication (public projects only)
-            self.gitlab = gitlab.Gitlab(url=gitlab_url)
+            self.gitlab = gitlab.Gitlab(url=gitlab_url, session=self._session)
             logger.info(f"Using {gitlab_url} without authentication")
 
+    def authenticate(self) -> None:
+        """
+        Verify the GitLab token (blocking).
+
+        Also opens the first pooled connection, so later API calls skip the
+        TLS handshake. Does nothing for unauthenticated clients.
+        """
+        if not self.config.gitlab_token:
+            return
+        try:
+            self.gitlab.auth()
+            logger.info(f"Authenticated to {self.gitlab.url}")
+        except GitlabError as e:
+            logger.warning(f"GitLab authentication warning: {e}")
+
+    async def __aenter__(self) -> "GitLabDirectClient":
+        """
+        Async context manager entry.
+
+        Returns:
+            Self, sharing one connection pool for the duration of the block
+        """
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit - close pooled connections."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self._session.close()
+
+    async def _request(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """
+        Run a blocking python-gitlab call in a thread, bounded by the request slots.
+
+        Args:
+            func: python-gitlab method to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        async with self._request_slots:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _pipeline_request(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """
+        Run a pipeline endpoint call, waiting for the pipeline rate limiter first.
+
+        Args:
+            func: python-gitlab pipeline or job method to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        await self._pipeline_limiter.acquire()
+        return await self._request(func, *args, **kwargs)
+
     async def get_all_status(self, services: List[str], providers: List[str]) -> Dict[str, Any]:
         """
         Get GitLab status for all services in parallel.
@@ -111,7 +248,7 @@ class GitLabDirectClient:
 
         try:
             # Get GitLab project
-            project = await asyncio.to_thread(self.gitlab.projects.get, project_path)
+            project = await self._request(self.gitlab.projects.get, project_path)
 
             # Fetch issues and MRs in parallel
             issues_task = self._get_issues(project, providers)
@@ -197,7 +334,7 @@ class GitLabDirectClient:
                 for label_name in mapped_labels:
                     # Try different case variants (GitLab labels are case-sensitive)
                     for label_variant in [label_name, label_name.capitalize(), label_name.upper()]:
-                        issues = await asyncio.to_thread(
+                        issues = await self._request(
                             project.issues.list, labels=[label_variant], state="opened", per_page=10
                         )
 
@@ -242,7 +379,7 @@ class GitLabDirectClient:
                 for label_name in mapped_labels:
                     # Try different case variants (GitLab labels are case-sensitive)
                     for label_variant in [label_name, label_name.capitalize(), label_name.upper()]:
-                        mrs = await asyncio.to_thread(
+                        mrs = await self._request(
                             project.mergerequests.list,
                             labels=[label_variant],
                             state="opened",
@@ -284,7 +421,7 @@ class GitLabDirectClient:
         """
         try:
             # Get pipelines for the MR's source branch
-            pipelines = await asyncio.to_thread(
+            pipelines = await self._pipeline_request(
                 project.pipelines.list,
                 ref=mr.source_branch,
                 per_page=10,
@@ -321,7 +458,7 @@ class GitLabDirectClient:
         """
         try:
             # Get parent pipeline jobs
-            jobs = await asyncio.to_thread(pipeline.jobs.list, per_page=100)
+            jobs = await self._pipeline_request(pipeline.jobs.list, per_page=100)
 
             job_data = [self._format_job(job) for job in jobs]
 
@@ -354,7 +491,7 @@ class GitLabDirectClient:
         """
         try:
             # Find downstream pipelines by matching SHA
-            downstream_pipelines = await asyncio.to_thread(
+            downstream_pipelines = await self._pipeline_request(
                 project.pipelines.list, sha=parent_pipeline.sha, source="pipeline", per_page=5
             )
 
@@ -363,7 +500,7 @@ class GitLabDirectClient:
 
             # Get jobs from the first downstream pipeline
             downstream = downstream_pipelines[0]
-            jobs = await asyncio.to_thread(downstream.jobs.list, per_page=100)
+            jobs = await self._pipeline_request(downstream.jobs.list, per_page=100)
 
             # Format jobs and mark as downstream
             job_data = []
@@ -445,7 +582,11 @@ class GitLabDirectClient:
     # ========== Contribution Analysis Methods ==========
 
     async def get_merge_requests_for_period(
-        self, project_path: str, start_date: datetime, end_date: datetime
+        self,
+        project_path: str,
+        start_date: datetime,
+        end_date: datetime,
+        raise_errors: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Get merge requests for a project within a specific date range.
@@ -454,19 +595,20 @@ class GitLabDirectClient:
             project_path: GitLab project path (e.g., "osdu/platform/system/partition")
             start_date: Period start date
             end_date: Period end date
+            raise_errors: Re-raise GitLab errors instead of returning an empty list
 
         Returns:
             List of formatted merge request dictionaries
         """
         try:
-            project = await asyncio.to_thread(self.gitlab.projects.get, project_path)
+            project = await self._request(self.gitlab.projects.get, project_path)
 
             # Format dates for GitLab API (ISO 8601)
             start_str = start_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
             end_str = end_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
 
             # Fetch merge requests created in the period
-            mrs = await asyncio.to_thread(
+            mrs = await self._request(
                 project.mergerequests.list,
                 created_after=start_str,
                 created_before=end_str,
@@ -477,11 +619,13 @@ class GitLabDirectClient:
             return [self._format_merge_request_detailed(mr) for mr in mrs]
 
         except GitlabError as e:
+            if raise_errors:
+                raise
             logger.error(f"Error fetching MRs for {project_path}: {e}")
             return []
 
     async def get_merge_request_discussions(
-        self, project_path: str, mr_iid: int
+        self, project_path: str, mr_iid: int, raise_errors: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get discussions (reviews and comments) for a merge request.
@@ -489,16 +633,17 @@ class GitLabDirectClient:
         Args:
             project_path: GitLab project path
             mr_iid: Merge request IID
+            raise_errors: Re-raise GitLab errors instead of returning an empty list
 
         Returns:
             List of discussion/comment dictionaries
         """
         try:
-            project = await asyncio.to_thread(self.gitlab.projects.get, project_path)
-            mr = await asyncio.to_thread(project.mergerequests.get, mr_iid)
+            project = await self._request(self.gitlab.projects.get, project_path)
+            mr = await self._request(project.mergerequests.get, mr_iid)
 
             # Fetch discussions
-            discussions = await asyncio.to_thread(mr.discussions.list, get_all=True)
+            discussions = await self._request(mr.discussions.list, get_all=True)
 
             formatted_discussions = []
             for discussion in discussions:
@@ -517,26 +662,32 @@ class GitLabDirectClient:
             return formatted_discussions
 
         except GitlabError as e:
+            if raise_errors:
+                raise
             logger.warning(f"Error fetching discussions for MR !{mr_iid}: {e}")
             return []
 
-    async def get_merge_request_approvals(self, project_path: str, mr_iid: int) -> List[str]:
+    async def get_merge_request_approvals(
+        self, project_path: str, mr_iid: int, raise_errors: bool = False
+    ) -> List[str]:
         """
         Get approvals for a merge request.
 
         Args:
             project_path: GitLab project path
             mr_iid: Merge request IID
+            raise_errors: Re-raise GitLab errors instead of returning an empty list.
+                Projects without approval rules still return an empty list.
 
         Returns:
             List of approver usernames
         """
         try:
-            project = await asyncio.to_thread(self.gitlab.projects.get, project_path)
-            mr = await asyncio.to_thread(project.mergerequests.get, mr_iid)
+            project = await self._request(self.gitlab.projects.get, project_path)
+            mr = await self._request(project.mergerequests.get, mr_iid)
 
             # Get approvals - this fetches the approval state
-            approvals = await asyncio.to_thread(mr.approvals.get)
+            approvals = await self._request(mr.approvals.get)
 
             # Extract approved_by users
             approved_by = []
@@ -549,12 +700,18 @@ class GitLabDirectClient:
             return approved_by
 
         except (GitlabError, AttributeError) as e:
+            if raise_errors and isinstance(e, GitlabError):
+                raise
             # Some projects may not have approval rules configured
             logger.debug(f"Could not fetch approvals for MR !{mr_iid}: {e}")
             return []
 
     async def get_issues_by_labels(
-        self, project_path: str, labels: List[str], state: str = "all"
+        self,
+        project_path: str,
+        labels: List[str],
+        state: str = "all",
+        raise_errors: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Get issues filtered by labels.
@@ -563,21 +720,24 @@ class GitLabDirectClient:
             project_path: GitLab project path
             labels: List of label names to filter by
             state: Issue state ("opened", "closed", "all")
+            raise_errors: Re-raise GitLab errors instead of returning an empty list
 
         Returns:
             List of formatted issue dictionaries
         """
         try:
-            project = await asyncio.to_thread(self.gitlab.projects.get, project_path)
+            project = await self._request(self.gitlab.projects.get, project_path)
 
             # Fetch issues with specified labels
-            issues = await asyncio.to_thread(
+            issues = await self._request(
                 project.issues.list, labels=labels, state=state, per_page=100, get_all=True
             )
 
             return [self._format_issue_detailed(issue) for issue in issues]
 
         except GitlabError as e:
+            if raise_errors:
+                raise
             logger.error(f"Error fetching issues for {project_path}: {e}")
             return []
 
@@ -592,10 +752,10 @@ class GitLabDirectClient:
             List of contributor usernames
         """
         try:
-            project = await asyncio.to_thread(self.gitlab.projects.get, project_path)
+            project = await self._request(self.gitlab.projects.get, project_path)
 
             # Fetch repository contributors
-            contributors = await asyncio.to_thread(project.repository_contributors, get_all=True)
+            contributors = await self._request(project.repository_contributors, get_all=True)
 
             return [c.get("name", "unknown") for c in contributors]
 
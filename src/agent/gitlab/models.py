@@ -72,12 +72,14 @@ class ProjectStats:
         project_path: GitLab project path
         contributions: Contribution statistics for this project
         adrs: ADR statistics for this project
+        complete: False when a GitLab request failed and the counts may be low
     """
 
     project_name: str
     project_path: str
     contributions: ContributionStats = field(default_factory=ContributionStats)
     adrs: ADRStats = field(default_factory=ADRStats)
+    complete: bool = True
 
 
 @dataclass
@@ -1,13 +1,80 @@
 """Report formatting with Rich console output for GitLab analytics."""
 
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 from agent.gitlab.models import ADRStats, ContributionStats, PeriodStats, TrendIndicator
 
+# Pre-styled text fragments built once so Rich does not re-parse markup on every row/message
+_STATE_APPROVED = Text("Approved", style="green")
+_STATE_PROPOSED = Text("Proposed", style="yellow")
+_STATE_OPEN = Text("Open", style="yellow")
+_ERR_PREFIX = Text("Error: ", style="bold red")
+_SUCCESS_PREFIX = Text("✓ ", style="bold green")
+
+# Fetches the project breakdown row metrics in a single call
+_proj_getter = attrgetter("total_mrs", "merged_mrs", "open_mrs", "active_contributors")
+
+
+def _format_change(trend: TrendIndicator) -> str:
+    """
+    Format a trend's percent change for display.
+
+    Args:
+        trend: Trend indicator to format
+
+    Returns:
+        Signed percentage string, or "n/a" when there is no baseline to compare against
+    """
+    if trend.percent_change is None:
+        return "n/a"
+    return f"{trend.percent_change:+.1f}%"
+
+
+@lru_cache(maxsize=None)
+def _comparison_column_specs(period_count: int) -> Tuple[Tuple[str, Dict[str, Any]], ...]:
+    """
+    Build (header, options) column specs for the period comparison table.
+
+    Specs are cached per period count; Rich tables are mutable so each caller
+    still receives a fresh Table from _make_comparison_table.
+
+    Args:
+        period_count: Number of periods being compared (current included)
+
+    Returns:
+        Tuple of (header, add_column kwargs) pairs
+    """
+    specs: List[Tuple[str, Dict[str, Any]]] = [("Metric", {"style": "cyan", "no_wrap": True})]
+    for i in range(period_count):
+        if i == 0:
+            specs.append(("Current", {"justify": "right", "style": "bold green"}))
+        else:
+            specs.append((f"Period -{i}", {"justify": "right"}))
+    return tuple(specs)
+
+
+def _make_comparison_table(period_count: int) -> Table:
+    """
+    Create an empty comparison table with columns for each period.
+
+    Args:
+        period_count: Number of periods being compared (current included)
+
+    Returns:
+        New Table with columns added and no rows
+    """
+    table = Table(title="Period-over-Period Comparison", show_header=True, header_style="bold")
+    for header, options in _comparison_column_specs(period_count):
+        table.add_column(header, **options)
+    return table
+
 
 class ReportFormatter:
     """Formatter for GitLab contribution reports with Rich console output."""
@@ -101,7 +168,7 @@ class ReportFormatter:
         summary_lines.append(f"[bold cyan]Total MRs:[/bold cyan] {contrib.total_mrs}")
         if "total_mrs" in trends:
             summary_lines.append(
-                f"  {trends['total_mrs'].indicator_symbol} {trends['total_mrs'].percent_change:+.1f}% from previous period"
+                f"  {trends['total_mrs'].indicator_symbol} {_format_change(trends['total_mrs'])} from previous period"
             )
 
         summary_lines.append(
@@ -109,7 +176,7 @@ class ReportFormatter:
         )
         if "merged_mrs" in trends:
             summary_lines.append(
-                f"  {trends['merged_mrs'].indicator_symbol} Merged {trends['merged_mrs'].percent_change:+.1f}%"
+                f"  {trends['merged_mrs'].indicator_symbol} Merged {_format_change(trends['merged_mrs'])}"
             )
 
         summary_lines.append("")
@@ -118,7 +185,7 @@ class ReportFormatter:
         )
         if "active_contributors" in trends:
             summary_lines.append(
-                f"  {trends['active_contributors'].indicator_symbol} {trends['active_contributors'].percent_change:+.1f}%"
+                f"  {trends['active_contributors'].indicator_symbol} {_format_change(trends['active_contributors'])}"
             )
 
         summary_lines.append(
@@ -126,11 +193,11 @@ class ReportFormatter:
         )
         if "comments" in trends:
             summary_lines.append(
-                f"  {trends['comments'].indicator_symbol} Comments {trends['comments'].percent_change:+.1f}%"
+                f"  {trends['comments'].indicator_symbol} Comments {_format_change(trends['comments'])}"
             )
         if "approvals" in trends:
             summary_lines.append(
-                f"  {trends['approvals'].indicator_symbol} Approvals {trends['approvals'].percent_change:+.1f}%"
+                f"  {trends['approvals'].indicator_symbol} Approvals {_format_change(trends['approvals'])}"
             )
 
         # ADR summary if available
@@ -160,15 +227,7 @@ class ReportFormatter:
         if len(periods) < 2:
             return
 
-        table = Table(title="Period-over-Period Comparison", show_header=True, header_style="bold")
-        table.add_column("Metric", style="cyan", no_wrap=True)
-
-        # Add column for each period
-        for i, period in enumerate(periods):
-            if i == 0:
-                table.add_column("Current", justify="right", style="bold green")
-            else:
-                table.add_column(f"Period -{i}", justify="right")
+        table = _make_comparison_table(len(periods))
 
         # Add rows for each metric
         metrics = [
@@ -257,14 +316,10 @@ class ReportFormatter:
         table.add_column("Open", justify="right", style="yellow")
         table.add_column("Contributors", justify="right", style="blue")
 
-        for project_path, project_stats in period_stats.project_breakdown.items():
-            contrib = project_stats.contributions
+        for project_stats in period_stats.project_breakdown.values():
+            total, merged, open_mrs, active = _proj_getter(project_stats.contributions)
             table.add_row(
-                project_stats.project_name,
-                str(contrib.total_mrs),
-                str(contrib.merged_mrs),
-                str(contrib.open_mrs),
-                str(contrib.active_contributors),
+                project_stats.project_name, str(total), str(merged), str(open_mrs), str(active)
             )
 
         self.console.print(table)
@@ -327,14 +382,15 @@ class ReportFormatter:
             state = adr.get("state", "unknown")
             labels = adr.get("labels", [])
 
+            state_text: Text
             if "ADR::Approved" in labels:
-                state_text = "[green]Approved[/green]"
+                state_text = _STATE_APPROVED
             elif "ADR::Proposed" in labels:
-                state_text = "[yellow]Proposed[/yellow]"
+                state_text = _STATE_PROPOSED
             elif state == "opened":
-                state_text = "[yellow]Open[/yellow]"
+                state_text = _STATE_OPEN
             else:
-                state_text = f"[dim]{state}[/dim]"
+                state_text = Text(str(state), style="dim")
 
             table.add_row(
                 f"#{adr.get('iid', '?')}",
@@ -346,14 +402,16 @@ class ReportFormatter:
         self.console.print(table)
         self.console.print()
 
-    def format_trend_chart(self, metric_name: str, values: List[int], labels: List[str]) -> None:
+    def format_trend_chart(
+        self, metric_name: str, values: List[int], labels: Sequence[str]
+    ) -> None:
         """
         Format and display ASCII bar chart for trend visualization.
 
         Args:
             metric_name: Name of the metric being charted
             values: List of values (one per period)
-            labels: List of labels for each period
+            labels: Labels for each period
         """
         if not values or len(values) != len(labels):
             return
@@ -395,7 +453,7 @@ class ReportFormatter:
         Args:
             message: Error message to display
         """
-        self.console.print(f"[bold red]Error:[/bold red] {message}")
+        self.console.print(Text.assemble(_ERR_PREFIX, message))
 
     def print_info(self, message: str) -> None:
         """
@@ -413,4 +471,4 @@ class ReportFormatter:
         Args:
             message: Success message to display
         """
-        self.console.print(f"[bold green]✓[/bold green] {message}")
+        self.console.print(Text.assemble(_SUCCESS_PREFIX, message))
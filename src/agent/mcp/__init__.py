@@ -1,6 +1,7 @@
 """MCP (Model Context Protocol) server integrations."""
 
+from agent.mcp.base import BaseMCPManager
 from agent.mcp.maven_mcp import MavenMCPManager
 from agent.mcp.osdu_mcp import OsduMCPManager
 
-__all__ = ["MavenMCPManager", "OsduMCPManager"]
+__all__ = ["BaseMCPManager", "MavenMCPManager", "OsduMCPManager"]
@@ -0,0 +1,25 @@
+"""Shared log-path helpers for MCP server integrations."""
+
+import time
+from pathlib import Path
+from typing import Optional
+
+from agent.copilot.config import log_dir
+
+
+def build_stderr_log_path(prefix: str) -> Optional[Path]:
+    """
+    Build the stderr redirect target for an MCP server subprocess.
+
+    Args:
+        prefix: Server prefix used in the log file name (e.g. "maven", "osdu")
+
+    Returns:
+        logs/{prefix}_mcp_TIMESTAMP.log when logging is enabled, None otherwise
+        (None tells QuietMCPStdioTool to discard server stderr)
+    """
+    if log_dir is None:
+        return None
+
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    return log_dir / f"{prefix}_mcp_{timestamp}.log"
@@ -0,0 +1,258 @@
+"""Abstract base class for MCP server managers."""
+
+import logging
+import os
+import shutil
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agent_framework import MCPStdioTool
+
+from agent.config import AgentConfig
+
+logger = logging.getLogger(__name__)
+
+# Variables forwarded to every MCP subprocess. mcp's stdio client already adds
+# its own safe defaults (PATH, HOME, USER, ...), so only extras are listed here.
+_COMMON_ENV_VARS = (
+    "PATH",
+    "HOME",
+    "LANG",
+    "LC_ALL",
+    "TMPDIR",
+    "SSL_CERT_FILE",
+    "SSL_CERT_DIR",
+    "REQUESTS_CA_BUNDLE",
+    "CURL_CA_BUNDLE",
+    "HTTP_PROXY",
+    "HTTPS_PROXY",
+    "NO_PROXY",
+    "http_proxy",
+    "https_proxy",
+    "no_proxy",
+)
+_COMMON_ENV_PREFIXES = ("UV_", "XDG_")
+
+# Set to "true" to pass the agent's full environment to MCP subprocesses, for
+# toolchains that need variables the filter does not know about
+_INHERIT_ENV_FLAG = "OSDU_AGENT_MCP_INHERIT_ENV"
+
+
+# Resolved command paths. Misses are not stored so a command installed while
+# the agent is running is found on the next lookup.
+_command_paths: Dict[str, str] = {}
+
+
+def _which_cached(command: str) -> Optional[str]:
+    """Locate a command on PATH, memoizing successful lookups per command name."""
+    command_path = _command_paths.get(command)
+    if command_path is None:
+        command_path = shutil.which(command)
+        if command_path:
+            _command_paths[command] = command_path
+    return command_path
+
+
+def build_subprocess_env(
+    names: Iterable[str] = (), prefixes: Tuple[str, ...] = ()
+) -> Dict[str, str]:
+    """
+    Build a minimal environment for an MCP server subprocess.
+
+    Setting OSDU_AGENT_MCP_INHERIT_ENV=true forwards the whole environment instead.
+
+    Args:
+        names: Extra variable names to forward when set
+        prefixes: Extra variable name prefixes to forward (e.g. "AZURE_")
+
+    Returns:
+        Dictionary of forwarded environment variables
+    """
+    if os.getenv(_INHERIT_ENV_FLAG, "false").lower() == "true":
+        return dict(os.environ)
+
+    wanted = set(_COMMON_ENV_VARS).union(names)
+    all_prefixes = _COMMON_ENV_PREFIXES + prefixes
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key in wanted or key.startswith(all_prefixes)
+    }
+
+
+class BaseMCPManager(ABC):
+    """
+    Abstract base class for MCP server managers.
+
+    Owns the stdio tool lifecycle (prerequisite checks, subprocess start and
+    cleanup) so individual servers only describe how they are launched.
+    """
+
+    # Human-readable server label used in log messages (e.g. "Maven", "OSDU")
+    display_name: str = "MCP"
+
+    # Package suggested when the server executable cannot be found
+    server_package: str = ""
+
+    def __init__(self, config: AgentConfig):
+        """
+        Initialize MCP manager.
+
+        Args:
+            config: Agent configuration with MCP settings
+        """
+        self.config = config
+        self.mcp_tool: Optional[MCPStdioTool] = None
+        self._validated = False
+
+    @property
+    @abstractmethod
+    def command(self) -> str:
+        """Command used to launch the MCP server."""
+        pass
+
+    @abstractmethod
+    def _build_env(self) -> Dict[str, str]:
+        """
+        Build the subprocess environment for the MCP server.
+
+        Returns:
+            Environment variables passed to the server process
+        """
+        pass
+
+    @abstractmethod
+    def _create_mcp_tool(self, env: Dict[str, str]) -> MCPStdioTool:
+        """
+        Create the (not yet entered) MCP stdio tool.
+
+        Args:
+            env: Subprocess environment from _build_env()
+
+        Returns:
+            MCP stdio tool instance
+        """
+        pass
+
+    def _prepare(self) -> bool:
+        """
+        Run server-specific checks after prerequisites pass.
+
+        Returns:
+            True to start the server, False to continue without it
+        """
+        return True
+
+    async def _post_connect_hook(self) -> None:
+        """Run after the MCP tool has started successfully."""
+        pass
+
+    def _post_exit_hook(self) -> None:
+        """Run after the MCP tool has been cleaned up."""
+        pass
+
+    def _log_ready(self) -> None:
+        """Log that the server is ready for use."""
+        logger.info(f"{self.display_name} MCP server initialized successfully")
+        logger.info(f"Available tools: {len(self.tools)}")
+
+    def validate_prerequisites(self) -> bool:
+        """
+        Validate that required commands are available.
+
+        Returns:
+            True if prerequisites met, False otherwise
+        """
+        if self._validated:
+            return True
+
+        # Check if command exists
+        command_path = _which_cached(self.command)
+        if not command_path:
+            logger.warning(
+                f"{self.display_name} MCP disabled: '{self.command}' command not found. "
+                f"Install with: pip install uv"
+            )
+            return False
+
+        self._validated = True
+        return True
+
+    async def __aenter__(self) -> "BaseMCPManager":
+        """
+        Async context manager entry.
+
+        Returns:
+            Self with initialized MCP tool
+        """
+        if not self.validate_prerequisites():
+            logger.warning(
+                f"{self.display_name} MCP prerequisites not met, "
+                f"continuing without {self.display_name} tools"
+            )
+            return self
+
+        if not self._prepare():
+            return self
+
+        try:
+            # Initialize the stdio tool with stderr redirection so server output
+            # does not interfere with Rich Live display
+            self.mcp_tool = self._create_mcp_tool(self._build_env())
+
+            # Enter the MCP tool's context
+            await self.mcp_tool.__aenter__()
+
+            await self._post_connect_hook()
+            self._log_ready()
+
+        except FileNotFoundError as e:
+            logger.error(
+                f"{self.display_name} MCP server not found: {e}. "
+                f"Install with: uvx {self.server_package}"
+            )
+            self.mcp_tool = None
+        except Exception as e:
+            logger.error(f"Failed to initialize {self.display_name} MCP server: {e}")
+            self.mcp_tool = None
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Async context manager exit.
+
+        Args:
+            exc_type: Exception type if any
+            exc_val: Exception value if any
+            exc_tb: Exception traceback if any
+        """
+        if self.mcp_tool:
+            try:
+                await self.mcp_tool.__aexit__(exc_type, exc_val, exc_tb)
+                logger.info(f"{self.display_name} MCP server cleaned up successfully")
+                self._post_exit_hook()
+            except Exception as e:
+                logger.error(f"Error cleaning up {self.display_name} MCP server: {e}")
+
+    @property
+    def tools(self) -> List:
+        """
+        Get MCP tools for agent integration.
+
+        Returns:
+            List containing MCP tool if available, empty list otherwise
+        """
+        if self.mcp_tool:
+            return [self.mcp_tool]
+        return []
+
+    @property
+    def is_available(self) -> bool:
+        """
+        Check if the MCP server is available.
+
+        Returns:
+            True if MCP tools are available
+        """
+        return self.mcp_tool is not None
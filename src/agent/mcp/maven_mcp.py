@@ -2,20 +2,68 @@
 
 import logging
 import os
-import shutil
-import types
+import subprocess
+from contextlib import AsyncExitStack
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Optional, Union
 
 from agent_framework import MCPStdioTool
+from mcp.client.stdio import StdioServerParameters, stdio_client
 
 from agent.config import AgentConfig
-from agent.copilot.config import log_dir
-from agent.mcp.tool_arg_normalizer import normalize_maven_tool_arguments
+from agent.mcp._logging import build_stderr_log_path
+from agent.mcp.base import BaseMCPManager, build_subprocess_env
+from agent.mcp.tool_arg_normalizer import _BROKEN_KEYS, normalize_maven_tool_arguments
 
 logger = logging.getLogger(__name__)
 
+# Java/Maven toolchain variables needed by mvn-mcp-server, plus the Trivy
+# settings (cache dir, DB repository, ...) its vulnerability scans read
+_MAVEN_ENV_VARS = (
+    "JAVA_HOME",
+    "M2_HOME",
+    "MAVEN_HOME",
+    "MAVEN_OPTS",
+    "MAVEN_ARGS",
+    "JAVA_TOOL_OPTIONS",
+)
+_MAVEN_ENV_PREFIXES = ("TRIVY_",)
+
+# Leading path segments of workspace values that are already relative to the
+# current directory (./x, ../x, repos/x, ".", "..", "repos")
+_RELATIVE_ROOTS = frozenset(("repos", ".", ".."))
+
+
+@lru_cache(maxsize=256)
+def _resolve_workspace_cached(workspace_str: str, cwd_str: str, root_str: str) -> str:
+    """Resolve a stripped workspace string to an absolute path.
+
+    Resolution is purely lexical (no filesystem access) against anchors that
+    were resolved once on manager entry, and cached on the raw inputs so
+    repeated tool calls for the same workspace skip it entirely.
+
+    Args:
+        workspace_str: Non-empty, stripped workspace value from tool arguments
+        cwd_str: Resolved current working directory
+        root_str: Resolved repository root used for bare service names
+
+    Returns:
+        Absolute workspace path as a string
+    """
+    # Absolute paths are only normalized
+    if os.path.isabs(workspace_str):
+        return os.path.normpath(workspace_str)
+
+    # Already points to repos/ or explicit relative path - resolve from cwd
+    if workspace_str.partition("/")[0] in _RELATIVE_ROOTS:
+        return os.path.normpath(os.path.join(cwd_str, workspace_str))
+
+    # Handle org/repo notation by using final segment as service name
+    service_name = workspace_str.rsplit("/", 1)[-1]
+    return os.path.normpath(os.path.join(root_str, service_name))
+
 
 class QuietMCPStdioTool(MCPStdioTool):
     """MCP stdio tool that redirects server stderr to a log file.
@@ -23,9 +71,8 @@ class QuietMCPStdioTool(MCPStdioTool):
     This prevents MCP server output (banners, startup messages, etc.) from
     interfering with Rich Live display updates while preserving logs for debugging.
 
-    The implementation uses OS-level file descriptor manipulation (os.dup/dup2)
-    to redirect stderr before the subprocess is created, ensuring the MCP server
-    inherits the redirected stderr.
+    The redirect target is handed to the stdio client as the subprocess stderr,
+    so the parent process's own stderr file descriptor is never touched.
     """
 
     def __init__(self, *args, stderr_log_path: Optional[Path] = None, **kwargs):
@@ -33,87 +80,96 @@ class QuietMCPStdioTool(MCPStdioTool):
 
         Args:
             *args: Positional arguments for MCPStdioTool
-            stderr_log_path: Path to redirect stderr output (default: logs/maven_mcp_TIMESTAMP.log if logging enabled, the platform null device otherwise)
+            stderr_log_path: Log file for server stderr, or None to discard it
+                (see build_stderr_log_path)
             **kwargs: Keyword arguments for MCPStdioTool
         """
         super().__init__(*args, **kwargs)
 
-        # Determine stderr redirection target
-        if stderr_log_path is None:
-            if log_dir is not None:
-                # Logging enabled - redirect to timestamped log file
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                stderr_log_path = log_dir / f"maven_mcp_{timestamp}.log"
-                self._is_null_device = False
-            else:
-                # Logging disabled - redirect to platform null device
-                stderr_log_path = Path(os.devnull)
-                self._is_null_device = True
-        else:
-            # Check if explicitly set to null device
-            self._is_null_device = str(stderr_log_path) == os.devnull
+        # None is the "discard" sentinel - header/footer writes only apply to real log files
+        self._write_headers = stderr_log_path is not None
 
         self._stderr_log_path = stderr_log_path
         self._stderr_file = None
+        self._stderr_target: Optional[Union[int, BinaryIO]] = None
+        self._exit_stack: Optional[AsyncExitStack] = None
 
     async def __aenter__(self):
         """Enter async context - start server with stderr redirected."""
-        # Open stderr redirection target
-        try:
-            if self._stderr_log_path is not None:
-                self._stderr_file = open(self._stderr_log_path, "w", buffering=1)
-
-                # Write headers only if not redirecting to null device
-                if not self._is_null_device:
-                    self._stderr_file.write(
-                        f"Maven MCP Server Log - {datetime.now().isoformat()}\n"
-                    )
-                    self._stderr_file.write("=" * 70 + "\n\n")
-        except Exception as e:
-            logger.warning(f"Could not open stderr redirection target: {e}")
-            self._stderr_file = None
+        # Cleanup is registered as each resource is acquired, so a failed server
+        # start (e.g. missing uvx) still closes the log file
+        async with AsyncExitStack() as stack:
+            self._open_stderr_target()
+            stack.callback(self._close_stderr_target)
 
-        # Redirect stderr at the file descriptor level
-        # This will affect subprocess created during connect()
-        import sys
+            # Call parent __aenter__ which will start the subprocess
+            # Subprocess stderr is wired to our target in get_mcp_client()
+            result = await super().__aenter__()
+            stack.push_async_exit(super().__aexit__)
 
-        self._original_stderr_fd = None
+            # Started successfully - keep everything open until __aexit__
+            self._exit_stack = stack.pop_all()
 
-        try:
-            if self._stderr_file:
-                # Save original stderr file descriptor
-                self._original_stderr_fd = os.dup(sys.stderr.fileno())
+        return result
 
-                # Redirect stderr to our log file
-                os.dup2(self._stderr_file.fileno(), sys.stderr.fileno())
+    def _open_stderr_target(self) -> None:
+        """Open the stderr redirection target and write the log header."""
+        try:
+            if self._write_headers:
+                # Unbuffered: the server writes through its own fd, we only add header/footer
+                self._stderr_file = open(self._stderr_log_path, "wb", buffering=0)
+                self._stderr_target = self._stderr_file
+                header = f"Maven MCP Server Log - {datetime.now().isoformat()}\n{'=' * 70}\n\n"
+                self._stderr_file.write(header.encode("utf-8"))
+            else:
+                # Logging disabled - let the subprocess layer open the platform null device
+                self._stderr_target = subprocess.DEVNULL
+        except Exception as e:
+            logger.warning(f"Could not open stderr redirection target: {e}")
+            self._close_stderr_target()
 
-            # Call parent __aenter__ which will start the subprocess
-            # Subprocess will inherit the redirected stderr
-            result = await super().__aenter__()
-            return result
-        finally:
-            # Restore original stderr file descriptor
-            if self._original_stderr_fd is not None:
-                os.dup2(self._original_stderr_fd, sys.stderr.fileno())
-                os.close(self._original_stderr_fd)
-                self._original_stderr_fd = None
+    def _close_stderr_target(self) -> None:
+        """Write the shutdown footer (log files only) and close the log file."""
+        if self._stderr_file is not None and not self._stderr_file.closed:
+            try:
+                footer = f"\n\nServer shutdown - {datetime.now().isoformat()}\n"
+                self._stderr_file.write(footer.encode("utf-8"))
+            finally:
+                self._stderr_file.close()
+        self._stderr_file = None
+        self._stderr_target = None
+
+    def get_mcp_client(self):
+        """Create the stdio client with server stderr sent to the redirect target."""
+        # Mirrors MCPStdioTool.get_mcp_client from agent-framework 1.0.0b251211 (the
+        # upper bound in pyproject.toml), including its private _client_kwargs, only
+        # adding errlog. test_get_mcp_client_matches_upstream fails if upstream drifts.
+        server_params: Dict[str, Any] = {
+            "command": self.command,
+            "args": self.args,
+            "env": self.env,
+        }
+        if self.encoding:
+            server_params["encoding"] = self.encoding
+        if self._client_kwargs:
+            server_params.update(self._client_kwargs)
+
+        if self._stderr_target is None:
+            return stdio_client(server=StdioServerParameters(**server_params))
+        return stdio_client(
+            server=StdioServerParameters(**server_params), errlog=self._stderr_target
+        )
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Exit async context - cleanup stderr redirection."""
-        # Call parent cleanup first
-        result = await super().__aexit__(exc_type, exc_val, exc_tb)
+        """Exit async context - stop server, then cleanup stderr redirection."""
+        if self._exit_stack is None:
+            return await super().__aexit__(exc_type, exc_val, exc_tb)
 
-        # Close stderr redirection file
-        if self._stderr_file and not self._stderr_file.closed:
-            # Write shutdown message only if not redirecting to null device
-            if not self._is_null_device:
-                self._stderr_file.write(f"\n\nServer shutdown - {datetime.now().isoformat()}\n")
-            self._stderr_file.close()
+        exit_stack, self._exit_stack = self._exit_stack, None
+        return await exit_stack.__aexit__(exc_type, exc_val, exc_tb)
 
-        return result
 
-
-class MavenMCPManager:
+class MavenMCPManager(BaseMCPManager):
     """
     Manages Maven MCP server lifecycle and integration.
 
@@ -124,6 +180,9 @@ class MavenMCPManager:
     - Actionable remediation planning
     """
 
+    display_name = "Maven"
+    server_package = "mvn-mcp-server"
+
     def __init__(self, config: AgentConfig):
         """
         Initialize Maven MCP Manager.
@@ -131,114 +190,49 @@ class MavenMCPManager:
         Args:
             config: Agent configuration with Maven MCP settings
         """
-        self.config = config
-        self.mcp_tool: Optional[MCPStdioTool] = None
-        self._validated = False
+        super().__init__(config)
         self._workspace_root = Path(os.getenv("OSDU_AGENT_REPOS_ROOT", Path.cwd() / "repos"))
+        self._workspace_root_resolved: Optional[str] = None
+        self._cwd_resolved: Optional[str] = None
         self._original_call_tool = None
 
-    def validate_prerequisites(self) -> bool:
-        """
-        Validate that required commands are available.
-
-        Returns:
-            True if prerequisites met, False otherwise
-        """
-        # Check if command exists
-        command_path = shutil.which(self.config.maven_mcp_command)
-        if not command_path:
-            logger.warning(
-                f"Maven MCP disabled: '{self.config.maven_mcp_command}' command not found. "
-                f"Install with: pip install uv"
-            )
-            return False
-
-        self._validated = True
-        return True
-
-    async def __aenter__(self) -> "MavenMCPManager":
-        """
-        Async context manager entry.
-
-        Returns:
-            Self with initialized MCP tool
-        """
-        if not self.validate_prerequisites():
-            logger.warning("Maven MCP prerequisites not met, continuing without Maven tools")
-            return self
-
-        try:
-            # Build subprocess environment
-            subprocess_env = os.environ.copy()
-
-            # Initialize QuietMCPStdioTool with stderr redirection
-            # This prevents MCP server output from interfering with Rich Live display
-            self.mcp_tool = QuietMCPStdioTool(
-                name="maven-mcp-server",
-                command=self.config.maven_mcp_command,
-                args=self.config.maven_mcp_args,
-                env=subprocess_env,
-                # stderr_log_path defaults to logs/maven_mcp_TIMESTAMP.log
-            )
-
-            # Enter the MCP tool's context
-            await self.mcp_tool.__aenter__()
-
-            # Normalize tool inputs before delegating to MCP server
-            self._wrap_workspace_normalization()
-
-            logger.info("Maven MCP server initialized successfully")
-            logger.info(
-                f"Available tools: {len(self.tools)} " f"(Trivy required for security scanning)"
-            )
-
-        except FileNotFoundError as e:
-            logger.error(f"Maven MCP server not found: {e}. " f"Install with: uvx mvn-mcp-server")
-            self.mcp_tool = None
-        except Exception as e:
-            logger.error(f"Failed to initialize Maven MCP server: {e}")
-            self.mcp_tool = None
-
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        """
-        Async context manager exit.
-
-        Args:
-            exc_type: Exception type if any
-            exc_val: Exception value if any
-            exc_tb: Exception traceback if any
-        """
-        if self.mcp_tool:
-            try:
-                await self.mcp_tool.__aexit__(exc_type, exc_val, exc_tb)
-                logger.info("Maven MCP server cleaned up successfully")
-                self._restore_original_call_tool()
-            except Exception as e:
-                logger.error(f"Error cleaning up Maven MCP server: {e}")
-
     @property
-    def tools(self) -> List:
-        """
-        Get Maven MCP tools for agent integration.
-
-        Returns:
-            List containing MCP tool if available, empty list otherwise
-        """
-        if self.mcp_tool:
-            return [self.mcp_tool]
-        return []
-
-    @property
-    def is_available(self) -> bool:
-        """
-        Check if Maven MCP is available.
+    def command(self) -> str:
+        """Command used to launch the Maven MCP server."""
+        return self.config.maven_mcp_command
+
+    def _prepare(self) -> bool:
+        """Resolve path anchors once so per-call workspace normalization is string-only."""
+        self._workspace_root_resolved = str(self._workspace_root.resolve())
+        self._cwd_resolved = str(Path.cwd().resolve())
+        return True
 
-        Returns:
-            True if Maven MCP tools are available
-        """
-        return self.mcp_tool is not None
+    def _build_env(self) -> Dict[str, str]:
+        """Build subprocess environment - only what the server and its JVM tooling need."""
+        return build_subprocess_env(_MAVEN_ENV_VARS, prefixes=_MAVEN_ENV_PREFIXES)
+
+    def _create_mcp_tool(self, env: Dict[str, str]) -> MCPStdioTool:
+        """Create the Maven MCP stdio tool with stderr sent to logs/maven_mcp_TIMESTAMP.log."""
+        return QuietMCPStdioTool(
+            name="maven-mcp-server",
+            command=self.command,
+            args=self.config.maven_mcp_args,
+            env=env,
+            stderr_log_path=build_stderr_log_path("maven"),
+        )
+
+    async def _post_connect_hook(self) -> None:
+        """Normalize tool inputs before delegating to MCP server."""
+        self._wrap_workspace_normalization()
+
+    def _post_exit_hook(self) -> None:
+        """Unwrap the call handler installed on connect."""
+        self._restore_original_call_tool()
+
+    def _log_ready(self) -> None:
+        """Log that the Maven server is ready for use."""
+        logger.info("Maven MCP server initialized successfully")
+        logger.info(f"Available tools: {len(self.tools)} (Trivy required for security scanning)")
 
     def _restore_original_call_tool(self) -> None:
         """Restore original MCP call handler if it was wrapped."""
@@ -258,7 +252,7 @@ class MavenMCPManager:
         original_call_tool = self.mcp_tool.call_tool
         self._original_call_tool = original_call_tool
 
-        async def call_tool_wrapper(tool_self, *call_args: Any, **call_kwargs: Any) -> Any:
+        async def call_tool_wrapper(*call_args: Any, **call_kwargs: Any) -> Any:
             call_args_list = list(call_args)
 
             # Extract tool name and arguments from args/kwargs
@@ -274,12 +268,9 @@ class MavenMCPManager:
                 arguments = call_args_list[0]
                 argument_source = "args0"
 
-            # First normalize workspace paths
+            # Normalize workspace paths and strip broken parameters in one pass
             normalized_arguments = self._normalize_tool_arguments(arguments)
 
-            # Then normalize array parameters (e.g., profiles) that LLM might return as strings
-            normalized_arguments = normalize_maven_tool_arguments(normalized_arguments)
-
             if normalized_arguments is not arguments:
                 if argument_source == "kwargs":
                     call_kwargs["arguments"] = normalized_arguments
@@ -298,37 +289,57 @@ class MavenMCPManager:
             logger.info(f"🔧 Maven MCP: {tool_name} → {workspace_name}")
 
             # Debug: Log the exact arguments being sent to MCP server
-            logger.debug(f"MCP Tool Call - Name: {tool_name}")
-            logger.debug(f"MCP Tool Call - Arguments: {normalized_arguments}")
-            logger.debug(f"MCP Tool Call - Argument Types: {type(normalized_arguments)}")
-            if isinstance(normalized_arguments, dict):
-                for key, value in normalized_arguments.items():
-                    logger.debug(f"  {key}: {value} (type: {type(value).__name__})")
+            # Emitted as one record so handlers format and write once per call
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "mcp_call %s",
+                    {
+                        "tool": tool_name,
+                        "args": normalized_arguments,
+                        "args_type": type(normalized_arguments).__name__,
+                    },
+                )
 
             result = await original_call_tool(*call_args_list, **call_kwargs)
 
             logger.info(f"✓ Maven MCP: {tool_name} completed")
             return result
 
-        self.mcp_tool.call_tool = types.MethodType(call_tool_wrapper, self.mcp_tool)
+        # Plain closure assigned on the instance - no bound-method construction per call
+        self.mcp_tool.call_tool = call_tool_wrapper
 
     def _normalize_tool_arguments(self, arguments: Any) -> Any:
-        """Normalize workspace paths in tool arguments."""
-        if not isinstance(arguments, dict) or "workspace" not in arguments:
+        """Normalize workspace paths and strip broken parameters in tool arguments.
+
+        Returns the original dict when nothing needs to change; otherwise a
+        single copy carries both the workspace rewrite and the removals.
+        """
+        if not isinstance(arguments, dict):
             return arguments
 
+        normalized_workspace: Optional[str] = None
         workspace = arguments.get("workspace")
-        if not isinstance(workspace, str) or not workspace.strip():
-            return arguments
+        if isinstance(workspace, str) and workspace.strip():
+            resolved = self._resolve_workspace_path(workspace)
+            if resolved != workspace:
+                normalized_workspace = resolved
 
-        normalized_workspace = self._resolve_workspace_path(workspace)
-        if normalized_workspace == workspace:
+        has_broken_keys = not _BROKEN_KEYS.isdisjoint(arguments)
+        if normalized_workspace is None and not has_broken_keys:
             return arguments
 
         normalized_arguments: Dict[str, Any] = dict(arguments)
-        normalized_arguments["workspace"] = normalized_workspace
 
-        logger.debug("Normalized workspace path from '%s' to '%s'", workspace, normalized_workspace)
+        if normalized_workspace is not None:
+            normalized_arguments["workspace"] = normalized_workspace
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Normalized workspace path from '%s' to '%s'", workspace, normalized_workspace
+                )
+
+        # Remove array parameters (e.g., profiles) with broken schemas from our own copy
+        if has_broken_keys:
+            normalize_maven_tool_arguments(normalized_arguments, inplace=True)
 
         return normalized_arguments
 
@@ -342,27 +353,7 @@ class MavenMCPManager:
         if not workspace_str:
             return workspace
 
-        candidate_path = Path(workspace_str)
-
-        # Absolute paths are returned untouched
-        if candidate_path.is_absolute():
-            return str(candidate_path)
-
-        # Already points to repos/ or explicit relative path - resolve from cwd
-        if (
-            workspace_str.startswith("./")
-            or workspace_str.startswith("../")
-            or (candidate_path.parts and candidate_path.parts[0] in {"repos", ".", ".."})
-        ):
-            resolved = (Path.cwd() / candidate_path).resolve()
-            return str(resolved)
-
-        # Handle org/repo notation by using final segment as service name
-        if "/" in workspace_str:
-            service_name = workspace_str.split("/")[-1]
-        else:
-            service_name = workspace_str
-
-        resolved = (self._workspace_root / service_name).resolve()
+        cwd_str = self._cwd_resolved or os.getcwd()
+        root_str = self._workspace_root_resolved or os.path.abspath(self._workspace_root)
 
-        return str(resolved)
+        return _resolve_workspace_cached(workspace_str, cwd_str, root_str)
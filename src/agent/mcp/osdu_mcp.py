@@ -2,21 +2,18 @@
 
 import logging
 import os
-import shutil
-from datetime import datetime
-from pathlib import Path
-from typing import List, Optional
+from typing import Dict
 
 from agent_framework import MCPStdioTool
 
-from agent.config import AgentConfig
-from agent.copilot.config import log_dir
+from agent.mcp._logging import build_stderr_log_path
+from agent.mcp.base import BaseMCPManager, build_subprocess_env
 from agent.mcp.maven_mcp import QuietMCPStdioTool
 
 logger = logging.getLogger(__name__)
 
 
-class OsduMCPManager:
+class OsduMCPManager(BaseMCPManager):
     """
     Manages OSDU MCP server lifecycle and integration.
 
@@ -52,35 +49,23 @@ class OsduMCPManager:
         "OSDU_MCP_ENABLE_DELETE_MODE",
     ]
 
-    def __init__(self, config: AgentConfig):
-        """
-        Initialize OSDU MCP Manager.
-
-        Args:
-            config: Agent configuration with OSDU MCP settings
-        """
-        self.config = config
-        self.mcp_tool: Optional[MCPStdioTool] = None
-        self._validated = False
-
-    def validate_prerequisites(self) -> bool:
-        """
-        Validate that required commands are available.
+    # Managed identity endpoints used by DefaultAzureCredential on App Service,
+    # Functions, Container Apps and Azure VMs (no AZURE_ prefix)
+    MANAGED_IDENTITY_ENV_VARS = [
+        "IDENTITY_ENDPOINT",
+        "IDENTITY_HEADER",
+        "MSI_ENDPOINT",
+        "MSI_SECRET",
+        "IMDS_ENDPOINT",
+    ]
 
-        Returns:
-            True if prerequisites met, False otherwise
-        """
-        # Check if command exists
-        command_path = shutil.which(self.config.osdu_mcp_command)
-        if not command_path:
-            logger.warning(
-                f"OSDU MCP disabled: '{self.config.osdu_mcp_command}' command not found. "
-                f"Install with: pip install uv"
-            )
-            return False
+    display_name = "OSDU"
+    server_package = "osdu-mcp-server"
 
-        self._validated = True
-        return True
+    @property
+    def command(self) -> str:
+        """Command used to launch the OSDU MCP server."""
+        return self.config.osdu_mcp_command
 
     def validate_required_env_vars(self) -> tuple[bool, list[str]]:
         """
@@ -100,18 +85,8 @@ class OsduMCPManager:
         all_present = len(missing) == 0
         return all_present, missing
 
-    async def __aenter__(self) -> "OsduMCPManager":
-        """
-        Async context manager entry.
-
-        Returns:
-            Self with initialized MCP tool
-        """
-        if not self.validate_prerequisites():
-            logger.warning("OSDU MCP prerequisites not met, continuing without OSDU tools")
-            return self
-
-        # Validate required environment variables before attempting to start server
+    def _prepare(self) -> bool:
+        """Validate required environment variables before attempting to start server."""
         env_valid, missing_vars = self.validate_required_env_vars()
         if not env_valid:
             logger.warning(
@@ -121,80 +96,25 @@ class OsduMCPManager:
                 "OSDU MCP requires: OSDU_MCP_SERVER_URL, OSDU_MCP_SERVER_DATA_PARTITION, "
                 "AZURE_TENANT_ID, AZURE_CLIENT_ID"
             )
-            return self
-
-        try:
-            # Build subprocess environment - pass all OSDU env vars
-            subprocess_env = os.environ.copy()
-
-            # Determine stderr log path
-            stderr_log_path: Optional[Path] = None
-            if log_dir is not None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                stderr_log_path = log_dir / f"osdu_mcp_{timestamp}.log"
-            else:
-                # Logging disabled - redirect to null device
-                stderr_log_path = Path(os.devnull)
-
-            # Initialize QuietMCPStdioTool with stderr redirection
-            # This prevents MCP server output from interfering with Rich Live display
-            self.mcp_tool = QuietMCPStdioTool(
-                name="osdu-mcp-server",
-                command=self.config.osdu_mcp_command,
-                args=self.config.osdu_mcp_args,
-                env=subprocess_env,
-                stderr_log_path=stderr_log_path,
-            )
-
-            # Enter the MCP tool's context
-            await self.mcp_tool.__aenter__()
-
-            logger.info("OSDU MCP server initialized successfully")
-            logger.info(f"Available capabilities: {len(self.tools)} tool(s)")
-
-        except FileNotFoundError as e:
-            logger.error(f"OSDU MCP server not found: {e}. " f"Install with: uvx osdu-mcp-server")
-            self.mcp_tool = None
-        except Exception as e:
-            logger.error(f"Failed to initialize OSDU MCP server: {e}")
-            self.mcp_tool = None
-
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        """
-        Async context manager exit.
-
-        Args:
-            exc_type: Exception type if any
-            exc_val: Exception value if any
-            exc_tb: Exception traceback if any
-        """
-        if self.mcp_tool:
-            try:
-                await self.mcp_tool.__aexit__(exc_type, exc_val, exc_tb)
-                logger.info("OSDU MCP server cleaned up successfully")
-            except Exception as e:
-                logger.error(f"Error cleaning up OSDU MCP server: {e}")
-
-    @property
-    def tools(self) -> List:
-        """
-        Get OSDU MCP tools for agent integration.
-
-        Returns:
-            List containing MCP tool if available, empty list otherwise
-        """
-        if self.mcp_tool:
-            return [self.mcp_tool]
-        return []
-
-    @property
-    def is_available(self) -> bool:
-        """
-        Check if OSDU MCP is available.
+            return False
+        return True
 
-        Returns:
-            True if OSDU MCP tools are available
-        """
-        return self.mcp_tool is not None
+    def _build_env(self) -> Dict[str, str]:
+        """Build subprocess environment - pass OSDU and Azure credential env vars only."""
+        names = self.REQUIRED_ENV_VARS + self.OPTIONAL_ENV_VARS + self.MANAGED_IDENTITY_ENV_VARS
+        return build_subprocess_env(names, prefixes=("OSDU_MCP_", "AZURE_"))
+
+    def _create_mcp_tool(self, env: Dict[str, str]) -> MCPStdioTool:
+        """Create the OSDU MCP stdio tool with stderr sent to logs/osdu_mcp_TIMESTAMP.log."""
+        return QuietMCPStdioTool(
+            name="osdu-mcp-server",
+            command=self.command,
+            args=self.config.osdu_mcp_args,
+            env=env,
+            stderr_log_path=build_stderr_log_path("osdu"),
+        )
+
+    def _log_ready(self) -> None:
+        """Log that the OSDU server is ready for use."""
+        logger.info("OSDU MCP server initialized successfully")
+        logger.info(f"Available capabilities: {len(self.tools)} tool(s)")
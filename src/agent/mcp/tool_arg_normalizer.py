@@ -11,8 +11,13 @@ from typing import Any, Dict
 
 logger = logging.getLogger(__name__)
 
+# Parameters with broken schemas in mvn-mcp-server that must be stripped
+_BROKEN_KEYS = frozenset({"profiles", "include_profiles", "severity_filter"})
 
-def normalize_maven_tool_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+
+def normalize_maven_tool_arguments(
+    arguments: Dict[str, Any], inplace: bool = False
+) -> Dict[str, Any]:
     """
     Normalize Maven MCP tool arguments to handle known schema bugs.
 
@@ -35,9 +40,12 @@ def normalize_maven_tool_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
 
     Args:
         arguments: The tool arguments dictionary
+        inplace: Mutate ``arguments`` directly instead of copying it. Only safe
+            when the caller owns the dictionary (e.g. it is already a private copy).
 
     Returns:
-        Normalized arguments with broken parameters removed
+        Normalized arguments with broken parameters removed. The input dict is
+        returned as-is (no copy) when none of the broken parameters are present.
 
     Example:
         >>> # LLM tries to use broken parameters
@@ -50,10 +58,10 @@ def normalize_maven_tool_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
         {'workspace': '/path'}
         # Broken parameters removed, warnings logged
     """
-    if not isinstance(arguments, dict):
+    if not isinstance(arguments, dict) or _BROKEN_KEYS.isdisjoint(arguments):
         return arguments
 
-    normalized = dict(arguments)
+    normalized = arguments if inplace else dict(arguments)
 
     # Remove 'profiles' if present (legacy parameter, causes validation errors)
     if "profiles" in normalized:
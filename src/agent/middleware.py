@@ -6,20 +6,84 @@ with tools and LLMs, enabling logging, metrics, and context injection.
 
 import logging
 import time
-from typing import Awaitable, Callable
+from contextlib import AbstractContextManager, nullcontext
+from typing import Awaitable, Callable, Optional
 
 from agent_framework import (
     AgentRunContext,
     ChatContext,
+    ChatMessage,
     FunctionInvocationContext,
+    Role,
     chat_middleware,
     function_middleware,
 )
-
-from agent.observability import record_tool_call, tracer
+from opentelemetry.trace import INVALID_SPAN, Span
+
+from agent.activity import get_activity_tracker
+from agent.display import (
+    LLMRequestEvent,
+    LLMResponseEvent,
+    format_tool_result,
+    get_event_emitter,
+    is_interactive_mode,
+)
+from agent.observability import (
+    is_tracing_enabled,
+    record_tool_call_soon,
+    should_sample_tool,
+    tracer,
+)
 
 logger = logging.getLogger(__name__)
 
+# Tool argument names never recorded on spans
+_SENSITIVE_ARG_KEYS = frozenset({"token", "api_key", "password", "secret"})
+
+# Upper bound for the tool.arguments span attribute (large search queries, file contents)
+_MAX_ARGUMENTS_ATTRIBUTE_LENGTH = 1024
+
+# Instruction appended to the workflow context summary before injection
+_WORKFLOW_CONTEXT_INSTRUCTION = """
+
+**IMPORTANT INSTRUCTION:**
+When the user asks about recent workflow results (tests, vulns, depends, status, fork),
+YOU MUST reference the workflow results shown above. DO NOT call GitHub tools
+to fetch information that is already available in these results.
+
+For example:
+- "what was the grade?" → Reference the Grade from Test Results above
+- "what CVEs did you find?" → Reference the Vulnerabilities from vulnerability scan results above
+- "how many tests passed?" → Reference the Test Results above
+- "which patches reduce vulnerabilities?" → Cross-reference Dependency Analysis patch updates with CVE Analysis to identify low-risk fixes
+- "what dependencies need updates?" → Reference the Dependency Updates section above
+
+**CROSS-REFERENCING WORKFLOWS:**
+If both /vulns and /depends results are available, you can correlate them:
+- CVE Analysis shows which packages have vulnerabilities and required versions
+- Dependency Analysis shows which updates are available (patch/minor/major)
+- Match package names to identify which dependency updates will fix which CVEs
+
+Always check this context FIRST before calling any tools."""
+
+
+def _start_span(name: str, sampled: bool = True) -> AbstractContextManager[Span]:
+    """Start a current span, or yield a no-op span when not traced.
+
+    Args:
+        name: Span name
+        sampled: False to skip the span (e.g. sampled-out high-frequency tools)
+
+    Returns:
+        Context manager yielding the span
+    """
+    if sampled and is_tracing_enabled():
+        # The span must be current so spans opened by the tool or chat client
+        # (MCP calls, HTTP requests) are parented to it. Attaching goes through
+        # contextvars, which asyncio already copies per task without locking.
+        return tracer.start_as_current_span(name)
+    return nullcontext(INVALID_SPAN)
+
 
 @function_middleware  # Explicitly mark as function middleware (per docs)
 async def logging_function_middleware(
@@ -40,103 +104,94 @@ async def logging_function_middleware(
         context: Function invocation context containing tool name, arguments, and result
         next: Next middleware or the actual function execution
     """
-    # Import activity tracker
-    from agent.activity import get_activity_tracker
-
     # Pre-processing: Log before function execution
-    tool_name = (
-        context.function.name if hasattr(context.function, "name") else str(context.function)
-    )
+    function = context.function
+    tool_name = function.name if hasattr(function, "name") else str(function)
 
     logger.info(f"[Tool Call] {tool_name}")
 
     # Update console activity tracker
     activity_tracker = get_activity_tracker()
     formatted_name = activity_tracker.format_tool_name(tool_name)
-    await activity_tracker.update(f"🔧 {formatted_name}...")
+    activity_tracker.update_nowait(f"🔧 {formatted_name}...")
+
+    # Resolve arguments once - convert BaseModel to dict if needed
+    arguments = getattr(context, "arguments", None)
+    if hasattr(arguments, "dict"):
+        arguments_dict = arguments.dict()  # type: ignore[union-attr]
+    else:
+        arguments_dict = arguments
 
     # Emit tool start event (if in interactive mode)
-    arguments = context.arguments if hasattr(context, "arguments") else None
-    # Convert BaseModel to dict if needed
-    arguments_dict = arguments.dict() if hasattr(arguments, "dict") else arguments  # type: ignore[union-attr]
     activity_tracker.emit_tool_start(tool_name, arguments_dict)  # type: ignore[arg-type]
 
     # Log arguments at debug level (can be verbose)
-    if hasattr(context, "arguments") and context.arguments:
-        logger.debug(f"[Tool Args] {context.arguments}")
+    if arguments and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[Tool Args] %s", arguments)
 
     # Start OpenTelemetry span for tracing
-    with tracer.start_as_current_span("tool_call") as span:
-        span.set_attribute("tool.name", tool_name)
-
-        # Add arguments as span attributes (sanitized)
-        if hasattr(context, "arguments") and context.arguments:
-            # Convert BaseModel to dict if needed, otherwise ensure it's a dict
-            args_as_dict = (
-                context.arguments.dict()
-                if hasattr(context.arguments, "dict")
-                else (context.arguments if isinstance(context.arguments, dict) else {})
-            )
-            # Only add non-sensitive arguments
-            safe_args = {
-                k: v
-                for k, v in args_as_dict.items()
-                if k not in ["token", "api_key", "password", "secret"]
-            }
+    with _start_span("tool_call", sampled=should_sample_tool(tool_name)) as span:
+        span_attributes = {"tool.name": tool_name}
+
+        # Add arguments as span attributes (sanitized), stringifying them only when
+        # the span is actually recorded
+        if arguments_dict and isinstance(arguments_dict, dict) and span.is_recording():
+            # Only add non-sensitive arguments (usually there are none to strip)
+            if _SENSITIVE_ARG_KEYS.isdisjoint(arguments_dict):
+                safe_args = arguments_dict
+            else:
+                safe_args = {
+                    k: v for k, v in arguments_dict.items() if k not in _SENSITIVE_ARG_KEYS
+                }
             if safe_args:
-                span.set_attribute("tool.arguments", str(safe_args))
+                span_attributes["tool.arguments"] = str(safe_args)[:_MAX_ARGUMENTS_ATTRIBUTE_LENGTH]
 
-        start_time = time.time()
+        # Set all start attributes in one call (one span lock acquisition)
+        span.set_attributes(span_attributes)
+
+        start = time.perf_counter()
         status = "success"
+        error_message: Optional[str] = None
+        completed = False
 
         try:
             # Continue to next middleware or function execution
             await next(context)
-
-            # Update activity tracker on success
-            await activity_tracker.update(f"✓ {formatted_name}")
-
-            # Emit tool complete event with result summary
-            duration = time.time() - start_time
-            result = context.result if hasattr(context, "result") else None
-
-            # Format result summary
-            from agent.display.result_formatter import format_tool_result
-
-            result_summary = format_tool_result(tool_name, result)
-
-            activity_tracker.emit_tool_complete(tool_name, result_summary, duration)
+            completed = True
 
         except Exception as e:
             # Track errors
             status = "error"
-            span.set_attribute("error", True)
-            span.set_attribute("error.message", str(e))
-            logger.error(f"[Tool Error] {tool_name}: {str(e)}")
-
-            # Update activity tracker on error
-            await activity_tracker.update(f"✗ {formatted_name} failed")
-
-            # Emit tool error event
-            duration = time.time() - start_time
-            activity_tracker.emit_tool_error(tool_name, str(e), duration)
+            error_message = str(e)
+            span.set_attributes({"error": True, "error.message": error_message})
+            logger.error(f"[Tool Error] {tool_name}: {error_message}")
 
             raise
 
         finally:
-            # Post-processing: Log after function execution
-            duration = time.time() - start_time
+            # Post-processing: one clock read shared by events, span and metrics
+            duration = time.perf_counter() - start
             span.set_attribute("tool.duration", duration)
 
+            if completed:
+                # Update activity tracker and emit tool complete event with result summary
+                activity_tracker.update_nowait(f"✓ {formatted_name}")
+                result_summary = format_tool_result(tool_name, getattr(context, "result", None))
+                activity_tracker.emit_tool_complete(tool_name, result_summary, duration)
+            elif error_message is not None:
+                # Update activity tracker and emit tool error event
+                activity_tracker.update_nowait(f"✗ {formatted_name} failed")
+                activity_tracker.emit_tool_error(tool_name, error_message, duration)
+
             logger.info(f"[Tool Complete] {tool_name} ({duration:.2f}s)")
 
             # Log result at debug level
-            if hasattr(context, "result") and context.result:
+            if logger.isEnabledFor(logging.DEBUG) and getattr(context, "result", None):
                 result_preview = str(context.result)[:200]  # First 200 chars
-                logger.debug(f"[Tool Result] {result_preview}...")
+                logger.debug("[Tool Result] %s...", result_preview)
 
-            # Record metrics
-            record_tool_call(tool_name, duration, status)
+            # Record metrics on the next loop iteration, off the awaited path
+            record_tool_call_soon(tool_name, duration, status)
 
 
 @chat_middleware  # Explicitly mark as chat middleware (per docs)
@@ -156,20 +211,15 @@ async def logging_chat_middleware(
         context: Chat context containing messages and model configuration
         next: Next middleware or the actual LLM service call
     """
-    # Import activity tracker
-    from agent.activity import get_activity_tracker
-
     # Pre-processing: Log before AI call
     message_count = len(context.messages) if hasattr(context, "messages") else 0
     logger.info(f"[LLM Request] {message_count} messages")
 
     # Update console activity tracker
     activity_tracker = get_activity_tracker()
-    await activity_tracker.update("🤖 Thinking with AI...")
+    activity_tracker.update_nowait("🤖 Thinking with AI...")
 
     # Emit LLM request event (if in interactive mode)
-    from agent.display import LLMRequestEvent, get_event_emitter, is_interactive_mode
-
     llm_event_id = None
     if is_interactive_mode():
         event = LLMRequestEvent(message_count=message_count)
@@ -178,52 +228,58 @@ async def logging_chat_middleware(
         emitter.emit(event)
 
     # Log last message at debug level (usually the user query)
-    if hasattr(context, "messages") and context.messages:
+    if logger.isEnabledFor(logging.DEBUG) and getattr(context, "messages", None):
         last_message = context.messages[-1]
         if isinstance(last_message, dict) and "content" in last_message:
             content_preview = str(last_message["content"])[:200]  # First 200 chars
-            logger.debug(f"[LLM Query] {content_preview}...")
+            logger.debug("[LLM Query] %s...", content_preview)
 
     # Start OpenTelemetry span for tracing
-    with tracer.start_as_current_span("llm_call") as span:
-        span.set_attribute("llm.message_count", message_count)
+    with _start_span("llm_call") as span:
+        span_attributes = {"llm.message_count": message_count}
 
         # Add model info if available
         if hasattr(context, "model"):
-            span.set_attribute("llm.model", context.model)
+            span_attributes["llm.model"] = context.model
 
-        start_time = time.time()
+        span.set_attributes(span_attributes)
+
+        start = time.perf_counter()
 
         try:
             # Continue to next middleware or AI service
             await next(context)
 
+            # Update activity tracker on success (also polled by the --quiet status line)
+            activity_tracker.update_nowait("✓ AI response received")
+
+            # Skip the remaining post-processing when nothing would consume it:
+            # no response event pending, span not recorded and INFO logging off
+            if not (llm_event_id or span.is_recording() or logger.isEnabledFor(logging.INFO)):
+                return
+
             # Post-processing: Log after AI response
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start
             span.set_attribute("llm.duration", duration)
 
             logger.info(f"[LLM Response] Received ({duration:.2f}s)")
 
-            # Update activity tracker on success
-            await activity_tracker.update("✓ AI response received")
-
-            # Emit LLM response event (if in interactive mode)
-            from agent.display import LLMResponseEvent, get_event_emitter, is_interactive_mode
-
-            if is_interactive_mode() and llm_event_id:
+            # Emit LLM response event (only set when the request event was emitted
+            # in interactive mode, so the mode does not need to be checked again)
+            if llm_event_id:
                 response_event = LLMResponseEvent(duration=duration)
                 response_event.event_id = llm_event_id
                 emitter = get_event_emitter()
                 emitter.emit(response_event)
 
             # Log response at debug level
-            if hasattr(context, "response") and context.response:
-                response_preview = str(context.response)[:200]  # First 200 chars
-                logger.debug(f"[LLM Response Content] {response_preview}...")
+            response = getattr(context, "response", None)
+            if response and logger.isEnabledFor(logging.DEBUG):
+                response_preview = str(response)[:200]  # First 200 chars
+                logger.debug("[LLM Response Content] %s...", response_preview)
 
         except Exception as e:
-            span.set_attribute("error", True)
-            span.set_attribute("error.message", str(e))
+            span.set_attributes({"error": True, "error.message": str(e)})
             logger.error(f"[LLM Error] {str(e)}")
             raise
 
@@ -254,46 +310,34 @@ async def workflow_context_agent_middleware(
     # (see observability.py) when spans are created, so we don't need to do it here.
 
     # Import here to avoid circular dependency
-    from agent.workflows import get_result_store
+    from agent.workflows import flush_pending_stores, get_result_store
 
-    # Get recent workflow results
+    # Get recent workflow results, including any still being stored
+    await flush_pending_stores()
     result_store = get_result_store()
+    if result_store.is_empty:
+        # Nothing to inject - skip building the context summary
+        logger.debug("[Context Injection] No workflow results stored")
+        await next(context)
+        return
+
     context_summary = await result_store.get_context_summary(limit=3)
 
     logger.debug(f"[Context Retrieval] Found {len(context_summary)} chars of workflow context")
 
     if context_summary and hasattr(context, "messages") and context.messages:
         # Enhanced context with explicit instruction to use the data
-        enhanced_context = f"""{context_summary}
-
-**IMPORTANT INSTRUCTION:**
-When the user asks about recent workflow results (tests, vulns, depends, status, fork),
-YOU MUST reference the workflow results shown above. DO NOT call GitHub tools
-to fetch information that is already available in these results.
-
-For example:
-- "what was the grade?" → Reference the Grade from Test Results above
-- "what CVEs did you find?" → Reference the Vulnerabilities from vulnerability scan results above
-- "how many tests passed?" → Reference the Test Results above
-- "which patches reduce vulnerabilities?" → Cross-reference Dependency Analysis patch updates with CVE Analysis to identify low-risk fixes
-- "what dependencies need updates?" → Reference the Dependency Updates section above
-
-**CROSS-REFERENCING WORKFLOWS:**
-If both /vulns and /depends results are available, you can correlate them:
-- CVE Analysis shows which packages have vulnerabilities and required versions
-- Dependency Analysis shows which updates are available (patch/minor/major)
-- Match package names to identify which dependency updates will fix which CVEs
-
-Always check this context FIRST before calling any tools."""
+        enhanced_context = context_summary + _WORKFLOW_CONTEXT_INSTRUCTION
 
         # Create a user message with the workflow context
         # Insert it right before the current user query
-        from agent_framework import ChatMessage, Role
-
         context_message = ChatMessage(role=Role.SYSTEM, text=enhanced_context)
 
-        # Insert before the last message (current user query)
-        context.messages.insert(-1, context_message)
+        # Place before the last message (current user query). Appending the query
+        # and overwriting its old slot avoids list.insert shifting the history.
+        messages = context.messages
+        messages.append(messages[-1])
+        messages[-2] = context_message
 
         logger.info(f"[Context Injection] Injected workflow context ({len(context_summary)} chars)")
     else:
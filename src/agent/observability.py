@@ -4,42 +4,227 @@ This module provides tracing and metrics capabilities through Microsoft Agent Fr
 OpenTelemetry integration, enabling monitoring via Azure AI Foundry dashboards.
 """
 
+import asyncio
 import logging
 import os
-import subprocess
+import re
+import time
 from contextvars import ContextVar
-from typing import TYPE_CHECKING, Dict, Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
 
 from agent_framework.observability import get_meter, get_tracer, setup_observability
+from opentelemetry import trace
 
 if TYPE_CHECKING:
-    from opentelemetry import trace
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
-# Suppress Azure Monitor SDK warnings and debug output
-# These are harmless and occur due to OneSettings connection timeouts and parallel MCP initialization
-logging.getLogger("azure.monitor.opentelemetry.exporter.statsbeat._manager").setLevel(logging.ERROR)
-logging.getLogger("azure.monitor.opentelemetry.exporter._configuration._utils").setLevel(
-    logging.ERROR
+# Context variables for user/session tracking across async contexts
+# Values are read-only mappings replaced wholesale on update, so span processors can
+# read them without copying and with None values already filtered out
+_EMPTY_CONTEXT: Mapping[str, str] = MappingProxyType({})
+_user_session_context: ContextVar[Mapping[str, str]] = ContextVar(
+    "user_session_context", default=_EMPTY_CONTEXT
 )
-logging.getLogger("azure.monitor.opentelemetry.exporter._configuration").setLevel(logging.ERROR)
-
-# Set default service name for OpenTelemetry if not already configured
-os.environ.setdefault("OTEL_SERVICE_NAME", "osdu-agent")
 
-# Context variables for user/session tracking across async contexts
-_user_session_context: ContextVar[Dict[str, str]] = ContextVar("user_session_context", default={})
+# Becomes True on the first context update, letting span processing skip the
+# context lookup entirely when no user/session context was ever set
+_user_session_context_used = False
 
 # Track if observability has been initialized (for idempotency)
 _observability_initialized = False
 
+# Set once initialization finds no exporter configured, so later calls return
+# immediately without re-checking configuration or logging again
+_observability_disabled = False
 
-async def fetch_app_insights_from_workspace(
+# Track if an exporter has been configured, so hot paths can skip span creation
+_tracing_enabled = False
+
+
+# Azure Resource Manager endpoint and token scope used for App Insights discovery
+_ARM_ENDPOINT = "https://management.azure.com"
+_ARM_SCOPE = "https://management.azure.com/.default"
+
+# Identification and connection cap for discovery requests to ARM
+_ARM_USER_AGENT = "osdu-agent/observability"
+_ARM_MAX_CONNECTIONS = 4
+
+# Cached ARM access token (token, expires_on) reused until shortly before it expires
+_ARM_TOKEN_REFRESH_MARGIN_SECONDS = 60
+_arm_token: Optional[tuple[str, float]] = None
+
+# Application Insights component resource ID, capturing its resource group and name
+_APP_INSIGHTS_RESOURCE_ID_RE = re.compile(
+    r"^/subscriptions/[^/]+/resourceGroups/(?P<rg>[^/]+)"
+    r"/providers/microsoft\.insights/components/(?P<name>[^/]+)$",
+    re.IGNORECASE,
+)
+
+# Discovered connection strings, cached per workspace for the life of the process
+_app_insights_cache: Dict[str, str] = {}
+
+# Overall budget for connection string discovery, since it delays CLI startup, and how
+# long a timed-out workspace is skipped (monotonic deadline per workspace key)
+_DISCOVERY_CONNECT_TIMEOUT_SECONDS = 1.0
+_DISCOVERY_RETRY_AFTER_TIMEOUT_SECONDS = 60.0
+_app_insights_retry_after: Dict[str, float] = {}
+
+
+def _mask_connection_string(connection_string: Optional[str]) -> Optional[str]:
+    """Mask the instrumentation key of an Application Insights connection string for logging."""
+    if not connection_string:
+        return None
+    if "InstrumentationKey=" in connection_string:
+        return connection_string.split(";")[0].replace("InstrumentationKey=", "***")
+    return "***"
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment, falling back to the default if unset or invalid."""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name} value, using {default}")
+        return default
+
+
+@dataclass(frozen=True)
+class ObservabilityConfig:
+    """Observability settings read from the environment."""
+
+    app_insights: Optional[str] = None
+    otlp: Optional[str] = None
+    project_endpoint: Optional[str] = None
+    project_connection_string: Optional[str] = None
+    auto_discover: bool = False
+    enable_sensitive_data: bool = False
+    discovery_timeout: float = 5.0
+    masked_key: Optional[str] = field(init=False, repr=False)
+    configured: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "masked_key", _mask_connection_string(self.app_insights))
+        object.__setattr__(self, "configured", bool(self.app_insights or self.otlp))
+
+    @classmethod
+    def from_env(cls) -> "ObservabilityConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            app_insights=os.getenv("APPLICATIONINSIGHTS_CONNECTION_STRING"),
+            otlp=os.getenv("OTLP_ENDPOINT"),
+            project_endpoint=os.getenv("AZURE_AI_PROJECT_ENDPOINT"),
+            project_connection_string=os.getenv("AZURE_AI_PROJECT_CONNECTION_STRING"),
+            auto_discover=os.getenv("OSDU_AUTO_DISCOVER_APPINSIGHTS", "false").lower() == "true",
+            enable_sensitive_data=os.getenv("ENABLE_SENSITIVE_DATA", "false").lower() == "true",
+            discovery_timeout=_env_float("OSDU_OBS_DISCOVERY_TIMEOUT_S", 5.0),
+        )
+
+
+@lru_cache(maxsize=1)
+def _cfg() -> ObservabilityConfig:
+    """Snapshot the observability environment on first use.
+
+    The environment (including .env) is loaded before observability is set up, so
+    the snapshot is taken once; tests call ``_cfg.cache_clear()`` after patching it.
+    """
+    return ObservabilityConfig.from_env()
+
+
+def _reset_observability_state() -> None:
+    """Forget the configuration snapshot and initialization outcome (for tests)."""
+    global _observability_initialized, _observability_disabled, _tracing_enabled
+
+    _cfg.cache_clear()
+    _observability_initialized = False
+    _observability_disabled = False
+    _tracing_enabled = False
+
+
+def _prepare_exporter_setup(connection_string: Optional[str]) -> None:
+    """
+    Apply process-wide settings needed right before exporters are configured.
+
+    Kept out of module import so cold paths (``--help``, offline runs) neither
+    mutate os.environ nor touch Azure Monitor loggers.
+
+    Args:
+        connection_string: Application Insights connection string, if Azure Monitor is used
+    """
+    # Set default service name for OpenTelemetry if not already configured
+    os.environ.setdefault("OTEL_SERVICE_NAME", "osdu-agent")
+
+    if connection_string:
+        # Suppress Azure Monitor SDK warnings and debug output
+        # These are harmless and occur due to OneSettings connection timeouts and parallel MCP
+        # initialization
+        for name in (
+            "azure.monitor.opentelemetry.exporter.statsbeat._manager",
+            "azure.monitor.opentelemetry.exporter._configuration._utils",
+            "azure.monitor.opentelemetry.exporter._configuration",
+        ):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+
+async def _get_arm_token() -> str:
+    """
+    Acquire an Azure Resource Manager access token.
+
+    The token is cached for its lifetime, so repeated discovery within that window
+    skips the credential chain (environment, managed identity, Azure CLI) entirely.
+
+    Returns:
+        Bearer token for management.azure.com
+    """
+    global _arm_token
+
+    if _arm_token is not None:
+        token, expires_on = _arm_token
+        if time.time() < expires_on - _ARM_TOKEN_REFRESH_MARGIN_SECONDS:
+            return token
+
+    from azure.identity.aio import DefaultAzureCredential
+
+    async with DefaultAzureCredential(exclude_interactive_browser_credential=True) as credential:
+        access_token = await credential.get_token(_ARM_SCOPE)
+    _arm_token = (access_token.token, access_token.expires_on)
+    return access_token.token
+
+
+async def _arm_get_json(session: "aiohttp.ClientSession", url: str) -> Optional[Any]:
+    """
+    GET an Azure Resource Manager URL and decode the JSON body.
+
+    Args:
+        session: HTTP session carrying the ARM Authorization header
+        url: Fully qualified management.azure.com URL
+
+    Returns:
+        Decoded JSON body, or None if the request failed
+    """
+    async with session.get(url) as response:
+        if response.status != 200:
+            logger.warning(
+                f"Azure Management API request failed ({response.status}): "
+                f"{await response.text()}"
+            )
+            return None
+        return await response.json()
+
+
+async def _discover_app_insights_connection_string(
     subscription_id: str, resource_group: str, workspace_name: str
 ) -> Optional[str]:
     """
-    Fetch Application Insights connection string from Azure ML workspace using REST API.
+    Look up the Application Insights connection string through Azure Resource Manager.
+
+    Calls Azure Resource Manager directly over HTTPS instead of shelling out to the
+    Azure CLI, so discovery does not block the event loop on CLI startup. Timeouts
+    are raised to the caller, which applies the overall discovery budget.
 
     Args:
         subscription_id: Azure subscription ID
@@ -48,100 +233,136 @@ async def fetch_app_insights_from_workspace(
 
     Returns:
         Application Insights connection string if successful, None otherwise
+
+    Raises:
+        asyncio.TimeoutError: If a request exceeds the discovery timeout
     """
     try:
-        # Step 1: Get the Application Insights resource ID from the workspace
-        workspace_url = (
-            f"https://management.azure.com/subscriptions/{subscription_id}"
-            f"/resourceGroups/{resource_group}"
-            f"/providers/Microsoft.MachineLearningServices/workspaces/{workspace_name}"
-            f"?api-version=2023-04-01"
-        )
+        import aiohttp
+
+        token = await _get_arm_token()
 
-        result = subprocess.run(
-            [
-                "az",
-                "rest",
-                "--method",
-                "get",
-                "--url",
-                workspace_url,
-                "--query",
-                "properties.applicationInsights",
-                "--output",
-                "tsv",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
+        timeout = aiohttp.ClientTimeout(
+            total=_cfg().discovery_timeout, connect=_DISCOVERY_CONNECT_TIMEOUT_SECONDS
         )
+        # Both requests share the session, its keep-alive connection and the bearer
+        # token, so the component lookup reuses the TLS connection to ARM. The session
+        # is not kept at module level since it is bound to the running event loop.
+        async with aiohttp.ClientSession(
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {token}", "User-Agent": _ARM_USER_AGENT},
+            connector=aiohttp.TCPConnector(limit=_ARM_MAX_CONNECTIONS),
+        ) as session:
+            # Step 1: Get the Application Insights resource ID from the workspace
+            workspace_url = (
+                f"{_ARM_ENDPOINT}/subscriptions/{subscription_id}"
+                f"/resourceGroups/{resource_group}"
+                f"/providers/Microsoft.MachineLearningServices/workspaces/{workspace_name}"
+                f"?api-version=2023-04-01"
+            )
 
-        if result.returncode != 0:
-            logger.warning(f"Failed to get workspace details: {result.stderr}")
-            return None
+            workspace = await _arm_get_json(session, workspace_url)
+            if workspace is None:
+                logger.warning("Failed to get workspace details")
+                return None
+
+            app_insights_resource_id = (workspace.get("properties") or {}).get(
+                "applicationInsights"
+            ) or ""
+            if not app_insights_resource_id:
+                logger.warning("No Application Insights resource linked to workspace")
+                return None
+
+            # Parse the resource ID to get resource group and app insights name
+            # Format: /subscriptions/{sub}/resourceGroups/{rg}/providers/microsoft.insights/components/{name}
+            match = _APP_INSIGHTS_RESOURCE_ID_RE.match(app_insights_resource_id)
+            if not match:
+                logger.warning(
+                    f"Invalid Application Insights resource ID format: {app_insights_resource_id}"
+                )
+                return None
+
+            app_insights_rg, app_insights_name = match.group("rg", "name")
+
+            logger.info(f"Found Application Insights: {app_insights_name} in {app_insights_rg}")
+
+            # Step 2: Get the connection string from the Application Insights component
+            component = await _arm_get_json(
+                session,
+                f"{_ARM_ENDPOINT}{app_insights_resource_id}?api-version=2020-02-02",
+            )
+            if component is None:
+                logger.warning("Failed to get App Insights connection string")
+                return None
 
-        app_insights_resource_id = result.stdout.strip()
-        if not app_insights_resource_id:
-            logger.warning("No Application Insights resource linked to workspace")
-            return None
+        connection_string = (component.get("properties") or {}).get("ConnectionString")
+        if isinstance(connection_string, str) and connection_string:
+            logger.info("✓ Successfully fetched Application Insights connection string from Azure")
+            return connection_string
 
-        # Parse the resource ID to get resource group and app insights name
-        # Format: /subscriptions/{sub}/resourceGroups/{rg}/providers/microsoft.insights/components/{name}
-        parts = app_insights_resource_id.split("/")
-        if len(parts) < 9:
-            logger.warning(
-                f"Invalid Application Insights resource ID format: {app_insights_resource_id}"
-            )
-            return None
+        return None
 
-        app_insights_rg = parts[4]
-        app_insights_name = parts[-1]
-
-        logger.info(f"Found Application Insights: {app_insights_name} in {app_insights_rg}")
-
-        # Step 2: Get the connection string from Application Insights
-        result = subprocess.run(
-            [
-                "az",
-                "monitor",
-                "app-insights",
-                "component",
-                "show",
-                "--app",
-                app_insights_name,
-                "--resource-group",
-                app_insights_rg,
-                "--query",
-                "connectionString",
-                "--output",
-                "tsv",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+    except asyncio.TimeoutError:
+        raise
+    except Exception as e:
+        logger.warning(f"Error fetching App Insights connection string: {e}")
+        return None
 
-        if result.returncode != 0:
-            logger.warning(f"Failed to get App Insights connection string: {result.stderr}")
-            return None
 
-        connection_string = result.stdout.strip()
-        if connection_string:
-            logger.info("✓ Successfully fetched Application Insights connection string from Azure")
-            return connection_string
+async def fetch_app_insights_from_workspace(
+    subscription_id: str, resource_group: str, workspace_name: str
+) -> Optional[str]:
+    """
+    Fetch Application Insights connection string from Azure ML workspace using REST API.
+
+    The linked connection string rarely changes, so results are cached in-process
+    to skip repeated Azure Resource Manager round-trips. Discovery is bounded by
+    OSDU_OBS_DISCOVERY_TIMEOUT_S (default 5s); after a timeout the workspace is
+    not retried for a minute.
+
+    Args:
+        subscription_id: Azure subscription ID
+        resource_group: Resource group containing the workspace
+        workspace_name: Machine Learning workspace name
 
+    Returns:
+        Application Insights connection string if successful, None otherwise
+    """
+    cache_key = f"{subscription_id}/{resource_group}/{workspace_name}"
+
+    connection_string = _app_insights_cache.get(cache_key)
+    if connection_string:
+        return connection_string
+
+    retry_after = _app_insights_retry_after.get(cache_key)
+    if retry_after is not None and time.monotonic() < retry_after:
+        logger.debug("Skipping App Insights discovery after a recent timeout")
         return None
 
-    except subprocess.TimeoutExpired:
+    try:
+        connection_string = await asyncio.wait_for(
+            _discover_app_insights_connection_string(
+                subscription_id, resource_group, workspace_name
+            ),
+            timeout=_cfg().discovery_timeout,
+        )
+    except asyncio.TimeoutError:
         logger.debug(
-            "Azure Management API call timed out while fetching App Insights connection string. "
-            "To skip auto-discovery, set APPLICATIONINSIGHTS_CONNECTION_STRING directly."
+            "Azure Management API call timed out while fetching App Insights connection "
+            "string. To skip auto-discovery, set APPLICATIONINSIGHTS_CONNECTION_STRING "
+            "directly."
+        )
+        _app_insights_retry_after[cache_key] = (
+            time.monotonic() + _DISCOVERY_RETRY_AFTER_TIMEOUT_SECONDS
         )
         return None
-    except Exception as e:
-        logger.warning(f"Error fetching App Insights connection string: {e}")
+
+    if not connection_string:
         return None
 
+    _app_insights_cache[cache_key] = connection_string
+    return connection_string
+
 
 async def setup_azure_ai_foundry_observability() -> Optional[str]:
     """
@@ -150,19 +371,35 @@ async def setup_azure_ai_foundry_observability() -> Optional[str]:
     Fetches Application Insights connection string from the Azure ML workspace
     without requiring users to manually configure it.
 
+    Discovery is library-only: the CLI does not call it (startup sets up
+    observability from APPLICATIONINSIGHTS_CONNECTION_STRING or OTLP_ENDPOINT
+    instead, see _setup_foundry_observability_if_needed in cli.py), so the
+    settings below only apply to code that calls this function directly.
+
     Supports two input methods:
     1. AZURE_AI_PROJECT_ENDPOINT (extracts workspace details from endpoint URL)
     2. AZURE_AI_PROJECT_CONNECTION_STRING (explicit workspace coordinates)
 
+    Discovery is opt-in: it only runs when AZURE_AI_PROJECT_CONNECTION_STRING is set
+    or OSDU_AUTO_DISCOVER_APPINSIGHTS=true, so the common path of setting
+    APPLICATIONINSIGHTS_CONNECTION_STRING directly never contacts Azure.
+
     Returns:
         Application Insights connection string if successful, None otherwise
 
     Environment Variables:
         AZURE_AI_PROJECT_ENDPOINT: https://<workspace>.<region>.api.azureml.ms
         AZURE_AI_PROJECT_CONNECTION_STRING: <region>.api.azureml.ms;<sub-id>;<rg>;<workspace>
+        OSDU_AUTO_DISCOVER_APPINSIGHTS: Set to 'true' to attempt discovery from the endpoint
+        OSDU_OBS_DISCOVERY_TIMEOUT_S: Discovery time budget in seconds (default 5)
     """
-    project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
-    connection_string_config = os.getenv("AZURE_AI_PROJECT_CONNECTION_STRING")
+    config = _cfg()
+    project_endpoint = config.project_endpoint
+    connection_string_config = config.project_connection_string
+
+    if not (connection_string_config or config.auto_discover):
+        logger.debug("Azure AI Foundry observability: auto-discovery not enabled")
+        return None
 
     workspace_name = None
     resource_group = None
@@ -206,13 +443,15 @@ async def setup_azure_ai_foundry_observability() -> Optional[str]:
     )
 
     if connection_string:
-        # Now setup observability with the fetched connection string
-        enable_sensitive_data = os.getenv("ENABLE_SENSITIVE_DATA", "false").lower() == "true"
+        global _tracing_enabled
 
+        # Now setup observability with the fetched connection string
+        _prepare_exporter_setup(connection_string)
         setup_observability(
-            enable_sensitive_data=enable_sensitive_data,
+            enable_sensitive_data=_cfg().enable_sensitive_data,
             applicationinsights_connection_string=connection_string,
         )
+        _tracing_enabled = True
 
         logger.info("✓ Azure AI Foundry observability configured successfully (auto-fetched)")
         return connection_string
@@ -241,16 +480,20 @@ def initialize_observability() -> bool:
         ENABLE_SENSITIVE_DATA: Set to 'true' to log prompts, responses, and tool arguments (default: false)
         OTLP_ENDPOINT: Optional OTLP endpoint for additional exporters (e.g., http://localhost:4317)
     """
-    global _observability_initialized
+    global _observability_initialized, _observability_disabled, _tracing_enabled
 
     # Return early if already initialized (idempotency)
     if _observability_initialized:
         logger.debug("Observability already initialized, skipping")
         return True
 
-    connection_string = os.getenv("APPLICATIONINSIGHTS_CONNECTION_STRING")
-    otlp_endpoint = os.getenv("OTLP_ENDPOINT")
-    project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
+    # Return early if a previous call found nothing to configure
+    if _observability_disabled:
+        return False
+
+    config = _cfg()
+    connection_string = config.app_insights
+    otlp_endpoint = config.otlp
 
     # Try Azure AI Foundry auto-discovery first (requires async)
     # We'll handle this separately in agent initialization since we can't use async here
@@ -258,7 +501,7 @@ def initialize_observability() -> bool:
 
     # Only initialize if we have at least one exporter configured
     if not connection_string and not otlp_endpoint:
-        if project_endpoint:
+        if config.project_endpoint:
             logger.info(
                 "Azure AI Foundry endpoint detected. Observability will be configured when agent starts."
             )
@@ -267,21 +510,23 @@ def initialize_observability() -> bool:
             "Observability not initialized: APPLICATIONINSIGHTS_CONNECTION_STRING, "
             "OTLP_ENDPOINT, and AZURE_AI_PROJECT_ENDPOINT not set"
         )
+        _observability_disabled = True
         return False
 
     try:
         # Enable sensitive data logging if requested (default: False for security)
-        enable_sensitive_data = os.getenv("ENABLE_SENSITIVE_DATA", "false").lower() == "true"
+        enable_sensitive_data = config.enable_sensitive_data
 
         # Setup observability with configured endpoints
+        _prepare_exporter_setup(connection_string)
         setup_observability(
             enable_sensitive_data=enable_sensitive_data,
             otlp_endpoint=otlp_endpoint,
             applicationinsights_connection_string=connection_string,
         )
+        _tracing_enabled = True
 
         # Install custom span processor for user/session context injection
-        from opentelemetry import trace
         from opentelemetry.sdk.trace import TracerProvider
 
         tracer_provider = trace.get_tracer_provider()
@@ -291,14 +536,9 @@ def initialize_observability() -> bool:
             logger.info("  User/session span processor installed")
 
         logger.info("OpenTelemetry observability initialized successfully")
-        if connection_string:
-            # Mask the instrumentation key for security
-            masked_key = (
-                connection_string.split(";")[0].replace("InstrumentationKey=", "***")
-                if "InstrumentationKey=" in connection_string
-                else "***"
-            )
-            logger.info(f"  Application Insights: {masked_key}")
+        if config.masked_key:
+            # Instrumentation key was masked when the configuration was read
+            logger.info(f"  Application Insights: {config.masked_key}")
         if otlp_endpoint:
             logger.info(f"  OTLP Endpoint: {otlp_endpoint}")
         if enable_sensitive_data:
@@ -329,12 +569,13 @@ class UserSessionSpanProcessor:
             span: The span that was started
             parent_context: Optional parent context
         """
+        if not _user_session_context_used:
+            return
+
         try:
-            user_context = get_user_session_context()
+            user_context = _user_session_context.get()
             if user_context:
-                for key, value in user_context.items():
-                    if value is not None:
-                        span.set_attribute(key, value)
+                span.set_attributes(user_context)
         except Exception as e:
             logger.debug(f"Error injecting user context into span: {e}")
 
@@ -367,7 +608,12 @@ class UserSessionSpanProcessor:
 # See _setup_foundry_observability_if_needed() in cli.py
 
 # Initialize OpenTelemetry tracer and meter
-# These will use the configured exporters if observability was initialized
+# These will use the configured exporters if observability was initialized.
+# They are created eagerly on purpose: until a provider is installed they are
+# OpenTelemetry proxy objects, so creating them (and the instruments below) costs
+# no exporter work. The OpenTelemetry import itself is already paid by
+# agent_framework, which instruments its own clients, so deferring it here would
+# not shorten startup while it would break `from agent.observability import tracer`.
 tracer = get_tracer()
 meter = get_meter()
 
@@ -429,6 +675,95 @@ llm_tokens_counter = meter.create_counter(
 )
 
 
+# Head-based sampling ratios for tool_call spans of high-frequency tools (the
+# filesystem tools dependency analysis calls in loops). Tools not listed here are
+# always traced; metrics are recorded for every call.
+TOOL_SAMPLE_RATES: Dict[str, float] = {
+    "list_files": 0.1,
+    "read_file": 0.1,
+    "search_in_files": 0.1,
+}
+
+# Per-tool call counters used for deterministic sampling
+_tool_sample_counts: Dict[str, int] = {}
+
+
+def should_sample_tool(tool_name: str) -> bool:
+    """Decide whether a tool call should get its own span.
+
+    Sampling is deterministic: a tool with rate 0.1 traces its 1st, 11th, 21st, ... call.
+
+    Args:
+        tool_name: Name of the tool being called
+
+    Returns:
+        True if a span should be created for this call
+    """
+    rate = TOOL_SAMPLE_RATES.get(tool_name)
+    if rate is None or rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+
+    count = _tool_sample_counts.get(tool_name, 0)
+    _tool_sample_counts[tool_name] = count + 1
+    return count % round(1 / rate) == 0
+
+
+# Attribute dicts are cached and shared between calls. OpenTelemetry only reads
+# them when recording, so callers must never mutate the returned dicts.
+
+
+@lru_cache(maxsize=512)
+def _severity_attrs(severity: str, service: str) -> Dict[str, str]:
+    """Get the shared attribute dict for a vulnerability severity count."""
+    return {"severity": severity, "service": service}
+
+
+@lru_cache(maxsize=512)
+def _result_attrs(result: str, service: str) -> Dict[str, str]:
+    """Get the shared attribute dict for a test result count."""
+    return {"result": result, "service": service}
+
+
+@lru_cache(maxsize=1024)
+def _tool_attrs(tool_name: str, status: str) -> Dict[str, str]:
+    """Get the shared attribute dict for a tool call count."""
+    return {"tool": tool_name, "status": status}
+
+
+@lru_cache(maxsize=1024)
+def _tool_duration_attrs(tool_name: str) -> Dict[str, str]:
+    """Get the shared attribute dict for a tool call duration."""
+    return {"tool": tool_name}
+
+
+@lru_cache(maxsize=256)
+def _workflow_attrs(workflow_type: str, status: str, service_count: int) -> Dict[str, Any]:
+    """Get the shared attribute dict for a workflow run count."""
+    return {"workflow": workflow_type, "status": status, "services": service_count}
+
+
+@lru_cache(maxsize=64)
+def _workflow_duration_attrs(workflow_type: str) -> Dict[str, str]:
+    """Get the shared attribute dict for a workflow duration."""
+    return {"workflow": workflow_type}
+
+
+@lru_cache(maxsize=256)
+def _service_status_attrs(service: str, status: str) -> Dict[str, str]:
+    """Get the shared attribute dict for a per-service scan or test run count."""
+    return {"service": service, "status": status}
+
+
+@lru_cache(maxsize=64)
+def _llm_attrs(model: str, token_type: Optional[str] = None) -> Dict[str, str]:
+    """Get the shared attribute dict for an LLM call or token count."""
+    if token_type is None:
+        return {"model": model}
+    return {"type": token_type, "model": model}
+
+
 def record_tool_call(tool_name: str, duration: float, status: str = "success") -> None:
     """Record a tool call metric.
 
@@ -437,8 +772,27 @@ def record_tool_call(tool_name: str, duration: float, status: str = "success") -
         duration: Duration of the tool call in seconds
         status: Status of the tool call (success/error)
     """
-    tool_calls_counter.add(1, {"tool": tool_name, "status": status})
-    tool_duration_histogram.record(duration, {"tool": tool_name})
+    tool_calls_counter.add(1, _tool_attrs(tool_name, status))
+    tool_duration_histogram.record(duration, _tool_duration_attrs(tool_name))
+
+
+def record_tool_call_soon(tool_name: str, duration: float, status: str = "success") -> None:
+    """Schedule a tool call metric for the next event loop iteration.
+
+    Keeps metric recording off the awaited middleware path. Records immediately
+    when called outside a running event loop.
+
+    Args:
+        tool_name: Name of the tool that was called
+        duration: Duration of the tool call in seconds
+        status: Status of the tool call (success/error)
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        record_tool_call(tool_name, duration, status)
+        return
+    loop.call_soon(record_tool_call, tool_name, duration, status)
 
 
 def record_workflow_run(
@@ -452,10 +806,8 @@ def record_workflow_run(
         status: Status of the workflow (success/error)
         service_count: Number of services processed
     """
-    workflow_runs_counter.add(
-        1, {"workflow": workflow_type, "status": status, "services": service_count}
-    )
-    workflow_duration_histogram.record(duration, {"workflow": workflow_type})
+    workflow_runs_counter.add(1, _workflow_attrs(workflow_type, status, service_count))
+    workflow_duration_histogram.record(duration, _workflow_duration_attrs(workflow_type))
 
 
 def record_vulns_scan(
@@ -476,17 +828,18 @@ def record_vulns_scan(
         low: Number of low vulnerabilities
         status: Status of the scan (success/error)
     """
-    vulns_scans_counter.add(1, {"service": service, "status": status})
+    vulns_scans_counter.add(1, _service_status_attrs(service, status))
 
     # Record vulnerability counts by severity
-    if critical > 0:
-        vulns_vulnerabilities_counter.add(critical, {"severity": "critical", "service": service})
-    if high > 0:
-        vulns_vulnerabilities_counter.add(high, {"severity": "high", "service": service})
-    if medium > 0:
-        vulns_vulnerabilities_counter.add(medium, {"severity": "medium", "service": service})
-    if low > 0:
-        vulns_vulnerabilities_counter.add(low, {"severity": "low", "service": service})
+    add = vulns_vulnerabilities_counter.add
+    for severity, count in (
+        ("critical", critical),
+        ("high", high),
+        ("medium", medium),
+        ("low", low),
+    ):
+        if count > 0:
+            add(count, _severity_attrs(severity, service))
 
 
 def record_test_run(
@@ -501,15 +854,13 @@ def record_test_run(
         skipped: Number of tests that were skipped
         status: Overall test run status (success/error)
     """
-    test_runs_counter.add(1, {"service": service, "status": status})
+    test_runs_counter.add(1, _service_status_attrs(service, status))
 
     # Record test results by status
-    if passed > 0:
-        test_results_counter.add(passed, {"result": "passed", "service": service})
-    if failed > 0:
-        test_results_counter.add(failed, {"result": "failed", "service": service})
-    if skipped > 0:
-        test_results_counter.add(skipped, {"result": "skipped", "service": service})
+    add = test_results_counter.add
+    for result, count in (("passed", passed), ("failed", failed), ("skipped", skipped)):
+        if count > 0:
+            add(count, _result_attrs(result, service))
 
 
 def record_llm_call(
@@ -523,9 +874,10 @@ def record_llm_call(
         completion_tokens: Number of completion tokens generated
         duration: Duration of the LLM call in seconds (optional)
     """
-    llm_calls_counter.add(1, {"model": model})
-    llm_tokens_counter.add(prompt_tokens, {"type": "prompt", "model": model})
-    llm_tokens_counter.add(completion_tokens, {"type": "completion", "model": model})
+    llm_calls_counter.add(1, _llm_attrs(model))
+    add_tokens = llm_tokens_counter.add
+    add_tokens(prompt_tokens, _llm_attrs(model, "prompt"))
+    add_tokens(completion_tokens, _llm_attrs(model, "completion"))
 
 
 def set_user_context(user_id: Optional[str] = None, user_email: Optional[str] = None) -> None:
@@ -548,22 +900,17 @@ def set_user_context(user_id: Optional[str] = None, user_email: Optional[str] =
         - Query: `traces | where customDimensions.user_id == "john.doe"`
     """
     # Store in contextvar for later retrieval in middleware
-    context = _user_session_context.get().copy()
+    updates = {}
     if user_id:
-        context["user.id"] = user_id
+        updates["user.id"] = user_id
     if user_email:
-        context["user.email"] = user_email
-    _user_session_context.set(context)
+        updates["user.email"] = user_email
+    _update_user_session_context(updates)
 
     # Also set on current span if available
-    from opentelemetry import trace
-
     span = trace.get_current_span()
-    if span and span.is_recording():
-        if user_id:
-            span.set_attribute("user.id", user_id)
-        if user_email:
-            span.set_attribute("user.email", user_email)
+    if updates and span and span.is_recording():
+        span.set_attributes(updates)
 
 
 def set_session_context(session_id: str, thread_id: Optional[str] = None) -> None:
@@ -591,20 +938,15 @@ def set_session_context(session_id: str, thread_id: Optional[str] = None) -> Non
         - Analyze: See all operations in a conversation thread
     """
     # Store in contextvar for later retrieval in middleware
-    context = _user_session_context.get().copy()
-    context["session.id"] = session_id
+    updates = {"session.id": session_id}
     if thread_id:
-        context["session.thread_id"] = thread_id
-    _user_session_context.set(context)
+        updates["session.thread_id"] = thread_id
+    _update_user_session_context(updates)
 
     # Also set on current span if available
-    from opentelemetry import trace
-
     span = trace.get_current_span()
     if span and span.is_recording():
-        span.set_attribute("session.id", session_id)
-        if thread_id:
-            span.set_attribute("session.thread_id", thread_id)
+        span.set_attributes(updates)
 
 
 def set_custom_attributes(**attributes: str) -> None:
@@ -616,6 +958,9 @@ def set_custom_attributes(**attributes: str) -> None:
     Args:
         **attributes: Key-value pairs to add as span attributes
 
+    Prefer one call with several attributes over several single-attribute calls;
+    each call rebuilds the context and writes the current span once.
+
     Example:
         >>> from agent.observability import set_custom_attributes
         >>> set_custom_attributes(
@@ -629,25 +974,39 @@ def set_custom_attributes(**attributes: str) -> None:
         - Group by custom dimensions in charts
     """
     # Store in contextvar for later retrieval in middleware
-    context = _user_session_context.get().copy()
-    context.update(attributes)
-    _user_session_context.set(context)
+    updates = {key: value for key, value in attributes.items() if value is not None}
+    _update_user_session_context(updates)
 
     # Also set on current span if available
-    from opentelemetry import trace
-
     span = trace.get_current_span()
-    if span and span.is_recording():
-        for key, value in attributes.items():
-            span.set_attribute(key, value)
+    if updates and span and span.is_recording():
+        span.set_attributes(updates)
+
+
+def _update_user_session_context(updates: Mapping[str, Optional[str]]) -> None:
+    """
+    Replace the user/session context with one that includes the given updates.
+
+    Args:
+        updates: Attributes to add or overwrite; None values are skipped
+    """
+    global _user_session_context_used
+
+    # One merge into a fresh dict instead of copying and assigning key by key
+    context = {
+        **_user_session_context.get(),
+        **{key: value for key, value in updates.items() if value is not None},
+    }
+    _user_session_context.set(MappingProxyType(context))
+    _user_session_context_used = True
 
 
-def get_user_session_context() -> Dict[str, str]:
+def get_user_session_context() -> Mapping[str, str]:
     """
     Retrieve the current user/session context.
 
     Returns:
-        Dictionary of context attributes (user.id, session.id, etc.)
+        Read-only mapping of context attributes (user.id, session.id, etc.)
 
     This is used internally by middleware to inject context into agent spans.
     """
@@ -671,13 +1030,12 @@ def get_observability_status() -> Dict[str, bool]:
         >>> if status["configured"]:
         ...     print("Observability is active")
     """
-    connection_string = os.getenv("APPLICATIONINSIGHTS_CONNECTION_STRING")
-    otlp_endpoint = os.getenv("OTLP_ENDPOINT")
+    config = _cfg()
 
     return {
-        "configured": bool(connection_string or otlp_endpoint),
-        "app_insights": bool(connection_string),
-        "otlp": bool(otlp_endpoint),
+        "configured": config.configured,
+        "app_insights": bool(config.app_insights),
+        "otlp": bool(config.otlp),
         "initialized": _observability_initialized,
     }
 
@@ -699,5 +1057,18 @@ def is_observability_active() -> bool:
         >>> if is_observability_active():
         ...     print("Telemetry is being collected")
     """
-    status = get_observability_status()
-    return status["configured"] and status["initialized"]
+    # Read the cached configuration directly; this is polled by the CLI status bar
+    return _cfg().configured and _observability_initialized
+
+
+def is_tracing_enabled() -> bool:
+    """
+    Check if spans are exported anywhere.
+
+    Spans created before any exporter is configured are never exported, so callers
+    on hot paths use this to skip span creation entirely.
+
+    Returns:
+        bool: True once observability has been set up with an exporter
+    """
+    return _tracing_enabled
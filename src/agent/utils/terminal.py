@@ -6,12 +6,20 @@ different platforms (macOS, Linux, Windows) using multiple fallback strategies.
 
 import os
 import sys
+from functools import cache
 from typing import Optional
 
+# \033[2J clears the entire screen, \033[H moves cursor to home position (top-left)
+_CLEAR_BYTES = b"\033[2J\033[H"
 
+
+@cache
 def supports_ansi_codes() -> bool:
     """Check if the terminal supports ANSI escape sequences.
 
+    The result is computed once per process, since the terminal does not change
+    while the agent runs.
+
     Returns:
         True if terminal likely supports ANSI codes, False otherwise
     """
@@ -42,9 +50,12 @@ def supports_ansi_codes() -> bool:
     return False
 
 
+@cache
 def get_clear_command() -> Optional[str]:
     """Get the platform-appropriate terminal clear command.
 
+    The result is computed once per process.
+
     Returns:
         Command string ("clear" or "cls"), or None if platform unknown
     """
@@ -68,9 +79,10 @@ def clear_screen() -> bool:
     # Try ANSI escape codes first
     if supports_ansi_codes():
         try:
-            # \033[2J clears the entire screen
-            # \033[H moves cursor to home position (top-left)
-            print("\033[2J\033[H", end="", flush=True)
+            # Write the pre-encoded sequence straight to the file descriptor,
+            # after flushing pending text so output ordering is preserved
+            sys.stdout.flush()
+            os.write(sys.stdout.fileno(), _CLEAR_BYTES)
             return True
         except Exception:
             # If ANSI fails, continue to next method
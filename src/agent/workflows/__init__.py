@@ -7,12 +7,19 @@ including:
 - Workflow builders for different operation types
 """
 
-from typing import Optional
+import asyncio
+import logging
+from functools import cache
 
 from agent.workflows.result_store import WorkflowResult, WorkflowResultStore
 
-# Global singleton instance of WorkflowResultStore
-_result_store: Optional[WorkflowResultStore] = None
+logger = logging.getLogger(__name__)
+
+
+@cache
+def _make_result_store() -> WorkflowResultStore:
+    """Create the process-wide WorkflowResultStore on first use."""
+    return WorkflowResultStore(max_results_per_type=10)
 
 
 def get_result_store() -> WorkflowResultStore:
@@ -31,12 +38,7 @@ def get_result_store() -> WorkflowResultStore:
         >>> await store.store(workflow_result)
         >>> recent = await store.get_recent("vulns", limit=1)
     """
-    global _result_store
-
-    if _result_store is None:
-        _result_store = WorkflowResultStore(max_results_per_type=10)
-
-    return _result_store
+    return _make_result_store()
 
 
 def reset_result_store() -> None:
@@ -44,13 +46,46 @@ def reset_result_store() -> None:
 
     This is primarily useful for testing to ensure a clean state.
     """
-    global _result_store
-    _result_store = None
+    _make_result_store.cache_clear()
+
+
+# Stores scheduled by store_result_soon that have not completed yet. Holding the
+# tasks here also keeps them from being garbage collected mid-flight.
+_pending_stores: set[asyncio.Task[None]] = set()
+
+
+def _log_store_failure(task: "asyncio.Task[None]") -> None:
+    """Log a background store that failed, since nothing else awaits its result."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Failed to store workflow result", exc_info=task.exception())
+
+
+def store_result_soon(result: WorkflowResult) -> None:
+    """Store a workflow result without waiting for the store to complete.
+
+    Keeps storage off the workflow's return path. Readers that need the result
+    to be visible call flush_pending_stores() first.
+
+    Args:
+        result: WorkflowResult to store
+    """
+    task = asyncio.create_task(get_result_store().store(result))
+    _pending_stores.add(task)
+    task.add_done_callback(_pending_stores.discard)
+    task.add_done_callback(_log_store_failure)
+
+
+async def flush_pending_stores() -> None:
+    """Wait for all stores scheduled by store_result_soon to complete."""
+    if _pending_stores:
+        await asyncio.gather(*_pending_stores, return_exceptions=True)
 
 
 __all__ = [
     "WorkflowResult",
     "WorkflowResultStore",
+    "flush_pending_stores",
     "get_result_store",
     "reset_result_store",
+    "store_result_soon",
 ]
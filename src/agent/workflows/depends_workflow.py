@@ -4,19 +4,35 @@ This module provides MAF-based workflow orchestration for Maven dependency
 version checking and update analysis.
 """
 
-import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping
 
+from agent.copilot import get_prompt_file
+from agent.copilot.runners.depends_runner import DependsRunner
 from agent.observability import record_workflow_run, tracer
-from agent.workflows import WorkflowResult, get_result_store
+from agent.workflows import WorkflowResult, get_result_store, store_result_soon
 
 if TYPE_CHECKING:
     from agent import Agent
 
 logger = logging.getLogger(__name__)
 
+# Counts reported for a service the runner did not track. Its keys are the fields
+# copied from the tracker into WorkflowResult.dependency_updates.
+_NO_UPDATES: Mapping[str, Any] = MappingProxyType(
+    {
+        "major_updates": 0,
+        "minor_updates": 0,
+        "patch_updates": 0,
+        "total_dependencies": 0,
+        "outdated_dependencies": 0,
+        "status": "unknown",
+    }
+)
+
 
 async def run_depends_workflow(
     agent: "Agent",
@@ -44,26 +60,25 @@ async def run_depends_workflow(
         WorkflowResult with dependency analysis data
     """
     workflow_start = datetime.now()
-    start_time = asyncio.get_event_loop().time()
+    start_time = time.perf_counter()
 
-    logger.info(f"Starting dependency analysis workflow for services: {', '.join(services)}")
+    logger.info("Starting dependency analysis workflow for services: %s", ", ".join(services))
 
     with tracer.start_as_current_span("depends_workflow") as span:
-        span.set_attribute("services", ",".join(services))
-        span.set_attribute("providers", ",".join(providers))
-        span.set_attribute("create_issue", create_issue)
+        span.set_attributes(
+            {
+                "services": ",".join(services),
+                "providers": ",".join(providers),
+                "create_issue": create_issue,
+            }
+        )
 
         # Store dependency updates by service
-        dependency_updates_by_service: Dict[str, Dict[str, int]] = {}
+        dependency_updates_by_service: Dict[str, Dict[str, Any]] = {}
         detailed_results: Dict[str, Any] = {}
 
         try:
             # Run dependency analysis (delegates to DependsRunner)
-            from agent.copilot.runners.depends_runner import DependsRunner
-
-            # Get prompt file
-            from agent.copilot import get_prompt_file
-
             prompt_file = get_prompt_file("depends.md")
 
             # Create runner
@@ -80,24 +95,19 @@ async def run_depends_workflow(
             logger.info("Executing dependency analysis runner...")
             exit_code = await runner.run()
 
-            # Extract results from runner
+            # Extract the count fields from the tracker's per-service dicts (initialized
+            # with every count key), totalling updates on the way. Copies keep later
+            # tracker updates and display-only fields out of the stored result.
+            tracked_services = runner.tracker.services
+            total_major = total_minor = total_patch = 0
             for service in services:
-                service_data = runner.tracker.services.get(service, {})
-                major = service_data.get("major_updates", 0)
-                minor = service_data.get("minor_updates", 0)
-                patch = service_data.get("patch_updates", 0)
-                total_deps = service_data.get("total_dependencies", 0)
-                outdated = service_data.get("outdated_dependencies", 0)
-                status = service_data.get("status", "unknown")
-
+                service_data = tracked_services.get(service, _NO_UPDATES)
                 dependency_updates_by_service[service] = {
-                    "major_updates": major,
-                    "minor_updates": minor,
-                    "patch_updates": patch,
-                    "total_dependencies": total_deps,
-                    "outdated_dependencies": outdated,
-                    "status": status,
+                    key: service_data[key] for key in _NO_UPDATES
                 }
+                total_major += service_data["major_updates"]
+                total_minor += service_data["minor_updates"]
+                total_patch += service_data["patch_updates"]
 
             # Get dependency analysis from runner if available
             dependency_analysis = ""
@@ -109,23 +119,13 @@ async def run_depends_workflow(
             # Build detailed results
             detailed_results = {
                 "exit_code": exit_code,
-                "services_data": runner.tracker.services if hasattr(runner, "tracker") else {},
+                "services_data": tracked_services,
                 "providers": providers,
                 "include_testing": include_testing,
                 "create_issue": create_issue,
             }
 
             # Calculate summary
-            total_major = sum(
-                v.get("major_updates", 0) for v in dependency_updates_by_service.values()
-            )
-            total_minor = sum(
-                v.get("minor_updates", 0) for v in dependency_updates_by_service.values()
-            )
-            total_patch = sum(
-                v.get("patch_updates", 0) for v in dependency_updates_by_service.values()
-            )
-
             summary = (
                 f"Analyzed {len(services)} service(s): "
                 f"{total_major}M / {total_minor}m / {total_patch}p updates available"
@@ -143,13 +143,12 @@ async def run_depends_workflow(
                 dependency_analysis=dependency_analysis,
             )
 
-            # Store result for agent context
-            result_store = get_result_store()
-            await result_store.store(result)
-            logger.info(f"Stored dependency analysis workflow result: {summary}")
+            # Store result for agent context (completes in the background)
+            store_result_soon(result)
+            logger.info("Scheduled storage of dependency analysis workflow result: %s", summary)
 
             # Record workflow metrics
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = time.perf_counter() - start_time
             record_workflow_run(
                 workflow_type="depends",
                 duration=duration,
@@ -157,15 +156,23 @@ async def run_depends_workflow(
                 service_count=len(services),
             )
 
-            span.set_attribute("total_updates", total_major + total_minor + total_patch)
-            span.set_attribute("status", "success" if exit_code == 0 else "error")
+            span.set_attributes(
+                {
+                    "total_updates": total_major + total_minor + total_patch,
+                    "status": "success" if exit_code == 0 else "error",
+                }
+            )
 
             return result
 
         except Exception as e:
-            logger.error(f"Dependency analysis workflow failed: {e}")
-            span.set_attribute("error", True)
-            span.set_attribute("error.message", str(e))
+            logger.error(
+                "Dependency analysis workflow failed: %s",
+                e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            span.set_attributes({"error": True, "error.message": str(e)})
+            span.record_exception(e)
 
             # Create error result
             result = WorkflowResult(
@@ -182,7 +189,7 @@ async def run_depends_workflow(
             await result_store.store(result)
 
             # Record failed workflow
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = time.perf_counter() - start_time
             record_workflow_run(
                 workflow_type="depends",
                 duration=duration,
@@ -2,8 +2,10 @@
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import List, Tuple
+import time
+from datetime import datetime, timedelta, timezone
+from functools import cache
+from typing import List, Optional, Tuple
 
 from rich.console import Console
 
@@ -13,10 +15,35 @@ from agent.gitlab.direct_client import GitLabDirectClient
 from agent.gitlab.models import ReportMode
 from agent.gitlab.report_formatter import ReportFormatter
 from agent.observability import record_workflow_run, tracer
-from agent.workflows import WorkflowResult, get_result_store
+from agent.workflows import WorkflowResult, store_result_soon
 
 logger = logging.getLogger(__name__)
 
+# Report mode keywords mapped to (precedence, mode); lower precedence wins
+_MODE_KEYWORDS = {
+    "adr": (0, ReportMode.ADR),
+    "trends": (1, ReportMode.TRENDS),
+    "contributions": (2, ReportMode.CONTRIBUTIONS),
+    "compare": (3, ReportMode.COMPARISON),
+}
+
+# Report windows end on a boundary of this many minutes (the analysis cache TTL)
+# so reports run back to back analyze the same periods
+_PERIOD_END_STEP_MINUTES = 5
+
+
+@cache
+def _trend_labels(num_periods: int) -> Tuple[str, ...]:
+    """Chart labels for a trend of num_periods months, newest first.
+
+    Args:
+        num_periods: Number of periods charted
+
+    Returns:
+        ("Current", "Month -1", ..., "Month -<num_periods - 1>")
+    """
+    return ("Current", *(f"Month -{i}" for i in range(1, num_periods)))
+
 
 def _parse_report_arguments(args_string: str) -> Tuple[ReportMode, int, int]:
     """
@@ -27,6 +54,7 @@ def _parse_report_arguments(args_string: str) -> Tuple[ReportMode, int, int]:
     - "60" -> (COMPARISON, 60, 1)
     - "adr" -> (ADR, 30, 1)
     - "compare 14 periods=3" -> (COMPARISON, 14, 3)
+    - "compare 14 --periods 3" -> (COMPARISON, 14, 3)
     - "trends" -> (TRENDS, 30, 1)
 
     Args:
@@ -43,58 +71,68 @@ def _parse_report_arguments(args_string: str) -> Tuple[ReportMode, int, int]:
     if not args_string:
         return (mode, days, periods)
 
-    # Split arguments
-    parts = args_string.strip().split()
-
-    # Check for mode keywords
-    if "adr" in parts:
-        mode = ReportMode.ADR
-        parts.remove("adr")
-    elif "trends" in parts:
-        mode = ReportMode.TRENDS
-        parts.remove("trends")
-    elif "contributions" in parts:
-        mode = ReportMode.CONTRIBUTIONS
-        parts.remove("contributions")
-    elif "compare" in parts:
-        mode = ReportMode.COMPARISON
-        parts.remove("compare")
-
-    # Extract days (any standalone number)
-    for part in parts[:]:
-        if part.isdigit():
-            days = int(part)
-            parts.remove(part)
-            break
-
-    # Extract periods (periods=N or --periods N)
-    for i, part in enumerate(parts):
-        if part.startswith("periods="):
-            periods_str = part.split("=")[1]
+    # Single pass over tokens; when several mode keywords are given the one listed
+    # first in _MODE_KEYWORDS wins, and the first standalone number sets days
+    mode_rank = len(_MODE_KEYWORDS)
+    days_found = False
+    tokens = iter(args_string.split())
+    for token in tokens:
+        keyword = _MODE_KEYWORDS.get(token)
+        if keyword is not None:
+            rank, keyword_mode = keyword
+            if rank < mode_rank:
+                mode_rank, mode = rank, keyword_mode
+        elif token.isdigit():
+            if not days_found:
+                days = int(token)
+                days_found = True
+        elif token.startswith("periods="):
+            periods_str = token[len("periods=") :]
+            if periods_str.isdigit():
+                periods = int(periods_str)
+        elif token == "--periods":
+            # Consume the option value so it is not taken as days
+            periods_str = next(tokens, "")
             if periods_str.isdigit():
                 periods = int(periods_str)
-        elif part == "--periods" and i + 1 < len(parts):
-            if parts[i + 1].isdigit():
-                periods = int(parts[i + 1])
 
     return (mode, days, periods)
 
 
-def _calculate_period_dates(days: int, num_periods: int) -> List[Tuple[datetime, datetime]]:
+def _current_period_end() -> datetime:
+    """
+    Get the end of the current reporting window in UTC, to match the GitLab API.
+
+    The current time is rounded down to the last 5-minute boundary (the analysis
+    cache TTL), so reports run back to back (e.g. comparison, then contributions)
+    analyze identical periods and reuse each other's cached results. The window
+    misses at most the last few minutes, which the cache would serve stale anyway.
+
+    Returns:
+        Timezone-aware UTC end date
+    """
+    now = datetime.now(timezone.utc)
+    return now.replace(
+        minute=now.minute - now.minute % _PERIOD_END_STEP_MINUTES, second=0, microsecond=0
+    )
+
+
+def _calculate_period_dates(
+    days: int, num_periods: int, period_end: Optional[datetime] = None
+) -> List[Tuple[datetime, datetime]]:
     """
     Calculate start/end dates for multiple periods.
 
     Args:
         days: Number of days per period
         num_periods: Number of periods to calculate (including current)
+        period_end: End of the current period (defaults to _current_period_end())
 
     Returns:
         List of (start_date, end_date) tuples, current period first
     """
-    from datetime import timezone
-
     periods = []
-    end_date = datetime.now(timezone.utc)
+    end_date = period_end or _current_period_end()
 
     for i in range(num_periods):
         period_end = end_date - timedelta(days=i * days)
@@ -118,34 +156,39 @@ async def run_report_workflow(
         WorkflowResult with report data
     """
     workflow_start = datetime.now()
-    start_time = asyncio.get_event_loop().time()
+    start_time = time.perf_counter()
 
     # Parse arguments
     mode, days, num_periods = _parse_report_arguments(args_string)
 
-    logger.info(f"Report workflow: mode={mode.value}, days={days}, periods={num_periods}")
+    logger.info("Report workflow: mode=%s, days=%d, periods=%d", mode.value, days, num_periods)
 
     # Create console and formatter
     console = Console()
     formatter = ReportFormatter(console)
 
+    def _err(summary: str) -> WorkflowResult:
+        """Report an early-exit error, record it and build the error result."""
+        formatter.print_error(summary)
+        record_workflow_run(
+            "report", time.perf_counter() - start_time, "error", len(services) if services else 0
+        )
+        return WorkflowResult(
+            workflow_type="report",
+            timestamp=workflow_start,
+            services=services or [],
+            status="error",
+            summary=summary,
+            detailed_results={},
+        )
+
     with tracer.start_as_current_span("report_workflow") as span:
-        span.set_attribute("mode", mode.value)
-        span.set_attribute("days", days)
-        span.set_attribute("periods", num_periods)
+        span.set_attributes({"mode": mode.value, "days": days, "periods": num_periods})
 
         try:
             # Validate services parameter
             if not services:
-                formatter.print_error("No services provided")
-                return WorkflowResult(
-                    workflow_type="report",
-                    timestamp=workflow_start,
-                    services=[],
-                    status="error",
-                    summary="No services provided",
-                    detailed_results={},
-                )
+                return _err("No services provided")
 
             # Load config
             config = AgentConfig()
@@ -162,63 +205,66 @@ async def run_report_workflow(
 
             formatter.print_info(f"Analyzing {len(services)} services...")
 
-            # Initialize GitLab client and analyzer
-            gitlab_client = GitLabDirectClient(config)
-            analyzer = GitLabContributionAnalyzer(config, gitlab_client)
-
-            # Get project paths from services
-            project_paths = []
-            for service in services:
-                # Get upstream URL
-                upstream_url = await gitlab_client._get_upstream_url(service)
-                if upstream_url:
-                    project_path = gitlab_client._parse_project_path(upstream_url)
-                    if project_path:
-                        project_paths.append(project_path)
-
-            if not project_paths:
-                formatter.print_error("No valid GitLab projects found")
-                return WorkflowResult(
-                    workflow_type="report",
-                    timestamp=workflow_start,
-                    services=services or [],
-                    status="error",
-                    summary="No valid GitLab projects found",
-                    detailed_results={},
-                )
+            # Initialize GitLab client and analyzer; one client (and connection pool)
+            # serves every request made by the report
+            gitlab_client = GitLabDirectClient(config, authenticate=False)
+            async with gitlab_client:
+                analyzer = GitLabContributionAnalyzer(config, gitlab_client)
 
-            formatter.print_info(f"Found {len(project_paths)} GitLab projects")
+                # Authenticate (and open the first GitLab connection) in a thread while
+                # the upstream URLs are read from GitHub; neither depends on the other
+                auth_task = asyncio.create_task(asyncio.to_thread(gitlab_client.authenticate))
 
-            # Generate report based on mode
-            if mode == ReportMode.COMPARISON:
-                result_data = await _generate_comparison_report(
-                    analyzer, formatter, project_paths, days, num_periods
-                )
-            elif mode == ReportMode.ADR:
-                result_data = await _generate_adr_report(analyzer, formatter, project_paths, days)
-            elif mode == ReportMode.TRENDS:
-                # For trends, use days parameter to determine months (days/30, default 12 months)
-                months = max(1, days // 30) if days != 30 else 12
-                result_data = await _generate_trends_report(
-                    analyzer, formatter, project_paths, months=months
-                )
-            elif mode == ReportMode.CONTRIBUTIONS:
-                result_data = await _generate_contributions_report(
-                    analyzer, formatter, project_paths, days
-                )
-            else:
-                formatter.print_error(f"Unknown report mode: {mode}")
-                return WorkflowResult(
-                    workflow_type="report",
-                    timestamp=workflow_start,
-                    services=services or [],
-                    status="error",
-                    summary=f"Unknown report mode: {mode}",
-                    detailed_results={},
+                # Get upstream URLs for all services in parallel
+                upstream_urls = await asyncio.gather(
+                    *(gitlab_client._get_upstream_url(service) for service in services),
+                    return_exceptions=True,
                 )
+                await auth_task
+
+                # Get project paths from services (order follows services)
+                project_paths = []
+                for service, upstream_url in zip(services, upstream_urls):
+                    if isinstance(upstream_url, Exception):
+                        logger.error("Error getting upstream URL for %s: %s", service, upstream_url)
+                        continue
+                    if upstream_url:
+                        project_path = gitlab_client._parse_project_path(upstream_url)
+                        if project_path:
+                            project_paths.append(project_path)
+
+                if not project_paths:
+                    return _err("No valid GitLab projects found")
+
+                formatter.print_info(f"Found {len(project_paths)} GitLab projects")
+
+                # One reference time for every period computed by this run
+                period_end = _current_period_end()
+
+                # Generate report based on mode
+                if mode == ReportMode.COMPARISON:
+                    result_data = await _generate_comparison_report(
+                        analyzer, formatter, project_paths, days, num_periods, period_end=period_end
+                    )
+                elif mode == ReportMode.ADR:
+                    result_data = await _generate_adr_report(
+                        analyzer, formatter, project_paths, days, period_end=period_end
+                    )
+                elif mode == ReportMode.TRENDS:
+                    # For trends, use days to determine months (days/30, default 12 months)
+                    months = max(1, days // 30) if days != 30 else 12
+                    result_data = await _generate_trends_report(
+                        analyzer, formatter, project_paths, months=months, period_end=period_end
+                    )
+                elif mode == ReportMode.CONTRIBUTIONS:
+                    result_data = await _generate_contributions_report(
+                        analyzer, formatter, project_paths, days, period_end=period_end
+                    )
+                else:
+                    return _err(f"Unknown report mode: {mode}")
 
             # Create workflow result
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = time.perf_counter() - start_time
             result = WorkflowResult(
                 workflow_type="report",
                 timestamp=workflow_start,
@@ -228,9 +274,8 @@ async def run_report_workflow(
                 detailed_results=result_data,
             )
 
-            # Store result
-            store = get_result_store()
-            await store.store(result)
+            # Store result (completes in the background)
+            store_result_soon(result)
 
             # Record metrics
             record_workflow_run("report", duration, "success", len(services))
@@ -239,10 +284,15 @@ async def run_report_workflow(
             return result
 
         except Exception as e:
-            logger.error(f"Report workflow error: {e}", exc_info=True)
+            # Tracebacks are formatted for the log only at DEBUG; the span keeps
+            # the full exception either way
+            logger.error(
+                "Report workflow error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
+            span.record_exception(e)
             formatter.print_error(f"Report generation failed: {str(e)}")
 
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = time.perf_counter() - start_time
             record_workflow_run("report", duration, "error", len(services) if services else 0)
 
             return WorkflowResult(
@@ -261,15 +311,21 @@ async def _generate_comparison_report(
     project_paths: List[str],
     days: int,
     num_periods: int,
+    period_end: Optional[datetime] = None,
 ) -> dict:
     """Generate period-over-period comparison report."""
     formatter.print_info(f"Analyzing {num_periods} periods of {days} days each...")
 
     # Calculate period dates
-    period_dates = _calculate_period_dates(days, num_periods)
-
-    # Analyze all periods
-    period_stats_list = await analyzer.analyze_trends(project_paths, period_dates)
+    period_dates = _calculate_period_dates(days, num_periods, period_end)
+
+    # Analyze all periods, fetching ADRs for the current period at the same time
+    # since both are independent GitLab round-trips
+    current_start, current_end = period_dates[0]
+    period_stats_list, adr_stats = await asyncio.gather(
+        analyzer.analyze_trends(project_paths, period_dates),
+        analyzer.analyze_adrs(project_paths, current_start, current_end),
+    )
 
     if not period_stats_list:
         formatter.print_error("No data available for specified periods")
@@ -290,10 +346,7 @@ async def _generate_comparison_report(
     # Display project breakdown
     formatter.format_project_breakdown(current_period)
 
-    # Analyze ADRs for current period
-    adr_stats = await analyzer.analyze_adrs(
-        project_paths, current_period.start_date, current_period.end_date
-    )
+    # Display ADRs for current period
     if adr_stats.total_adrs > 0:
         formatter.format_adr_details(adr_stats, limit=10)
 
@@ -314,14 +367,13 @@ async def _generate_adr_report(
     formatter: ReportFormatter,
     project_paths: List[str],
     days: int,
+    period_end: Optional[datetime] = None,
 ) -> dict:
     """Generate ADR analysis report."""
     formatter.print_info(f"Analyzing ADRs for last {days} days...")
 
     # Calculate date range (use UTC to match GitLab API timezone)
-    from datetime import timezone
-
-    end_date = datetime.now(timezone.utc)
+    end_date = period_end or _current_period_end()
     start_date = end_date - timedelta(days=days)
 
     # Analyze ADRs
@@ -362,18 +414,13 @@ async def _generate_trends_report(
     formatter: ReportFormatter,
     project_paths: List[str],
     months: int = 12,
+    period_end: Optional[datetime] = None,
 ) -> dict:
     """Generate trends report over multiple months."""
     formatter.print_info(f"Analyzing trends over last {months} months...")
 
     # Calculate monthly periods (use UTC)
-    from datetime import timezone
-
-    period_dates = []
-    for i in range(months):
-        end_date = datetime.now(timezone.utc) - timedelta(days=i * 30)
-        start_date = end_date - timedelta(days=30)
-        period_dates.append((start_date, end_date))
+    period_dates = _calculate_period_dates(30, months, period_end)
 
     # Analyze trends
     period_stats_list = await analyzer.analyze_trends(project_paths, period_dates)
@@ -383,11 +430,15 @@ async def _generate_trends_report(
         return {}
 
     # Extract values for charts
-    labels = [f"Month -{i}" for i in range(len(period_stats_list))]
-    labels[0] = "Current"
+    labels = _trend_labels(len(period_stats_list))
 
-    total_mrs_values = [p.contributions.total_mrs for p in period_stats_list]
-    contributors_values = [p.contributions.active_contributors for p in period_stats_list]
+    # Only two columns are charted, so pull both out in one pass over the periods
+    total_mrs_values = []
+    contributors_values = []
+    for period_stats in period_stats_list:
+        contributions = period_stats.contributions
+        total_mrs_values.append(contributions.total_mrs)
+        contributors_values.append(contributions.active_contributors)
 
     # Display trend charts
     formatter.format_trend_chart("Total MRs", total_mrs_values, labels)
@@ -405,18 +456,24 @@ async def _generate_contributions_report(
     formatter: ReportFormatter,
     project_paths: List[str],
     days: int,
+    period_end: Optional[datetime] = None,
 ) -> dict:
     """Generate basic contributions report."""
     formatter.print_info(f"Analyzing contributions for last {days} days...")
 
     # Calculate date range (use UTC)
-    from datetime import timezone
-
-    end_date = datetime.now(timezone.utc)
+    end_date = period_end or _current_period_end()
     start_date = end_date - timedelta(days=days)
 
-    # Analyze contributions
-    period_stats = await analyzer.analyze_contributions(project_paths, start_date, end_date)
+    # Analyze contributions, showing projects as they complete
+    total = len(project_paths)
+    with formatter.console.status(f"Analyzed 0/{total} projects...") as status:
+        period_stats = await analyzer.analyze_contributions(
+            project_paths,
+            start_date,
+            end_date,
+            progress_callback=lambda done, _: status.update(f"Analyzed {done}/{total} projects..."),
+        )
 
     # Display summary (without comparison)
     formatter.format_executive_summary(period_stats, previous_period=None)
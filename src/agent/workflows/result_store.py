@@ -5,13 +5,31 @@ to access detailed results from slash commands executed in interactive mode.
 """
 
 import asyncio
+import bisect
+import heapq
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Sort key for ordering results by execution time
+_by_timestamp = attrgetter("timestamp")
+
+# Fixed lines of the context summary, added with one list.extend each
+_SUMMARY_HEADER = (
+    "## Recent Workflow Results",
+    "",
+    "*The following workflow results are available for your reference:*",
+    "",
+)
+_SUMMARY_FOOTER = ("*You can reference these results when answering user questions.*", "")
+_RESULT_SEPARATOR = ("", "---", "")
+_FULL_ANALYSIS_NOTE = "  *(Full analysis available in detailed results)*"
+
 
 @dataclass
 class WorkflowResult:
@@ -29,7 +47,7 @@ class WorkflowResult:
         test_results: Test execution results (test-specific)
         pr_status: Pull request status information (status-specific)
         fork_status: Fork operation status (fork-specific)
-        dependency_updates: Dependency update counts by service (depends-specific)
+        dependency_updates: Dependency update counts and status by service (depends-specific)
         dependency_analysis: Dependency update analysis report (depends-specific)
     """
 
@@ -54,10 +72,303 @@ class WorkflowResult:
     fork_status: Optional[Dict[str, str]] = None
 
     # Depends-specific fields
-    dependency_updates: Optional[Dict[str, Dict[str, int]]] = None
+    dependency_updates: Optional[Dict[str, Dict[str, Any]]] = None
     dependency_analysis: Optional[str] = None
 
 
+def _append_excerpt(lines: List[str], source: List[str], max_lines: int) -> None:
+    """Append the non-blank lines among the first max_lines of source, indented.
+
+    Adds a note pointing to the full analysis when source has more lines.
+
+    Args:
+        lines: Summary lines to extend
+        source: Analysis lines to excerpt
+        max_lines: Maximum number of source lines to consider
+    """
+    lines.extend(f"  {line}" for line in islice(source, max_lines) if line.strip())
+    if len(source) > max_lines:
+        lines.append(_FULL_ANALYSIS_NOTE)
+
+
+def _render_vulns(result: WorkflowResult, lines: List[str]) -> None:
+    """Render vulnerability counts and the CVE analysis excerpt."""
+    if not result.vulnerabilities:
+        return
+
+    lines.extend(("", "**Vulnerabilities Found:**"))
+    for svc, counts in result.vulnerabilities.items():
+        critical = counts.get("critical", 0)
+        high = counts.get("high", 0)
+        medium = counts.get("medium", 0)
+        lines.append(f"- {svc}: {critical} critical, {high} high, {medium} medium")
+
+    # Include CVE analysis if available
+    if result.cve_analysis:
+        lines.extend(("", "**CVE Analysis Summary:**"))
+        # Extract critical/high CVE details and remediation steps
+        analysis_lines = result.cve_analysis.split("\n")
+
+        # Find service-specific CVE section (most actionable). Only the first 50
+        # lines are shown, so collecting stops once the section is known to be longer.
+        in_cve_section = False
+        cve_section_lines: List[str] = []
+        for line in analysis_lines:
+            if "SERVICE-SPECIFIC CRITICAL/HIGH CVEs" in line:
+                in_cve_section = True
+            elif "### 3. IMMEDIATE ACTION ITEMS" in line:
+                # Also include action items
+                in_cve_section = True
+            elif (
+                line.startswith("###")
+                and in_cve_section
+                and "SERVICE-SPECIFIC" not in line
+                and "IMMEDIATE ACTION" not in line
+            ):
+                # End of relevant sections
+                break
+
+            if in_cve_section:
+                cve_section_lines.append(line)
+                if len(cve_section_lines) > 50:
+                    break
+
+        # Include CVE section if found (up to 50 lines), otherwise first 20 lines
+        if cve_section_lines:
+            _append_excerpt(lines, cve_section_lines, 50)
+        else:
+            # Fallback: show first 20 lines
+            _append_excerpt(lines, analysis_lines, 20)
+
+
+def _render_test(result: WorkflowResult, lines: List[str]) -> None:
+    """Render per-service test counts, coverage and grade."""
+    if not result.test_results:
+        return
+
+    lines.extend(("", "**Test Results:**"))
+    for svc, results in result.test_results.items():
+        total_tests = results.get("total_tests", 0)
+        results.get("passed", 0)
+        failed = results.get("failed", 0)
+        coverage_line = results.get("coverage_line", 0)
+        coverage_branch = results.get("coverage_branch", 0)
+        quality_grade = results.get("quality_grade")
+
+        # Build result line with grade and coverage
+        result_parts = [f"{total_tests} tests"]
+        if failed > 0:
+            result_parts.append(f"{failed} failed")
+
+        if coverage_line > 0:
+            result_parts.append(f"coverage: {coverage_line}% line / {coverage_branch}% branch")
+
+        if quality_grade:
+            result_parts.append(f"**Grade: {quality_grade}**")
+
+        lines.append(f"- {svc}: {', '.join(result_parts)}")
+
+
+def _render_depends(result: WorkflowResult, lines: List[str]) -> None:
+    """Render dependency update counts and the patch analysis excerpt."""
+    if not result.dependency_updates:
+        return
+
+    lines.extend(("", "**Dependency Updates:**"))
+    for svc, counts in result.dependency_updates.items():
+        major = counts.get("major_updates", 0)
+        minor = counts.get("minor_updates", 0)
+        patch = counts.get("patch_updates", 0)
+        total = counts.get("total_dependencies", 0)
+        outdated = counts.get("outdated_dependencies", 0)
+        lines.append(
+            f"- {svc}: {major}M / {minor}m / {patch}p updates ({outdated}/{total} outdated)"
+        )
+
+    # Include dependency analysis if available (first 30 lines for patch recommendations)
+    if result.dependency_analysis:
+        lines.extend(("", "**Dependency Analysis Summary:**"))
+        # Extract patch updates section and other key parts
+        analysis_lines = result.dependency_analysis.split("\n")
+
+        # Find and include patch updates section (most relevant for low-risk fixes).
+        # Only the first 40 lines are shown, so collecting stops after that.
+        in_patch_section = False
+        patch_lines: List[str] = []
+        for line in analysis_lines:
+            if "## PATCH UPDATES" in line or "PATCH UPDATES" in line:
+                in_patch_section = True
+            elif line.startswith("##") and in_patch_section:
+                # End of patch section
+                break
+
+            if in_patch_section:
+                patch_lines.append(line)
+                if len(patch_lines) > 40:
+                    break
+
+        # Include patch section if found (up to 40 lines), otherwise first 30 lines
+        if patch_lines:
+            _append_excerpt(lines, patch_lines, 40)
+        else:
+            # Fallback: show first 30 lines
+            _append_excerpt(lines, analysis_lines, 30)
+
+
+def _render_status(result: WorkflowResult, lines: List[str]) -> None:
+    """Render PR/issue status, workflow references and PR details."""
+    if not result.pr_status:
+        return
+
+    lines.extend(("", "**Status Information:**"))
+
+    # Full per-service data from detailed results (workflows and PR review state)
+    all_services = result.detailed_results.get("status_data", {}).get("services", {})
+
+    # Track unique workflows needing attention across all services
+    actionable_workflows = {}  # {workflow_name: filename}
+
+    # PR/issue details are collected in the same pass over services and rendered
+    # after the workflow reference
+    detail_lines: List[str] = []
+
+    for svc, status in result.pr_status.items():
+        open_prs = status.get("open_prs", 0)
+        open_issues = status.get("open_issues", 0)
+        workflows_needing_approval = status.get("workflows_needing_approval", 0)
+
+        status_line = f"- {svc}: {open_prs} open PRs, {open_issues} open issues"
+        if workflows_needing_approval > 0:
+            status_line += f", {workflows_needing_approval} workflows need approval"
+        lines.append(status_line)
+
+        # Extract actionable workflows from detailed results
+        service_data = all_services.get(svc, {})
+        workflows_data = service_data.get("workflows", {}).get("recent", [])
+
+        for workflow in workflows_data:
+            conclusion = workflow.get("conclusion")
+            if conclusion in ["action_required", "failure", "cancelled"]:
+                workflow_name = workflow.get("name")
+                workflow_path = workflow.get("path", "")
+                # Extract just the filename (e.g., "codeql.yml" from ".github/workflows/codeql.yml")
+                workflow_filename = workflow_path.split("/")[-1] if workflow_path else None
+                if workflow_name and workflow_filename:
+                    actionable_workflows[workflow_name] = workflow_filename
+
+        pr_details = status.get("pr_details", [])
+        issue_details = status.get("issue_details", [])
+
+        # Include details about ALL PRs (not just ones with pending workflows)
+        if pr_details:
+            # Lookup by PR number for merge/review status enrichment
+            full_prs = service_data.get("pull_requests", {}).get("items", [])
+            pr_lookup = {pr.get("number"): pr for pr in full_prs}
+
+            for pr in pr_details:
+                pr_num = pr.get("number")
+                pr_title = pr.get("title", "")
+                is_draft = pr.get("is_draft", False)
+                workflows_pending = pr.get("workflows_pending", 0)
+
+                # Get enriched PR data
+                full_pr = pr_lookup.get(pr_num, {})
+                approved_count = full_pr.get("approved_count", 0)
+                changes_requested = full_pr.get("changes_requested", False)
+                mergeable_state = full_pr.get("mergeable_state", "unknown")
+                is_release = full_pr.get("is_release", False)
+
+                # Build PR description
+                pr_desc = f"  - PR #{pr_num}"
+                if is_draft:
+                    pr_desc += " (DRAFT)"
+                if is_release:
+                    pr_desc += " [RELEASE]"
+                pr_desc += f": {pr_title[:60]}"
+
+                # Add review status
+                if changes_requested:
+                    pr_desc += " ⚠ changes requested"
+                elif approved_count > 0:
+                    pr_desc += f" ✓ {approved_count} approval(s)"
+                else:
+                    pr_desc += " ⊙ no reviews"
+
+                # Add merge status
+                if mergeable_state == "blocked":
+                    pr_desc += " | ⊘ blocked"
+                elif mergeable_state == "clean":
+                    pr_desc += " | ✓ ready to merge"
+                elif mergeable_state in ["unstable", "dirty"]:
+                    pr_desc += f" | ⚠ {mergeable_state}"
+
+                # Add workflow status if relevant
+                if workflows_pending > 0:
+                    pr_desc += f" | {workflows_pending} workflows pending"
+
+                detail_lines.append(pr_desc)
+
+        # Include issue details with labels and assignees
+        if issue_details:
+            for issue in issue_details:
+                issue_num = issue.get("number")
+                issue_title = issue.get("title", "")
+                labels = issue.get("labels", [])
+                assignees = issue.get("assignees", [])
+
+                # Build issue description
+                issue_desc = f"  - Issue #{issue_num}: {issue_title[:60]}"
+
+                # Add important labels
+                if "human-required" in labels:
+                    issue_desc += " [HUMAN-REQUIRED]"
+
+                # Add assignee info
+                if assignees:
+                    if "Copilot" in assignees or "copilot-swe-agent" in assignees:
+                        issue_desc += " (Assigned: Copilot)"
+                    else:
+                        issue_desc += f" (Assigned: {', '.join(assignees)})"
+
+                detail_lines.append(issue_desc)
+
+    # Add workflow name→filename mapping (only if there are actionable workflows)
+    if actionable_workflows:
+        lines.extend(("", "**Workflow Reference** (for triggering):"))
+        lines.extend(
+            f"  - '{name}' → `{filename}`"
+            for name, filename in sorted(actionable_workflows.items())
+        )
+        lines.append("")
+
+    lines.extend(detail_lines)
+
+
+def _render_fork(result: WorkflowResult, lines: List[str]) -> None:
+    """Render per-service fork status."""
+    if not result.fork_status:
+        return
+
+    lines.extend(("", "**Fork Status:**"))
+    lines.extend(f"- {svc}: {status}" for svc, status in result.fork_status.items())
+
+
+def _render_nothing(result: WorkflowResult, lines: List[str]) -> None:
+    """Add no details for workflow types without a renderer."""
+
+
+# Workflow-specific summary renderers by workflow type ("triage" is the legacy
+# name of the vulnerability workflow)
+_RENDERERS: Dict[str, Callable[[WorkflowResult, List[str]], None]] = {
+    "vulns": _render_vulns,
+    "triage": _render_vulns,
+    "test": _render_test,
+    "depends": _render_depends,
+    "status": _render_status,
+    "fork": _render_fork,
+}
+
+
 class WorkflowResultStore:
     """Thread-safe store for workflow results.
 
@@ -66,6 +377,10 @@ class WorkflowResultStore:
 
     The store automatically limits the number of stored results to prevent
     unbounded memory growth.
+
+    Only mutations (store, clear) take the lock. Reads run on the event loop
+    without awaiting between reading the results and returning, so no mutation
+    can interleave with them and they need no lock.
     """
 
     def __init__(self, max_results_per_type: int = 10):
@@ -74,10 +389,31 @@ class WorkflowResultStore:
         Args:
             max_results_per_type: Maximum number of results to keep per workflow type
         """
-        self._results: List[WorkflowResult] = []
+        # Results indexed by workflow type, so type-filtered reads and clears only
+        # touch that type's results. Types with no results have no entry. Each
+        # bucket is kept in timestamp order and bounded, so storing past the limit
+        # evicts that type's oldest result.
+        self._by_type: Dict[str, List[WorkflowResult]] = {}
         self._lock = asyncio.Lock()
         self._max_results_per_type = max_results_per_type
 
+        # Bumped on every store/clear; context summaries built at the current
+        # generation are reused instead of being rebuilt on every agent turn
+        self._generation = 0
+        self._summary_cache: Dict[int, Tuple[int, str]] = {}
+
+    @property
+    def is_empty(self) -> bool:
+        """Check if no workflow results are stored.
+
+        Checking the type index needs no lock, so callers can skip building a
+        context summary without awaiting.
+
+        Returns:
+            True if the store holds no results
+        """
+        return not self._by_type
+
     async def store(self, result: WorkflowResult) -> None:
         """Store a workflow result.
 
@@ -85,14 +421,19 @@ class WorkflowResultStore:
             result: WorkflowResult to store
         """
         async with self._lock:
-            self._results.append(result)
+            results = self._by_type.setdefault(result.workflow_type, [])
+
+            # Timestamps are workflow start times and results arrive as workflows
+            # finish, so a long run can arrive after a later one; insert in order
+            # and drop the oldest by timestamp, not by arrival
+            bisect.insort(results, result, key=_by_timestamp)
+            if len(results) > self._max_results_per_type:
+                del results[0]
+            self._invalidate_summaries()
             logger.debug(
                 f"Stored {result.workflow_type} workflow result for services: {', '.join(result.services)}"
             )
 
-            # Cleanup old results
-            self._cleanup()
-
     async def get_recent(
         self, workflow_type: Optional[str] = None, limit: int = 5
     ) -> List[WorkflowResult]:
@@ -105,15 +446,15 @@ class WorkflowResultStore:
         Returns:
             List of WorkflowResult objects, most recent first
         """
-        async with self._lock:
-            results = self._results
-
-            # Filter by workflow type if specified
-            if workflow_type:
-                results = [r for r in results if r.workflow_type == workflow_type]
+        # Filter by workflow type if specified
+        results: Iterable[WorkflowResult]
+        if workflow_type:
+            results = self._by_type.get(workflow_type, ())
+        else:
+            results = chain.from_iterable(self._by_type.values())
 
-            # Sort by timestamp (most recent first) and limit
-            return sorted(results, key=lambda r: r.timestamp, reverse=True)[:limit]
+        # Most recent first; only the requested results are ordered
+        return heapq.nlargest(limit, results, key=_by_timestamp)
 
     async def get_context_summary(self, limit: int = 3) -> str:
         """Generate a context summary for agent injection.
@@ -121,6 +462,24 @@ class WorkflowResultStore:
         This creates a markdown-formatted summary of recent workflow results
         that can be injected into the agent's context via middleware.
 
+        Args:
+            limit: Maximum number of recent results to include
+
+        Returns:
+            Markdown-formatted context summary
+        """
+        generation = self._generation
+        cached = self._summary_cache.get(limit)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        summary = await self._build_context_summary(limit)
+        self._summary_cache[limit] = (generation, summary)
+        return summary
+
+    async def _build_context_summary(self, limit: int) -> str:
+        """Build the markdown context summary from the most recent results.
+
         Args:
             limit: Maximum number of recent results to include
 
@@ -134,312 +493,35 @@ class WorkflowResultStore:
         if not recent:
             return ""
 
-        lines = ["## Recent Workflow Results"]
-        lines.append("")
-        lines.append("*The following workflow results are available for your reference:*")
-        lines.append("")
+        lines = list(_SUMMARY_HEADER)
 
         for result in recent:
             # Format timestamp
             time_str = result.timestamp.strftime("%H:%M:%S")
 
-            lines.append(f"### {result.workflow_type.title()} - {time_str}")
-            lines.append(f"**Services:** {', '.join(result.services)}")
-            lines.append(f"**Status:** {result.status}")
-            lines.append(f"**Summary:** {result.summary}")
+            lines.extend(
+                (
+                    f"### {result.workflow_type.title()} - {time_str}",
+                    f"**Services:** {', '.join(result.services)}",
+                    f"**Status:** {result.status}",
+                    f"**Summary:** {result.summary}",
+                )
+            )
 
             # Add workflow-specific details
-            # Handle both "vulns" and "triage" (legacy name) for vulnerability workflows
-            if result.workflow_type in ("vulns", "triage") and result.vulnerabilities:
-                lines.append("")
-                lines.append("**Vulnerabilities Found:**")
-                for svc, counts in result.vulnerabilities.items():
-                    critical = counts.get("critical", 0)
-                    high = counts.get("high", 0)
-                    medium = counts.get("medium", 0)
-                    lines.append(f"- {svc}: {critical} critical, {high} high, {medium} medium")
-
-                # Include CVE analysis if available
-                if result.cve_analysis:
-                    lines.append("")
-                    lines.append("**CVE Analysis Summary:**")
-                    # Extract critical/high CVE details and remediation steps
-                    analysis_lines = result.cve_analysis.split("\n")
-
-                    # Find service-specific CVE section (most actionable)
-                    in_cve_section = False
-                    cve_section_lines = []
-                    for line in analysis_lines:
-                        if "SERVICE-SPECIFIC CRITICAL/HIGH CVEs" in line:
-                            in_cve_section = True
-                        elif "### 3. IMMEDIATE ACTION ITEMS" in line:
-                            # Also include action items
-                            in_cve_section = True
-                        elif (
-                            line.startswith("###")
-                            and in_cve_section
-                            and "SERVICE-SPECIFIC" not in line
-                            and "IMMEDIATE ACTION" not in line
-                        ):
-                            # End of relevant sections
-                            break
-
-                        if in_cve_section:
-                            cve_section_lines.append(line)
-
-                    # Include CVE section if found (up to 50 lines), otherwise first 20 lines
-                    if cve_section_lines:
-                        for line in cve_section_lines[:50]:
-                            if line.strip():
-                                lines.append(f"  {line}")
-                        if len(cve_section_lines) > 50:
-                            lines.append("  *(Full analysis available in detailed results)*")
-                    else:
-                        # Fallback: show first 20 lines
-                        for line in analysis_lines[:20]:
-                            if line.strip():
-                                lines.append(f"  {line}")
-                        if len(analysis_lines) > 20:
-                            lines.append("  *(Full analysis available in detailed results)*")
-
-            elif result.workflow_type == "test" and result.test_results:
-                lines.append("")
-                lines.append("**Test Results:**")
-                for svc, results in result.test_results.items():
-                    total_tests = results.get("total_tests", 0)
-                    results.get("passed", 0)
-                    failed = results.get("failed", 0)
-                    coverage_line = results.get("coverage_line", 0)
-                    coverage_branch = results.get("coverage_branch", 0)
-                    quality_grade = results.get("quality_grade")
-
-                    # Build result line with grade and coverage
-                    result_parts = [f"{total_tests} tests"]
-                    if failed > 0:
-                        result_parts.append(f"{failed} failed")
-
-                    if coverage_line > 0:
-                        result_parts.append(
-                            f"coverage: {coverage_line}% line / {coverage_branch}% branch"
-                        )
-
-                    if quality_grade:
-                        result_parts.append(f"**Grade: {quality_grade}**")
-
-                    lines.append(f"- {svc}: {', '.join(result_parts)}")
-
-            elif result.workflow_type == "depends" and result.dependency_updates:
-                lines.append("")
-                lines.append("**Dependency Updates:**")
-                for svc, counts in result.dependency_updates.items():
-                    major = counts.get("major_updates", 0)
-                    minor = counts.get("minor_updates", 0)
-                    patch = counts.get("patch_updates", 0)
-                    total = counts.get("total_dependencies", 0)
-                    outdated = counts.get("outdated_dependencies", 0)
-                    lines.append(
-                        f"- {svc}: {major}M / {minor}m / {patch}p updates ({outdated}/{total} outdated)"
-                    )
-
-                # Include dependency analysis if available (first 30 lines for patch recommendations)
-                if result.dependency_analysis:
-                    lines.append("")
-                    lines.append("**Dependency Analysis Summary:**")
-                    # Extract patch updates section and other key parts
-                    analysis_lines = result.dependency_analysis.split("\n")
-
-                    # Find and include patch updates section (most relevant for low-risk fixes)
-                    in_patch_section = False
-                    patch_lines = []
-                    for line in analysis_lines:
-                        if "## PATCH UPDATES" in line or "PATCH UPDATES" in line:
-                            in_patch_section = True
-                        elif line.startswith("##") and in_patch_section:
-                            # End of patch section
-                            break
-
-                        if in_patch_section:
-                            patch_lines.append(line)
-
-                    # Include patch section if found, otherwise first 30 lines
-                    if patch_lines:
-                        for line in patch_lines[:40]:  # Limit to 40 lines
-                            if line.strip():
-                                lines.append(f"  {line}")
-                        if len(patch_lines) > 40:
-                            lines.append("  *(Full analysis available in detailed results)*")
-                    else:
-                        # Fallback: show first 30 lines
-                        for line in analysis_lines[:30]:
-                            if line.strip():
-                                lines.append(f"  {line}")
-                        if len(analysis_lines) > 30:
-                            lines.append("  *(Full analysis available in detailed results)*")
-
-            elif result.workflow_type == "status" and result.pr_status:
-                lines.append("")
-                lines.append("**Status Information:**")
-
-                # Track unique workflows needing attention across all services
-                actionable_workflows = {}  # {workflow_name: filename}
-
-                for svc, status in result.pr_status.items():
-                    open_prs = status.get("open_prs", 0)
-                    open_issues = status.get("open_issues", 0)
-                    workflows_needing_approval = status.get("workflows_needing_approval", 0)
-
-                    status_line = f"- {svc}: {open_prs} open PRs, {open_issues} open issues"
-                    if workflows_needing_approval > 0:
-                        status_line += f", {workflows_needing_approval} workflows need approval"
-                    lines.append(status_line)
-
-                    # Extract actionable workflows from detailed results
-                    status_data = result.detailed_results.get("status_data", {})
-                    service_data = status_data.get("services", {}).get(svc, {})
-                    workflows_data = service_data.get("workflows", {}).get("recent", [])
-
-                    for workflow in workflows_data:
-                        conclusion = workflow.get("conclusion")
-                        if conclusion in ["action_required", "failure", "cancelled"]:
-                            workflow_name = workflow.get("name")
-                            workflow_path = workflow.get("path", "")
-                            # Extract just the filename (e.g., "codeql.yml" from ".github/workflows/codeql.yml")
-                            workflow_filename = (
-                                workflow_path.split("/")[-1] if workflow_path else None
-                            )
-                            if workflow_name and workflow_filename:
-                                actionable_workflows[workflow_name] = workflow_filename
-
-                # Add workflow name→filename mapping (only if there are actionable workflows)
-                if actionable_workflows:
-                    lines.append("")
-                    lines.append("**Workflow Reference** (for triggering):")
-                    for name, filename in sorted(actionable_workflows.items()):
-                        lines.append(f"  - '{name}' → `{filename}`")
-                    lines.append("")
-
-                # Move back to the service loop for PR/issue details
-                for svc, status in result.pr_status.items():
-                    pr_details = status.get("pr_details", [])
-                    issue_details = status.get("issue_details", [])
-
-                    # Get full PR data from detailed results for merge/review status
-                    status_data = result.detailed_results.get("status_data", {})
-                    service_data = status_data.get("services", {}).get(svc, {})
-                    full_prs = service_data.get("pull_requests", {}).get("items", [])
-
-                    # Create lookup by PR number for enrichment
-                    pr_lookup = {pr.get("number"): pr for pr in full_prs}
-
-                    # Include details about ALL PRs (not just ones with pending workflows)
-                    if pr_details:
-                        for pr in pr_details:
-                            pr_num = pr.get("number")
-                            pr_title = pr.get("title", "")
-                            pr.get("state", "").upper()
-                            is_draft = pr.get("is_draft", False)
-                            workflows_pending = pr.get("workflows_pending", 0)
-
-                            # Get enriched PR data
-                            full_pr = pr_lookup.get(pr_num, {})
-                            approved_count = full_pr.get("approved_count", 0)
-                            changes_requested = full_pr.get("changes_requested", False)
-                            mergeable_state = full_pr.get("mergeable_state", "unknown")
-                            is_release = full_pr.get("is_release", False)
-
-                            # Build PR description
-                            pr_desc = f"  - PR #{pr_num}"
-                            if is_draft:
-                                pr_desc += " (DRAFT)"
-                            if is_release:
-                                pr_desc += " [RELEASE]"
-                            pr_desc += f": {pr_title[:60]}"
-
-                            # Add review status
-                            if changes_requested:
-                                pr_desc += " ⚠ changes requested"
-                            elif approved_count > 0:
-                                pr_desc += f" ✓ {approved_count} approval(s)"
-                            else:
-                                pr_desc += " ⊙ no reviews"
-
-                            # Add merge status
-                            if mergeable_state == "blocked":
-                                pr_desc += " | ⊘ blocked"
-                            elif mergeable_state == "clean":
-                                pr_desc += " | ✓ ready to merge"
-                            elif mergeable_state in ["unstable", "dirty"]:
-                                pr_desc += f" | ⚠ {mergeable_state}"
-
-                            # Add workflow status if relevant
-                            if workflows_pending > 0:
-                                pr_desc += f" | {workflows_pending} workflows pending"
-
-                            lines.append(pr_desc)
-
-                    # Include issue details with labels and assignees
-                    if issue_details:
-                        for issue in issue_details:
-                            issue_num = issue.get("number")
-                            issue_title = issue.get("title", "")
-                            labels = issue.get("labels", [])
-                            assignees = issue.get("assignees", [])
-
-                            # Build issue description
-                            issue_desc = f"  - Issue #{issue_num}: {issue_title[:60]}"
-
-                            # Add important labels
-                            if "human-required" in labels:
-                                issue_desc += " [HUMAN-REQUIRED]"
-
-                            # Add assignee info
-                            if assignees:
-                                if "Copilot" in assignees or "copilot-swe-agent" in assignees:
-                                    issue_desc += " (Assigned: Copilot)"
-                                else:
-                                    issue_desc += f" (Assigned: {', '.join(assignees)})"
-
-                            lines.append(issue_desc)
-
-            elif result.workflow_type == "fork" and result.fork_status:
-                lines.append("")
-                lines.append("**Fork Status:**")
-                for svc, status in result.fork_status.items():
-                    lines.append(f"- {svc}: {status}")
-
-            lines.append("")
-            lines.append("---")
-            lines.append("")
+            _RENDERERS.get(result.workflow_type, _render_nothing)(result, lines)
+
+            lines.extend(_RESULT_SEPARATOR)
 
         # Add usage note
-        lines.append("*You can reference these results when answering user questions.*")
-        lines.append("")
+        lines.extend(_SUMMARY_FOOTER)
 
         return "\n".join(lines)
 
-    def _cleanup(self) -> None:
-        """Remove old results to prevent unbounded memory growth.
-
-        Keeps at most max_results_per_type results for each workflow type.
-        This method should be called while holding the lock.
-        """
-        # Group results by workflow type
-        by_type: Dict[str, List[WorkflowResult]] = {}
-        for result in self._results:
-            if result.workflow_type not in by_type:
-                by_type[result.workflow_type] = []
-            by_type[result.workflow_type].append(result)
-
-        # Keep only the most recent N results per type
-        kept_results = []
-        for workflow_type, results in by_type.items():
-            sorted_results = sorted(results, key=lambda r: r.timestamp, reverse=True)
-            kept_results.extend(sorted_results[: self._max_results_per_type])
-
-        # Update the results list
-        self._results = kept_results
-
-        logger.debug(f"Cleanup: Kept {len(kept_results)} workflow results")
+    def _invalidate_summaries(self) -> None:
+        """Mark cached context summaries stale after the stored results change."""
+        self._generation += 1
+        self._summary_cache.clear()
 
     async def clear(self, workflow_type: Optional[str] = None) -> None:
         """Clear workflow results.
@@ -448,11 +530,12 @@ class WorkflowResultStore:
             workflow_type: Clear only results of this type (None clears all)
         """
         async with self._lock:
+            self._invalidate_summaries()
             if workflow_type:
-                self._results = [r for r in self._results if r.workflow_type != workflow_type]
+                self._by_type.pop(workflow_type, None)
                 logger.info(f"Cleared {workflow_type} workflow results")
             else:
-                self._results.clear()
+                self._by_type.clear()
                 logger.info("Cleared all workflow results")
 
     async def get_stats(self) -> Dict[str, Any]:
@@ -461,18 +544,12 @@ class WorkflowResultStore:
         Returns:
             Dictionary with result statistics
         """
-        async with self._lock:
-            by_type: Dict[str, int] = {}
-            for result in self._results:
-                by_type[result.workflow_type] = by_type.get(result.workflow_type, 0) + 1
-
-            return {
-                "total_results": len(self._results),
-                "by_type": by_type,
-                "oldest_timestamp": (
-                    min(r.timestamp for r in self._results) if self._results else None
-                ),
-                "newest_timestamp": (
-                    max(r.timestamp for r in self._results) if self._results else None
-                ),
-            }
+        by_type = {workflow_type: len(results) for workflow_type, results in self._by_type.items()}
+        timestamps = [r.timestamp for r in chain.from_iterable(self._by_type.values())]
+
+        return {
+            "total_results": len(timestamps),
+            "by_type": by_type,
+            "oldest_timestamp": min(timestamps) if timestamps else None,
+            "newest_timestamp": max(timestamps) if timestamps else None,
+        }
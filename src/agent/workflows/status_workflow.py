@@ -64,10 +64,11 @@ async def run_status_workflow(
                 from agent.gitlab.direct_client import GitLabDirectClient
 
                 agent_config = AgentConfig()
-                direct_client = GitLabDirectClient(agent_config)
-                status_data = await direct_client.get_all_status(
-                    services, providers or ["Azure", "Core"]
-                )
+                gitlab_client = GitLabDirectClient(agent_config)
+                async with gitlab_client:
+                    status_data = await gitlab_client.get_all_status(
+                        services, providers or ["Azure", "Core"]
+                    )
             else:
                 from agent.github.direct_client import GitHubDirectClient
 
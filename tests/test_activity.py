@@ -2,7 +2,7 @@
 
 import pytest
 
-from agent.activity import ActivityTracker, get_activity_tracker
+from agent.activity import ActivityTracker, _format_tool_name, get_activity_tracker
 
 
 @pytest.mark.asyncio
@@ -55,6 +55,30 @@ async def test_activity_tracker_get_current_after_reset():
     assert tracker.get_current() == "New activity after reset"
 
 
+def test_activity_tracker_update_nowait():
+    """Test that update_nowait sets activity without awaiting."""
+    tracker = ActivityTracker()
+
+    tracker.update_nowait("Listing GitHub issues...")
+    assert tracker.get_current() == "Listing GitHub issues..."
+
+
+def test_format_tool_name_is_memoized():
+    """Test that repeated tool names are formatted once."""
+    tracker = ActivityTracker()
+    _format_tool_name.cache_clear()
+
+    assert tracker.format_tool_name("gh_list_issues") == "Listing GitHub issues"
+    assert tracker.format_tool_name("gh_list_issues") == "Listing GitHub issues"
+    assert tracker.format_tool_name("mcp__mvn-mcp-server__custom_tool") == (
+        "Running Maven custom tool"
+    )
+
+    info = _format_tool_name.cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
+
+
 def test_get_activity_tracker_singleton():
     """Test that get_activity_tracker returns the same instance."""
     tracker1 = get_activity_tracker()
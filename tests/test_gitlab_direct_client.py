@@ -0,0 +1,76 @@
+"""Tests for GitLabDirectClient request throttling."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.gitlab import direct_client
+from agent.gitlab.direct_client import GitLabDirectClient, _RateLimiter
+
+
+@pytest.fixture
+def client():
+    """Create an unauthenticated client without touching the network."""
+    config = MagicMock()
+    config.gitlab_token = None
+    with patch("agent.gitlab.direct_client.gitlab.Gitlab"):
+        yield GitLabDirectClient(config)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_waits():
+    """Test that the limiter allows max_rate calls at once, then waits for a refill."""
+    clock = [100.0]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        clock[0] += delay
+
+    with patch.object(direct_client.time, "monotonic", side_effect=lambda: clock[0]):
+        limiter = _RateLimiter(2, 1.0)
+        with patch.object(direct_client.asyncio, "sleep", fake_sleep):
+            await limiter.acquire()
+            await limiter.acquire()
+            assert sleeps == []
+
+            await limiter.acquire()
+
+    assert sleeps == [pytest.approx(0.5)]
+
+
+@pytest.mark.asyncio
+async def test_request_bounded_by_request_slots(client):
+    """Test that concurrent requests never exceed the client's request slots."""
+    client._request_slots = asyncio.Semaphore(2)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_to_thread(func, *args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return func(*args, **kwargs)
+
+    with patch.object(direct_client.asyncio, "to_thread", fake_to_thread):
+        results = await asyncio.gather(*(client._request(lambda i=i: i) for i in range(5)))
+
+    assert results == [0, 1, 2, 3, 4]
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_request_uses_pipeline_limiter(client):
+    """Test that pipeline endpoint calls take a pipeline rate-limit token."""
+    client._pipeline_limiter = MagicMock()
+    client._pipeline_limiter.acquire = AsyncMock()
+    pipelines_list = MagicMock(return_value=["pipeline"])
+
+    result = await client._pipeline_request(pipelines_list, ref="main")
+
+    assert result == ["pipeline"]
+    pipelines_list.assert_called_once_with(ref="main")
+    client._pipeline_limiter.acquire.assert_awaited_once_with()
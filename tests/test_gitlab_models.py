@@ -88,6 +88,7 @@ def test_project_stats_creation():
     assert stats.project_path == "osdu/platform/test-project"
     assert isinstance(stats.contributions, ContributionStats)
     assert isinstance(stats.adrs, ADRStats)
+    assert stats.complete
 
 
 def test_period_stats_creation():
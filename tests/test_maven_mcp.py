@@ -1,12 +1,17 @@
 """Tests for Maven MCP integration."""
 
+import inspect
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from agent_framework import MCPStdioTool
 
 from agent.config import AgentConfig
 from agent.mcp import MavenMCPManager
+from agent.mcp.base import _command_paths
+from agent.mcp.maven_mcp import QuietMCPStdioTool
+from agent.mcp.tool_arg_normalizer import normalize_maven_tool_arguments
 
 
 @pytest.fixture
@@ -15,6 +20,14 @@ def config():
     return AgentConfig()
 
 
+@pytest.fixture(autouse=True)
+def clear_which_cache():
+    """Reset memoized command lookups between tests."""
+    _command_paths.clear()
+    yield
+    _command_paths.clear()
+
+
 class TestMavenMCPManager:
     """Test Maven MCP Manager."""
 
@@ -25,7 +38,7 @@ class TestMavenMCPManager:
         assert manager.mcp_tool is None
         assert manager._validated is False
 
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     def test_validate_prerequisites_success(self, mock_which, config):
         """Test successful prerequisite validation."""
         mock_which.return_value = "/usr/local/bin/uvx"
@@ -37,7 +50,7 @@ class TestMavenMCPManager:
         assert manager._validated is True
         mock_which.assert_called_once_with("uvx")
 
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     def test_validate_prerequisites_failure(self, mock_which, config):
         """Test failed prerequisite validation."""
         mock_which.return_value = None
@@ -50,7 +63,7 @@ class TestMavenMCPManager:
         mock_which.assert_called_once_with("uvx")
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     async def test_context_manager_prerequisites_not_met(self, mock_which, config):
         """Test context manager when prerequisites not met."""
         mock_which.return_value = None
@@ -62,7 +75,7 @@ class TestMavenMCPManager:
             assert m.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.maven_mcp.QuietMCPStdioTool")
     async def test_context_manager_success(self, mock_mcp_tool_class, mock_which, config):
         """Test successful context manager initialization."""
@@ -81,7 +94,7 @@ class TestMavenMCPManager:
         mock_tool_instance.__aexit__.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.maven_mcp.QuietMCPStdioTool")
     async def test_context_manager_file_not_found(self, mock_mcp_tool_class, mock_which, config):
         """Test context manager when MCP server not found."""
@@ -98,7 +111,7 @@ class TestMavenMCPManager:
             assert m.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.maven_mcp.QuietMCPStdioTool")
     async def test_context_manager_general_error(self, mock_mcp_tool_class, mock_which, config):
         """Test context manager with general error."""
@@ -115,7 +128,7 @@ class TestMavenMCPManager:
             assert m.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.maven_mcp.QuietMCPStdioTool")
     async def test_context_manager_cleanup_error(self, mock_mcp_tool_class, mock_which, config):
         """Test context manager cleanup with error."""
@@ -195,8 +208,54 @@ class TestMavenMCPManager:
         assert await_args.args[0] == "scan_java_project"
         assert await_args.args[1]["workspace"] == str(expected_path)
 
+    def test_normalize_tool_arguments_single_copy(self, config, tmp_path):
+        """Workspace rewrite and broken-key removal should share one copy."""
+        manager = MavenMCPManager(config)
+        repos_root = tmp_path / "repos"
+        repos_root.mkdir()
+        manager._workspace_root = repos_root
+
+        arguments = {"workspace": "storage", "severity_filter": ["HIGH"]}
+        result = manager._normalize_tool_arguments(arguments)
+
+        assert result is not arguments
+        assert result == {"workspace": str((repos_root / "storage").resolve())}
+        assert arguments == {"workspace": "storage", "severity_filter": ["HIGH"]}
+
+    def test_normalize_tool_arguments_passthrough(self, config):
+        """Already-normalized arguments should be returned unchanged."""
+        manager = MavenMCPManager(config)
+        arguments = {"workspace": "/abs/path", "max_results": 10}
+
+        assert manager._normalize_tool_arguments(arguments) is arguments
+
     @pytest.mark.asyncio
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    async def test_call_tool_wrapper_is_plain_closure(self, config, tmp_path):
+        """Wrapper should be a plain function that forwards keyword arguments."""
+        manager = MavenMCPManager(config)
+        repos_root = tmp_path / "repos"
+        repos_root.mkdir()
+        manager._workspace_root = repos_root
+
+        async_mock = AsyncMock(return_value="ok")
+        mock_tool_instance = AsyncMock()
+        mock_tool_instance.call_tool = async_mock
+        manager.mcp_tool = mock_tool_instance
+        manager._wrap_workspace_normalization()
+
+        assert not inspect.ismethod(manager.mcp_tool.call_tool)
+
+        result = await manager.mcp_tool.call_tool(
+            "scan_java_project", arguments={"workspace": "search"}
+        )
+
+        assert result == "ok"
+        await_args = async_mock.await_args
+        assert await_args.args == ("scan_java_project",)
+        assert await_args.kwargs["arguments"]["workspace"] == str((repos_root / "search").resolve())
+
+    @pytest.mark.asyncio
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.maven_mcp.QuietMCPStdioTool")
     async def test_tools_property_with_tool(self, mock_mcp_tool_class, mock_which, config):
         """Test tools property when tool is initialized."""
@@ -216,7 +275,7 @@ class TestMavenMCPManager:
         assert manager.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.maven_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.maven_mcp.QuietMCPStdioTool")
     async def test_is_available_true(self, mock_mcp_tool_class, mock_which, config):
         """Test is_available property when available."""
@@ -228,3 +287,149 @@ class TestMavenMCPManager:
 
         async with manager:
             assert manager.is_available is True
+
+
+class TestMavenSubprocessEnv:
+    """Test Maven MCP subprocess environment filtering."""
+
+    def _env_with(self, config, monkeypatch, name, value):
+        """Build the Maven subprocess environment with one variable set."""
+        monkeypatch.setenv(name, value)
+        return MavenMCPManager(config)._build_env()
+
+    @pytest.mark.parametrize(
+        "name,value",
+        [
+            ("SSL_CERT_DIR", "/etc/ssl/certs"),
+            ("CURL_CA_BUNDLE", "/etc/ssl/corp-ca.pem"),
+            ("JAVA_TOOL_OPTIONS", "-Dhttps.proxyHost=proxy"),
+            ("MAVEN_ARGS", "-s /etc/maven/settings.xml"),
+            ("TRIVY_CACHE_DIR", "/var/cache/trivy"),
+            ("TRIVY_DB_REPOSITORY", "ghcr.io/acme/trivy-db"),
+            ("TRIVY_INSECURE", "true"),
+        ],
+    )
+    def test_forwards_toolchain_var(self, config, monkeypatch, name, value):
+        """CA, JVM, Maven and Trivy settings must reach the server behind corporate networks."""
+        env = self._env_with(config, monkeypatch, name, value)
+        assert env[name] == value
+
+    def test_unrelated_vars_filtered(self, config, monkeypatch):
+        """Variables the toolchain does not use stay out of the subprocess."""
+        monkeypatch.delenv("OSDU_AGENT_MCP_INHERIT_ENV", raising=False)
+        env = self._env_with(config, monkeypatch, "UNRELATED_SETTING", "value")
+        assert "UNRELATED_SETTING" not in env
+
+    def test_inherit_env_flag_passes_full_environment(self, config, monkeypatch):
+        """OSDU_AGENT_MCP_INHERIT_ENV=true opts out of filtering."""
+        monkeypatch.setenv("OSDU_AGENT_MCP_INHERIT_ENV", "true")
+        env = self._env_with(config, monkeypatch, "UNRELATED_SETTING", "value")
+        assert env["UNRELATED_SETTING"] == "value"
+
+
+class TestQuietMCPStdioTool:
+    """Test stderr redirection for MCP stdio servers."""
+
+    def test_each_tool_passes_its_own_stderr_target(self, tmp_path):
+        """Concurrent servers must not share a stderr target or touch the parent fd."""
+        maven_tool = QuietMCPStdioTool(
+            name="maven", command="uvx", args=[], stderr_log_path=tmp_path / "maven.log"
+        )
+        osdu_tool = QuietMCPStdioTool(
+            name="osdu", command="uvx", args=[], stderr_log_path=tmp_path / "osdu.log"
+        )
+        maven_tool._stderr_target = Mock(name="maven_log")
+        osdu_tool._stderr_target = Mock(name="osdu_log")
+
+        with (
+            patch("agent.mcp.maven_mcp.stdio_client") as mock_stdio_client,
+            patch("agent.mcp.maven_mcp.os.dup2") as mock_dup2,
+        ):
+            maven_tool.get_mcp_client()
+            osdu_tool.get_mcp_client()
+
+        errlogs = [call.kwargs["errlog"] for call in mock_stdio_client.call_args_list]
+        assert errlogs == [maven_tool._stderr_target, osdu_tool._stderr_target]
+        mock_dup2.assert_not_called()
+
+    def test_client_kwargs_reach_server_parameters(self, tmp_path):
+        """Extra stdio client kwargs (e.g. cwd) must be forwarded like the base tool does."""
+        tool = QuietMCPStdioTool(name="maven", command="uvx", args=[], cwd=str(tmp_path))
+        tool._stderr_target = Mock(name="maven_log")
+
+        with patch("agent.mcp.maven_mcp.stdio_client") as mock_stdio_client:
+            tool.get_mcp_client()
+
+        assert mock_stdio_client.call_args.kwargs["server"].cwd == str(tmp_path)
+
+    def test_get_mcp_client_matches_upstream(self, tmp_path):
+        """The copied get_mcp_client must build the same server parameters as upstream."""
+        assert list(inspect.signature(MCPStdioTool.get_mcp_client).parameters) == ["self"]
+
+        tool = QuietMCPStdioTool(
+            name="maven",
+            command="uvx",
+            args=["mvn-mcp-server"],
+            env={"JAVA_HOME": "/opt/java"},
+            encoding="utf-8",
+            cwd=str(tmp_path),
+        )
+        assert tool._client_kwargs == {"cwd": str(tmp_path)}
+
+        with patch("agent_framework._mcp.stdio_client") as upstream_stdio_client:
+            MCPStdioTool.get_mcp_client(tool)
+        with patch("agent.mcp.maven_mcp.stdio_client") as quiet_stdio_client:
+            tool.get_mcp_client()
+
+        assert (
+            quiet_stdio_client.call_args.kwargs["server"]
+            == upstream_stdio_client.call_args.kwargs["server"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_start_closes_log_file(self, tmp_path):
+        """A server that fails to start must not leak the stderr log file."""
+        log_path = tmp_path / "maven.log"
+        tool = QuietMCPStdioTool(name="maven", command="uvx", args=[], stderr_log_path=log_path)
+
+        with patch.object(
+            MCPStdioTool, "__aenter__", AsyncMock(side_effect=FileNotFoundError("uvx"))
+        ):
+            with pytest.raises(FileNotFoundError):
+                await tool.__aenter__()
+
+        assert tool._stderr_file is None
+        assert tool._exit_stack is None
+        assert "Server shutdown" in log_path.read_text()
+
+
+class TestNormalizeMavenToolArguments:
+    """Test Maven tool argument normalization."""
+
+    def test_clean_arguments_returned_without_copy(self):
+        """Arguments without broken parameters should pass through untouched."""
+        arguments = {"workspace": "/path", "max_results": 100}
+
+        assert normalize_maven_tool_arguments(arguments) is arguments
+
+    def test_broken_parameters_removed(self):
+        """Broken parameters should be stripped from a copy of the arguments."""
+        arguments = {
+            "workspace": "/path",
+            "include_profiles": ["azure"],
+            "severity_filter": ["CRITICAL"],
+        }
+
+        result = normalize_maven_tool_arguments(arguments)
+
+        assert result == {"workspace": "/path"}
+        assert "include_profiles" in arguments
+
+    def test_inplace_mutates_owned_arguments(self):
+        """In-place mode should strip broken parameters without copying."""
+        arguments = {"workspace": "/path", "profiles": "dev"}
+
+        result = normalize_maven_tool_arguments(arguments, inplace=True)
+
+        assert result is arguments
+        assert arguments == {"workspace": "/path"}
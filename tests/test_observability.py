@@ -1,25 +1,42 @@
 """Tests for observability functionality."""
 
+import asyncio
 import os
-import subprocess
-from unittest.mock import patch
+import time
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from agent.observability import (
+    UserSessionSpanProcessor,
     fetch_app_insights_from_workspace,
     get_observability_status,
+    get_user_session_context,
     initialize_observability,
     is_observability_active,
     record_llm_call,
     record_test_run,
     record_tool_call,
+    record_tool_call_soon,
     record_vulns_scan,
     record_workflow_run,
+    set_custom_attributes,
+    set_session_context,
+    set_user_context,
+    setup_azure_ai_foundry_observability,
+    should_sample_tool,
 )
 import agent.observability
 
 
+@pytest.fixture(autouse=True)
+def fresh_config():
+    """Re-read the environment in every test (tests patch os.environ)."""
+    agent.observability._reset_observability_state()
+    yield
+    agent.observability._reset_observability_state()
+
+
 class TestObservabilityInitialization:
     """Tests for observability initialization."""
 
@@ -155,43 +172,247 @@ class TestObservabilityInitialization:
                 mock_setup.assert_called_once()
 
 
+class TestObservabilityDisabledCache:
+    """Tests for remembering that no exporter is configured."""
+
+    def test_not_configured_is_remembered(self):
+        """Test that later calls skip configuration checks once nothing was found."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert initialize_observability() is False
+
+        with patch("agent.observability.setup_observability") as mock_setup:
+            with patch.dict(os.environ, {"OTLP_ENDPOINT": "http://localhost:4317"}, clear=True):
+                # Configuration is not re-read within the same process
+                assert initialize_observability() is False
+                mock_setup.assert_not_called()
+
+                agent.observability._reset_observability_state()
+                assert initialize_observability() is True
+                mock_setup.assert_called_once()
+
+    def test_reset_disables_tracing(self):
+        """Test that resetting state also stops span creation from earlier setups."""
+        with patch("agent.observability.setup_observability"):
+            with patch.dict(os.environ, {"OTLP_ENDPOINT": "http://localhost:4317"}, clear=True):
+                assert initialize_observability() is True
+        assert agent.observability.is_tracing_enabled()
+
+        agent.observability._reset_observability_state()
+
+        assert not agent.observability.is_tracing_enabled()
+
+
 class TestAppInsightsFetch:
     """Tests for fetching Application Insights connection string from Azure workspace."""
 
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self):
+        """Start every test without cached discovery state."""
+        agent.observability._app_insights_cache.clear()
+        agent.observability._app_insights_retry_after.clear()
+        agent.observability._arm_token = None
+        yield
+        agent.observability._app_insights_cache.clear()
+        agent.observability._app_insights_retry_after.clear()
+        agent.observability._arm_token = None
+
+    @pytest.mark.asyncio
+    async def test_fetch_app_insights_uses_process_cache(self):
+        """Test that a discovered connection string skips Azure Resource Manager next time."""
+        with patch(
+            "agent.observability._discover_app_insights_connection_string",
+            return_value="InstrumentationKey=abc",
+        ) as mock_discover:
+            first = await fetch_app_insights_from_workspace("sub", "rg", "ws")
+            second = await fetch_app_insights_from_workspace("sub", "rg", "ws")
+
+            assert first == second == "InstrumentationKey=abc"
+            mock_discover.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_fetch_app_insights_success(self):
+        """Test resolving the connection string through Azure Resource Manager."""
+        resource_id = (
+            "/subscriptions/test-sub/resourceGroups/ai-rg"
+            "/providers/microsoft.insights/components/test-ai"
+        )
+        with patch("agent.observability._get_arm_token", return_value="token"):
+            with patch("agent.observability._arm_get_json") as mock_get:
+                mock_get.side_effect = [
+                    {"properties": {"applicationInsights": resource_id}},
+                    {"properties": {"ConnectionString": "InstrumentationKey=abc"}},
+                ]
+
+                result = await fetch_app_insights_from_workspace(
+                    subscription_id="test-sub",
+                    resource_group="test-rg",
+                    workspace_name="test-workspace",
+                )
+
+                assert result == "InstrumentationKey=abc"
+
+                # Second request targets the linked App Insights component
+                component_url = mock_get.call_args_list[1][0][1]
+                assert component_url.startswith(f"https://management.azure.com{resource_id}?")
+
+                # Both requests go through the same HTTP session
+                sessions = {call[0][0] for call in mock_get.call_args_list}
+                assert len(sessions) == 1
+
+    @pytest.mark.asyncio
+    async def test_arm_token_reused_until_expiry(self):
+        """Test that the ARM token is acquired once and reused while valid."""
+        credential = AsyncMock()
+        credential.__aenter__.return_value = credential
+        credential.get_token.return_value = Mock(token="token", expires_on=time.time() + 3600)
+
+        with patch("azure.identity.aio.DefaultAzureCredential", return_value=credential):
+            first = await agent.observability._get_arm_token()
+            second = await agent.observability._get_arm_token()
+
+            assert first == second == "token"
+            credential.get_token.assert_called_once()
+
+            # An expiring token is refreshed
+            agent.observability._arm_token = ("old", time.time() + 30)
+            assert await agent.observability._get_arm_token() == "token"
+            assert credential.get_token.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_app_insights_invalid_resource_id(self):
+        """Test that a malformed App Insights resource ID is rejected."""
+        resource_id = "/subscriptions/test-sub/resourceGroups/ai-rg/providers/other/thing/x/y"
+        with patch("agent.observability._get_arm_token", return_value="token"):
+            with patch("agent.observability._arm_get_json") as mock_get:
+                mock_get.return_value = {"properties": {"applicationInsights": resource_id}}
+
+                result = await fetch_app_insights_from_workspace(
+                    subscription_id="test-sub",
+                    resource_group="test-rg",
+                    workspace_name="test-workspace",
+                )
+
+                assert result is None
+                mock_get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_fetch_app_insights_no_linked_resource(self):
+        """Test that a workspace without App Insights returns None."""
+        with patch("agent.observability._get_arm_token", return_value="token"):
+            with patch("agent.observability._arm_get_json") as mock_get:
+                mock_get.return_value = {"properties": {}}
+
+                result = await fetch_app_insights_from_workspace(
+                    subscription_id="test-sub",
+                    resource_group="test-rg",
+                    workspace_name="test-workspace",
+                )
+
+                assert result is None
+                mock_get.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_fetch_app_insights_timeout_handled_gracefully(self):
         """Test that Azure API timeout is handled gracefully without warning logs."""
-        with patch("agent.observability.subprocess.run") as mock_run:
+        with patch("agent.observability._get_arm_token") as mock_token:
             # Simulate timeout exception
-            mock_run.side_effect = subprocess.TimeoutExpired(cmd=["az", "rest"], timeout=10)
+            mock_token.side_effect = asyncio.TimeoutError()
+
+            with patch("agent.observability.logger") as mock_logger:
+                result = await fetch_app_insights_from_workspace(
+                    subscription_id="test-sub",
+                    resource_group="test-rg",
+                    workspace_name="test-workspace",
+                )
 
-            result = await fetch_app_insights_from_workspace(
-                subscription_id="test-sub",
-                resource_group="test-rg",
-                workspace_name="test-workspace",
-            )
+                # Should return None on timeout
+                assert result is None
 
-            # Should return None on timeout
-            assert result is None
+                # Timeouts are expected when offline - not worth a warning
+                mock_logger.warning.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fetch_app_insights_timeout_is_not_retried_immediately(self):
+        """Test that a timed-out workspace is skipped on the next call."""
+        with patch(
+            "agent.observability._discover_app_insights_connection_string",
+            side_effect=asyncio.TimeoutError(),
+        ) as mock_discover:
+            first = await fetch_app_insights_from_workspace("sub", "rg", "ws")
+            second = await fetch_app_insights_from_workspace("sub", "rg", "ws")
+
+            assert first is None and second is None
+            mock_discover.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_fetch_app_insights_bounded_by_discovery_budget(self):
+        """Test that slow discovery is abandoned after OSDU_OBS_DISCOVERY_TIMEOUT_S."""
+
+        async def slow_discovery(*args):
+            await asyncio.sleep(10)
+
+        with patch.dict(os.environ, {"OSDU_OBS_DISCOVERY_TIMEOUT_S": "0.01"}):
+            with patch(
+                "agent.observability._discover_app_insights_connection_string",
+                side_effect=slow_discovery,
+            ):
+                result = await fetch_app_insights_from_workspace("sub", "rg", "ws")
 
-            # Should have attempted to call az rest
-            mock_run.assert_called_once()
+        assert result is None
 
     @pytest.mark.asyncio
     async def test_fetch_app_insights_generic_exception_logged_as_warning(self):
         """Test that non-timeout exceptions are logged as warnings."""
-        with patch("agent.observability.subprocess.run") as mock_run:
+        with patch("agent.observability._get_arm_token") as mock_token:
             # Simulate generic exception
-            mock_run.side_effect = RuntimeError("Unexpected error")
+            mock_token.side_effect = RuntimeError("Unexpected error")
 
-            result = await fetch_app_insights_from_workspace(
-                subscription_id="test-sub",
-                resource_group="test-rg",
-                workspace_name="test-workspace",
-            )
+            with patch("agent.observability.logger") as mock_logger:
+                result = await fetch_app_insights_from_workspace(
+                    subscription_id="test-sub",
+                    resource_group="test-rg",
+                    workspace_name="test-workspace",
+                )
+
+                # Should return None on error
+                assert result is None
+                mock_logger.warning.assert_called_once()
+
+
+class TestFoundryObservabilitySetup:
+    """Tests for Azure AI Foundry auto-configuration."""
 
-            # Should return None on error
-            assert result is None
+    @pytest.mark.asyncio
+    async def test_discovery_requires_opt_in(self):
+        """Test that an endpoint alone does not trigger discovery."""
+        endpoint = "https://ws.eastus.api.azureml.ms"
+        with patch.dict(os.environ, {"AZURE_AI_PROJECT_ENDPOINT": endpoint}, clear=True):
+            with patch("agent.observability.fetch_app_insights_from_workspace") as mock_fetch:
+                result = await setup_azure_ai_foundry_observability()
+
+                assert result is None
+                mock_fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_discovery_with_project_connection_string(self):
+        """Test that explicit workspace coordinates configure observability."""
+        with patch.dict(
+            os.environ,
+            {"AZURE_AI_PROJECT_CONNECTION_STRING": "eastus.api.azureml.ms;sub;rg;ws"},
+            clear=True,
+        ):
+            with (
+                patch(
+                    "agent.observability.fetch_app_insights_from_workspace",
+                    return_value="InstrumentationKey=abc",
+                ) as mock_fetch,
+                patch("agent.observability.setup_observability") as mock_setup,
+            ):
+                result = await setup_azure_ai_foundry_observability()
+
+                assert result == "InstrumentationKey=abc"
+                mock_fetch.assert_called_once_with("sub", "rg", "ws")
+                mock_setup.assert_called_once()
 
 
 class TestToolCallMetrics:
@@ -225,6 +446,25 @@ class TestToolCallMetrics:
                 # Verify duration still recorded
                 mock_histogram.record.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_record_tool_call_soon_defers_to_next_iteration(self):
+        """Test that metric recording is scheduled on the running loop."""
+        with patch("agent.observability.record_tool_call") as mock_record:
+            record_tool_call_soon("list_issues", 1.5, "success")
+
+            # Not recorded until the loop gets control back
+            mock_record.assert_not_called()
+
+            await asyncio.sleep(0)
+            mock_record.assert_called_once_with("list_issues", 1.5, "success")
+
+    def test_record_tool_call_soon_without_loop(self):
+        """Test that metrics are recorded immediately outside an event loop."""
+        with patch("agent.observability.record_tool_call") as mock_record:
+            record_tool_call_soon("list_issues", 1.5, "error")
+
+            mock_record.assert_called_once_with("list_issues", 1.5, "error")
+
 
 class TestWorkflowMetrics:
     """Tests for workflow metrics recording."""
@@ -257,6 +497,19 @@ class TestWorkflowMetrics:
                 # Verify histogram was called
                 mock_histogram.record.assert_called_once_with(10.0, {"workflow": "test"})
 
+    def test_record_workflow_run_reuses_attributes(self):
+        """Test that repeated runs share the cached attribute dicts."""
+        with patch("agent.observability.workflow_runs_counter") as mock_counter:
+            with patch("agent.observability.workflow_duration_histogram") as mock_histogram:
+                record_workflow_run("vulns", 1.0, "success", service_count=2)
+                record_workflow_run("vulns", 2.0, "success", service_count=2)
+
+                first, second = mock_counter.add.call_args_list
+                assert first[0][1] is second[0][1]
+
+                first, second = mock_histogram.record.call_args_list
+                assert first[0][1] is second[0][1]
+
 
 class TestTriageMetrics:
     """Tests for triage scan metrics recording."""
@@ -294,6 +547,17 @@ class TestTriageMetrics:
                 # No vulnerability counters should be incremented
                 mock_vuln_counter.add.assert_not_called()
 
+    def test_record_vulns_scan_reuses_severity_attributes(self):
+        """Test that repeated scans share the same severity attribute dicts."""
+        with patch("agent.observability.vulns_scans_counter"):
+            with patch("agent.observability.vulns_vulnerabilities_counter") as mock_vuln_counter:
+                record_vulns_scan("partition", critical=1, high=0, medium=0)
+                record_vulns_scan("partition", critical=2, high=0, medium=0)
+
+                first, second = mock_vuln_counter.add.call_args_list
+                assert first[0][1] == {"severity": "critical", "service": "partition"}
+                assert first[0][1] is second[0][1]
+
     def test_record_vulns_scan_error_status(self):
         """Test recording failed triage scan."""
         with patch("agent.observability.vulns_scans_counter") as mock_scan_counter:
@@ -386,6 +650,37 @@ class TestLLMMetrics:
                 assert mock_token_counter.add.call_count == 2
 
 
+class TestToolSampling:
+    """Tests for tool span sampling."""
+
+    def setup_method(self):
+        """Reset per-tool sampling counters before each test."""
+        agent.observability._tool_sample_counts.clear()
+
+    def test_unlisted_tool_always_sampled(self):
+        """Test that tools without a sample rate are always traced."""
+        assert all(should_sample_tool("gh_list_issues") for _ in range(5))
+
+    def test_sample_rates_name_registered_tools(self):
+        """Test that every sampled tool name matches a registered filesystem tool."""
+        from agent.filesystem import create_filesystem_tools
+
+        tool_names = {tool.__name__ for tool in create_filesystem_tools(Mock())}
+        assert set(agent.observability.TOOL_SAMPLE_RATES) <= tool_names
+
+    def test_sampled_tool_traces_every_nth_call(self):
+        """Test deterministic sampling for high-frequency tools."""
+        with patch.dict(agent.observability.TOOL_SAMPLE_RATES, {"read_file": 0.25}):
+            decisions = [should_sample_tool("read_file") for _ in range(8)]
+
+        assert decisions == [True, False, False, False, True, False, False, False]
+
+    def test_zero_rate_never_sampled(self):
+        """Test that a zero rate disables spans for a tool."""
+        with patch.dict(agent.observability.TOOL_SAMPLE_RATES, {"read_file": 0.0}):
+            assert not should_sample_tool("read_file")
+
+
 class TestTracerAndMeter:
     """Tests for tracer and meter initialization."""
 
@@ -442,8 +737,72 @@ class TestTracerAndMeter:
 
     def test_otel_service_name_set_automatically(self):
         """Test that OTEL_SERVICE_NAME is set to 'osdu-agent' by default."""
-        # The observability module should set this on import
-        assert os.getenv("OTEL_SERVICE_NAME") == "osdu-agent"
+        agent.observability._observability_initialized = False
+
+        with patch("agent.observability.setup_observability"):
+            with patch.dict(os.environ, {"OTLP_ENDPOINT": "http://localhost:4317"}, clear=True):
+                # Set when observability is initialized, not on import
+                initialize_observability()
+
+                assert os.getenv("OTEL_SERVICE_NAME") == "osdu-agent"
+
+        agent.observability._observability_initialized = False
+
+    def test_otel_service_name_not_overridden(self):
+        """Test that an explicit OTEL_SERVICE_NAME is kept."""
+        agent.observability._observability_initialized = False
+
+        with patch("agent.observability.setup_observability"):
+            with patch.dict(
+                os.environ,
+                {"OTLP_ENDPOINT": "http://localhost:4317", "OTEL_SERVICE_NAME": "custom"},
+                clear=True,
+            ):
+                initialize_observability()
+
+                assert os.getenv("OTEL_SERVICE_NAME") == "custom"
+
+        agent.observability._observability_initialized = False
+
+
+class TestUserSessionContext:
+    """Tests for user/session context propagation."""
+
+    def setup_method(self):
+        """Start each test with an empty user/session context."""
+        agent.observability._user_session_context.set(agent.observability._EMPTY_CONTEXT)
+
+    def test_context_merges_updates(self):
+        """Test that setters merge into a read-only context mapping."""
+        set_user_context(user_id="alice")
+        set_session_context(session_id="s1", thread_id=None)
+        set_custom_attributes(environment="dev")
+
+        context = get_user_session_context()
+        assert dict(context) == {"user.id": "alice", "session.id": "s1", "environment": "dev"}
+
+        with pytest.raises(TypeError):
+            context["user.id"] = "bob"  # type: ignore[index]
+
+    def test_span_processor_applies_context(self):
+        """Test that the span processor copies context attributes onto new spans."""
+        set_user_context(user_id="alice", user_email="alice@example.com")
+        span = Mock()
+
+        UserSessionSpanProcessor().on_start(span)
+
+        span.set_attributes.assert_called_once_with(
+            {"user.id": "alice", "user.email": "alice@example.com"}
+        )
+
+    def test_span_processor_skips_when_context_never_set(self):
+        """Test that spans are untouched until a user/session context is set."""
+        span = Mock()
+
+        with patch("agent.observability._user_session_context_used", False):
+            UserSessionSpanProcessor().on_start(span)
+
+        span.set_attributes.assert_not_called()
 
 
 class TestObservabilityStatus:
@@ -565,3 +924,21 @@ class TestObservabilityStatus:
 
         with patch.dict(os.environ, {}, clear=True):
             assert is_observability_active() is False
+
+    def test_status_uses_config_snapshot(self):
+        """Test that the environment is read once and the instrumentation key is masked."""
+        with patch.dict(
+            os.environ,
+            {"APPLICATIONINSIGHTS_CONNECTION_STRING": "InstrumentationKey=abc;IngestionEndpoint=x"},
+            clear=True,
+        ):
+            assert get_observability_status()["app_insights"] is True
+
+        # Environment changes after the first read are not picked up until reset
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_observability_status()["app_insights"] is True
+            assert agent.observability._cfg().masked_key == "***abc"
+
+            agent.observability._cfg.cache_clear()
+            assert get_observability_status()["app_insights"] is False
+            assert agent.observability._cfg().masked_key is None
@@ -6,6 +6,7 @@ import pytest
 
 from agent.config import AgentConfig
 from agent.mcp import OsduMCPManager
+from agent.mcp.base import _command_paths, build_subprocess_env
 
 
 @pytest.fixture
@@ -14,6 +15,14 @@ def config():
     return AgentConfig()
 
 
+@pytest.fixture(autouse=True)
+def clear_which_cache():
+    """Reset memoized command lookups between tests."""
+    _command_paths.clear()
+    yield
+    _command_paths.clear()
+
+
 @pytest.fixture
 def mock_env_vars(monkeypatch):
     """Mock required environment variables."""
@@ -33,7 +42,7 @@ class TestOsduMCPManager:
         assert manager.mcp_tool is None
         assert manager._validated is False
 
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     def test_validate_prerequisites_success(self, mock_which, config):
         """Test successful prerequisite validation."""
         mock_which.return_value = "/usr/local/bin/uvx"
@@ -45,7 +54,7 @@ class TestOsduMCPManager:
         assert manager._validated is True
         mock_which.assert_called_once_with("uvx")
 
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     def test_validate_prerequisites_failure(self, mock_which, config):
         """Test failed prerequisite validation."""
         mock_which.return_value = None
@@ -57,6 +66,16 @@ class TestOsduMCPManager:
         assert manager._validated is False
         mock_which.assert_called_once_with("uvx")
 
+    @patch("agent.mcp.base.shutil.which")
+    def test_missing_command_is_looked_up_again(self, mock_which, config):
+        """Test that a failed lookup is not cached, so a later install is found."""
+        mock_which.side_effect = [None, "/usr/local/bin/uvx"]
+
+        assert OsduMCPManager(config).validate_prerequisites() is False
+        assert OsduMCPManager(config).validate_prerequisites() is True
+        assert OsduMCPManager(config).validate_prerequisites() is True
+        assert mock_which.call_count == 2
+
     def test_validate_required_env_vars_all_present(self, config, mock_env_vars):
         """Test environment variable validation with all vars present."""
         manager = OsduMCPManager(config)
@@ -121,7 +140,7 @@ class TestOsduMCPManager:
         assert "OSDU_MCP_SERVER_URL" in missing
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     async def test_context_manager_prerequisites_not_met(self, mock_which, config):
         """Test context manager when prerequisites not met."""
         mock_which.return_value = None
@@ -133,7 +152,7 @@ class TestOsduMCPManager:
             assert m.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     async def test_context_manager_missing_env_vars(self, mock_which, config, monkeypatch):
         """Test context manager when environment variables are missing."""
         mock_which.return_value = "/usr/local/bin/uvx"
@@ -151,7 +170,7 @@ class TestOsduMCPManager:
             assert m.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.osdu_mcp.QuietMCPStdioTool")
     async def test_context_manager_success(
         self, mock_mcp_tool_class, mock_which, config, mock_env_vars
@@ -172,7 +191,7 @@ class TestOsduMCPManager:
         mock_tool_instance.__aexit__.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.osdu_mcp.QuietMCPStdioTool")
     async def test_context_manager_file_not_found(
         self, mock_mcp_tool_class, mock_which, config, mock_env_vars
@@ -191,7 +210,7 @@ class TestOsduMCPManager:
             assert m.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.osdu_mcp.QuietMCPStdioTool")
     async def test_context_manager_general_error(
         self, mock_mcp_tool_class, mock_which, config, mock_env_vars
@@ -210,7 +229,7 @@ class TestOsduMCPManager:
             assert m.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.osdu_mcp.QuietMCPStdioTool")
     async def test_context_manager_cleanup_error(
         self, mock_mcp_tool_class, mock_which, config, mock_env_vars
@@ -233,7 +252,7 @@ class TestOsduMCPManager:
         assert manager.tools == []
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.osdu_mcp.QuietMCPStdioTool")
     async def test_tools_property_with_tool(
         self, mock_mcp_tool_class, mock_which, config, mock_env_vars
@@ -255,7 +274,7 @@ class TestOsduMCPManager:
         assert manager.is_available is False
 
     @pytest.mark.asyncio
-    @patch("agent.mcp.osdu_mcp.shutil.which")
+    @patch("agent.mcp.base.shutil.which")
     @patch("agent.mcp.osdu_mcp.QuietMCPStdioTool")
     async def test_is_available_true(self, mock_mcp_tool_class, mock_which, config, mock_env_vars):
         """Test is_available property when available."""
@@ -310,3 +329,35 @@ class TestOsduMCPConfig:
         monkeypatch.setenv("OSDU_MCP_VERSION", "osdu-mcp-server==2.0.0")
         config = AgentConfig()
         assert any("osdu-mcp-server==2.0.0" in arg for arg in config.osdu_mcp_args)
+
+
+class TestOsduSubprocessEnv:
+    """Test OSDU MCP subprocess environment filtering."""
+
+    def test_build_subprocess_env_filters_unrelated_vars(self, monkeypatch, mock_env_vars):
+        """Only OSDU, Azure and common variables should reach the subprocess."""
+        monkeypatch.setenv("AZURE_CLIENT_SECRET", "secret")
+        monkeypatch.setenv("UNRELATED_SETTING", "value")
+
+        env = build_subprocess_env(
+            OsduMCPManager.REQUIRED_ENV_VARS + OsduMCPManager.OPTIONAL_ENV_VARS,
+            prefixes=("OSDU_MCP_", "AZURE_"),
+        )
+
+        assert env["OSDU_MCP_SERVER_URL"] == "https://test.osdu.org"
+        assert env["AZURE_CLIENT_SECRET"] == "secret"
+        assert "UNRELATED_SETTING" not in env
+
+    def test_build_env_forwards_managed_identity_vars(self, monkeypatch, config, mock_env_vars):
+        """Managed identity endpoints must reach the subprocess for DefaultAzureCredential."""
+        monkeypatch.setenv("IDENTITY_ENDPOINT", "http://localhost:42356/msi/token")
+        monkeypatch.setenv("IDENTITY_HEADER", "header")
+        monkeypatch.setenv("MSI_ENDPOINT", "http://localhost:42356/msi/token")
+        monkeypatch.setenv("IMDS_ENDPOINT", "http://169.254.169.254")
+
+        env = OsduMCPManager(config)._build_env()
+
+        assert env["IDENTITY_ENDPOINT"] == "http://localhost:42356/msi/token"
+        assert env["IDENTITY_HEADER"] == "header"
+        assert env["MSI_ENDPOINT"] == "http://localhost:42356/msi/token"
+        assert env["IMDS_ENDPOINT"] == "http://169.254.169.254"
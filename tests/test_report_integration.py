@@ -1,11 +1,12 @@
 """Integration tests for report workflow with mocked GitLab API."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from agent.gitlab.analytics import GitLabContributionAnalyzer
+from agent.gitlab.analytics import GitLabContributionAnalyzer, clear_analysis_cache
 from agent.workflows.report_workflow import (
     _generate_adr_report,
     _generate_comparison_report,
@@ -15,6 +16,14 @@ from agent.workflows.report_workflow import (
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_analysis_cache():
+    """Start every test without cached analysis results."""
+    clear_analysis_cache()
+    yield
+    clear_analysis_cache()
+
+
 # Sample GitLab data fixtures
 @pytest.fixture
 def sample_merge_requests():
@@ -194,6 +203,43 @@ async def test_generate_comparison_report_with_mocks(sample_merge_requests, samp
     assert "Top" in output  # Top contributors table
 
 
+@pytest.mark.asyncio
+async def test_generate_comparison_report_fetches_adrs_with_periods(
+    sample_adrs, sample_merge_requests, sample_discussions
+):
+    """Test that ADRs for the current period are fetched alongside period analysis."""
+    from io import StringIO
+
+    from rich.console import Console
+
+    from agent.gitlab.report_formatter import ReportFormatter
+
+    mock_client = MagicMock()
+    mock_client.get_merge_requests_for_period = AsyncMock(return_value=sample_merge_requests)
+    mock_client.get_merge_request_discussions = AsyncMock(return_value=sample_discussions)
+    mock_client.get_merge_request_approvals = AsyncMock(return_value=["alice"])
+    mock_client.get_issues_by_labels = AsyncMock(return_value=sample_adrs)
+    analyzer = GitLabContributionAnalyzer(MagicMock(), mock_client)
+
+    string_buffer = StringIO()
+    formatter = ReportFormatter(Console(file=string_buffer, force_terminal=True, width=120))
+
+    with patch.object(analyzer, "analyze_adrs", wraps=analyzer.analyze_adrs) as mock_adrs:
+        await _generate_comparison_report(
+            analyzer=analyzer,
+            formatter=formatter,
+            project_paths=["test/project"],
+            days=30,
+            num_periods=2,
+        )
+
+    # Only the current (first) period is analyzed for ADRs
+    mock_adrs.assert_called_once()
+    _, start_date, end_date = mock_adrs.call_args.args
+    assert (end_date - start_date).days == 30
+    assert "ADR" in string_buffer.getvalue()
+
+
 @pytest.mark.asyncio
 async def test_generate_adr_report_with_mocks(sample_adrs):
     """Test ADR report generation with mocked data."""
@@ -332,6 +378,133 @@ async def test_run_report_workflow_integration():
             assert "mode" in result.detailed_results
 
 
+@pytest.mark.asyncio
+async def test_run_report_workflow_resolves_upstream_urls_concurrently():
+    """Test that upstream URLs are looked up in parallel and unresolved services skipped."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_upstream_url(service):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return None if service == "missing" else f"https://gitlab.com/test/{service}"
+
+    with patch("agent.workflows.report_workflow.GitLabDirectClient") as mock_client_class:
+        with patch("agent.workflows.report_workflow.AgentConfig"):
+            mock_client = MagicMock()
+            mock_client_class.return_value = mock_client
+            mock_client._get_upstream_url = get_upstream_url
+            mock_client._parse_project_path = MagicMock(side_effect=lambda url: url[19:])
+            mock_client.get_merge_requests_for_period = AsyncMock(return_value=[])
+            mock_client.get_issues_by_labels = AsyncMock(return_value=[])
+
+            result = await run_report_workflow(
+                args_string="contributions 7", services=["alpha", "missing", "beta"]
+            )
+
+            assert result.status == "success"
+            assert max_in_flight == 3
+            calls = mock_client.get_merge_requests_for_period.call_args_list
+            assert [call.args[0] for call in calls] == ["test/alpha", "test/beta"]
+
+
+@pytest.mark.asyncio
+async def test_run_report_workflow_closes_gitlab_client():
+    """Test that one GitLab client serves the whole report and is closed afterwards."""
+    with patch("agent.workflows.report_workflow.GitLabDirectClient") as mock_client_class:
+        with patch("agent.workflows.report_workflow.AgentConfig"):
+            mock_client = MagicMock()
+            mock_client_class.return_value = mock_client
+            mock_client._get_upstream_url = AsyncMock(
+                return_value="https://gitlab.com/test/project"
+            )
+            mock_client._parse_project_path = MagicMock(return_value="test/project")
+            mock_client.get_merge_requests_for_period = AsyncMock(return_value=[])
+            mock_client.get_issues_by_labels = AsyncMock(return_value=[])
+
+            result = await run_report_workflow(args_string="compare 7", services=["test-service"])
+
+            assert result.status == "success"
+            mock_client_class.assert_called_once()
+            mock_client.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_report_workflow_authenticates_off_event_loop():
+    """Test that GitLab authentication is deferred and run alongside URL lookups."""
+    with patch("agent.workflows.report_workflow.GitLabDirectClient") as mock_client_class:
+        with patch("agent.workflows.report_workflow.AgentConfig"):
+            mock_client = MagicMock()
+            mock_client_class.return_value = mock_client
+            mock_client._get_upstream_url = AsyncMock(return_value=None)
+
+            await run_report_workflow(args_string="compare 7", services=["test-service"])
+
+            assert mock_client_class.call_args.kwargs == {"authenticate": False}
+            mock_client.authenticate.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_consecutive_report_modes_share_cached_analyses():
+    """Test that a contributions report run minutes after a comparison reuses its analyses."""
+    clock = [datetime(2025, 10, 15, 10, 1, 10, tzinfo=timezone.utc)]
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock[0]
+
+    with (
+        patch("agent.workflows.report_workflow.GitLabDirectClient") as mock_client_class,
+        patch("agent.workflows.report_workflow.AgentConfig"),
+        patch("agent.workflows.report_workflow.datetime", FrozenDatetime),
+    ):
+        mock_client = MagicMock()
+        mock_client_class.return_value = mock_client
+        mock_client._get_upstream_url = AsyncMock(return_value="https://gitlab.com/test/project")
+        mock_client._parse_project_path = MagicMock(return_value="test/project")
+        mock_client.get_merge_requests_for_period = AsyncMock(return_value=[])
+        mock_client.get_issues_by_labels = AsyncMock(return_value=[])
+
+        compare = await run_report_workflow(args_string="compare 30", services=["test-service"])
+        fetches = mock_client.get_merge_requests_for_period.await_count
+
+        # Run again in the same 5-minute window
+        clock[0] = datetime(2025, 10, 15, 10, 3, 50, tzinfo=timezone.utc)
+        contributions = await run_report_workflow(
+            args_string="contributions 30", services=["test-service"]
+        )
+
+    assert compare.status == contributions.status == "success"
+    # The current 30-day period was analyzed by the comparison and served from the cache
+    assert mock_client.get_merge_requests_for_period.await_count == fetches
+
+
+def test_executive_summary_handles_missing_baseline():
+    """Test that trends without a baseline render as n/a instead of crashing."""
+    from io import StringIO
+
+    from rich.console import Console
+
+    from agent.gitlab.models import PeriodStats
+    from agent.gitlab.report_formatter import ReportFormatter
+
+    string_buffer = StringIO()
+    formatter = ReportFormatter(Console(file=string_buffer, width=120))
+
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    end = datetime.now(timezone.utc)
+    current = PeriodStats(start_date=start, end_date=end, days=30)
+    previous = PeriodStats(start_date=start - timedelta(days=30), end_date=start, days=30)
+
+    formatter.format_executive_summary(current, previous)
+
+    assert "n/a from previous period" in string_buffer.getvalue()
+
+
 @pytest.mark.asyncio
 async def test_report_formatter_methods():
     """Test report formatter methods with sample data."""
@@ -437,6 +610,282 @@ async def test_analyze_trends_multiple_periods(sample_merge_requests, sample_dis
         assert period_stats.days == 30
 
 
+@pytest.mark.asyncio
+async def test_analyze_trends_runs_periods_concurrently():
+    """Test that trend periods are analyzed in parallel, not one after another."""
+    analyzer = GitLabContributionAnalyzer(MagicMock(), MagicMock())
+    started = asyncio.Event()
+    in_flight = 0
+
+    async def analyze_contributions(project_paths, start_date, end_date):
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == 3:
+            started.set()
+        # Each period waits until all periods have started
+        await asyncio.wait_for(started.wait(), timeout=1)
+        return MagicMock(start_date=start_date)
+
+    now = datetime.now(timezone.utc)
+    periods = [(now - timedelta(days=30 * (i + 1)), now - timedelta(days=30 * i)) for i in range(3)]
+
+    with patch.object(analyzer, "analyze_contributions", side_effect=analyze_contributions):
+        result = await analyzer.analyze_trends(["test/project"], periods)
+
+    # Results keep period order
+    assert [p.start_date for p in result] == [start for start, _ in periods]
+
+
+@pytest.mark.asyncio
+async def test_stream_contributions_yields_in_completion_order():
+    """Test that projects are streamed as they finish and failures are skipped."""
+    from agent.gitlab.models import ProjectStats
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), MagicMock())
+    slow_release = asyncio.Event()
+
+    async def analyze_project(project_path, start_date, end_date):
+        if project_path == "slow":
+            await slow_release.wait()
+        if project_path == "broken":
+            raise RuntimeError("boom")
+        return ProjectStats(project_name=project_path, project_path=project_path)
+
+    now = datetime.now(timezone.utc)
+    seen = []
+    with patch.object(analyzer, "_analyze_project_contributions", side_effect=analyze_project):
+        async for project_path, _ in analyzer.stream_contributions(
+            ["slow", "broken", "fast"], now - timedelta(days=30), now
+        ):
+            seen.append(project_path)
+            slow_release.set()
+
+    assert seen == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_contributions_reports_progress():
+    """Test that progress is reported per project and the breakdown keeps project order."""
+    from agent.gitlab.models import ProjectStats
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), MagicMock())
+
+    async def analyze_project(project_path, start_date, end_date):
+        # Later projects finish first
+        await asyncio.sleep(0.01 if project_path == "a/b" else 0)
+        return ProjectStats(project_name=project_path, project_path=project_path)
+
+    now = datetime.now(timezone.utc)
+    progress = []
+    with patch.object(analyzer, "_analyze_project_contributions", side_effect=analyze_project):
+        result = await analyzer.analyze_contributions(
+            ["a/b", "c/d"],
+            now - timedelta(days=30),
+            now,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+    assert progress == [(1, 2), (2, 2)]
+    assert list(result.project_breakdown) == ["a/b", "c/d"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_contributions_progress_counts_failed_projects():
+    """Test that failed projects still advance progress to the total."""
+    from agent.gitlab.models import ProjectStats
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), MagicMock())
+
+    async def analyze_project(project_path, start_date, end_date):
+        if project_path == "broken":
+            raise RuntimeError("boom")
+        return ProjectStats(project_name=project_path, project_path=project_path)
+
+    now = datetime.now(timezone.utc)
+    progress = []
+    with patch.object(analyzer, "_analyze_project_contributions", side_effect=analyze_project):
+        result = await analyzer.analyze_contributions(
+            ["a/b", "broken"],
+            now - timedelta(days=30),
+            now,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+    assert progress == [(1, 2), (2, 2)]
+    assert list(result.project_breakdown) == ["a/b"]
+
+
+@pytest.mark.asyncio
+async def test_adr_fetch_shared_across_windows(sample_adrs):
+    """Test that ADR issues are fetched once per project and reused for other windows."""
+    mock_client = MagicMock()
+    mock_client.get_issues_by_labels = AsyncMock(return_value=sample_adrs)
+    analyzer = GitLabContributionAnalyzer(MagicMock(), mock_client)
+
+    end = datetime.now(timezone.utc)
+    recent = await analyzer.analyze_adrs(["test/project"], end - timedelta(days=30), end)
+    fetches = mock_client.get_issues_by_labels.await_count
+
+    # A different window (e.g. ADR mode after a comparison report) reuses the fetch
+    result = await analyzer.analyze_adrs(["test/project"], end - timedelta(days=90), end)
+
+    assert mock_client.get_issues_by_labels.await_count == fetches
+    assert result.total_adrs >= recent.total_adrs > 0
+
+
+@pytest.mark.asyncio
+async def test_analysis_results_are_cached(sample_merge_requests, sample_discussions):
+    """Test that repeated analyses of the same period reuse the cached result."""
+    mock_client = MagicMock()
+    mock_client.get_merge_requests_for_period = AsyncMock(return_value=sample_merge_requests)
+    mock_client.get_merge_request_discussions = AsyncMock(return_value=sample_discussions)
+    mock_client.get_merge_request_approvals = AsyncMock(return_value=[])
+    mock_client.get_issues_by_labels = AsyncMock(return_value=[])
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), mock_client)
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=30)
+
+    first = await analyzer.analyze_contributions(["a/b", "c/d"], start, end)
+    second = await analyzer.analyze_contributions(["c/d", "a/b"], start, end)
+    assert first is second
+    assert mock_client.get_merge_requests_for_period.call_count == 2  # once per project
+
+    await analyzer.analyze_adrs(["a/b"], start, end)
+    await analyzer.analyze_adrs(["a/b"], start, end)
+    assert mock_client.get_issues_by_labels.call_count == 4  # one pass over ADR labels
+
+    # A different period is analyzed again
+    await analyzer.analyze_contributions(["a/b", "c/d"], start - timedelta(days=1), end)
+    assert mock_client.get_merge_requests_for_period.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_partial_analysis_results_are_not_cached(sample_merge_requests, sample_discussions):
+    """Test that analyses with a failed project are recomputed on the next call."""
+
+    async def merge_requests_for_period(project_path, start_date, end_date, raise_errors=False):
+        if project_path == "c/d":
+            raise RuntimeError("GitLab unavailable")
+        return sample_merge_requests
+
+    async def issues_by_labels(project_path, labels, state="all", raise_errors=False):
+        if project_path == "c/d":
+            raise RuntimeError("GitLab unavailable")
+        return []
+
+    mock_client = MagicMock()
+    mock_client.get_merge_requests_for_period = AsyncMock(side_effect=merge_requests_for_period)
+    mock_client.get_merge_request_discussions = AsyncMock(return_value=sample_discussions)
+    mock_client.get_merge_request_approvals = AsyncMock(return_value=[])
+    mock_client.get_issues_by_labels = AsyncMock(side_effect=issues_by_labels)
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), mock_client)
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=30)
+
+    first = await analyzer.analyze_contributions(["a/b", "c/d"], start, end)
+    second = await analyzer.analyze_contributions(["a/b", "c/d"], start, end)
+    assert first is not second
+    assert mock_client.get_merge_requests_for_period.call_count == 4
+
+    await analyzer.analyze_adrs(["a/b", "c/d"], start, end)
+    await analyzer.analyze_adrs(["a/b", "c/d"], start, end)
+    # "a/b" issues come from the per-project cache; "c/d" fails on its first label each time
+    assert mock_client.get_issues_by_labels.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_adr_fetch_is_not_cached():
+    """Test that a GitLab error the client would swallow is not cached as "no ADRs"."""
+    from gitlab.exceptions import GitlabGetError
+
+    from agent.gitlab.direct_client import GitLabDirectClient
+
+    config = MagicMock()
+    config.gitlab_token = None
+    with patch("agent.gitlab.direct_client.gitlab.Gitlab"):
+        client = GitLabDirectClient(config)
+    client.gitlab.projects.get.side_effect = GitlabGetError("403 Forbidden", 403)
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), client)
+    end = datetime.now(timezone.utc)
+
+    first = await analyzer.analyze_adrs(["a/b"], end - timedelta(days=30), end)
+    second = await analyzer.analyze_adrs(["a/b"], end - timedelta(days=90), end)
+
+    assert first.total_adrs == second.total_adrs == 0
+    # Both analyses went back to GitLab instead of reusing the failed fetch
+    assert client.gitlab.projects.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_contribution_fetch_is_not_cached():
+    """Test that GitLab errors the client would swallow do not pin an empty period."""
+    from gitlab.exceptions import GitlabGetError
+
+    from agent.gitlab.direct_client import GitLabDirectClient
+
+    config = MagicMock()
+    config.gitlab_token = None
+    with patch("agent.gitlab.direct_client.gitlab.Gitlab"):
+        client = GitLabDirectClient(config)
+    client.gitlab.projects.get.side_effect = GitlabGetError("429 Too Many Requests", 429)
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), client)
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=30)
+
+    first = await analyzer.analyze_contributions(["a/b"], start, end)
+    second = await analyzer.analyze_contributions(["a/b"], start, end)
+
+    # The project still shows (with empty counts) but is fetched again
+    assert first is not second
+    assert not first.project_breakdown["a/b"].complete
+    assert first.contributions.total_mrs == 0
+    assert client.gitlab.projects.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_discussion_fetch_marks_project_incomplete(sample_merge_requests):
+    """Test that a failed per-MR fetch keeps the other counts but skips the cache."""
+    from gitlab.exceptions import GitlabListError
+
+    mock_client = MagicMock()
+    mock_client.get_merge_requests_for_period = AsyncMock(return_value=sample_merge_requests)
+    mock_client.get_merge_request_discussions = AsyncMock(
+        side_effect=GitlabListError("502 Bad Gateway", 502)
+    )
+    mock_client.get_merge_request_approvals = AsyncMock(return_value=[])
+
+    analyzer = GitLabContributionAnalyzer(MagicMock(), mock_client)
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=30)
+
+    first = await analyzer.analyze_contributions(["a/b"], start, end)
+    second = await analyzer.analyze_contributions(["a/b"], start, end)
+
+    assert first.contributions.total_mrs == 3
+    assert first.contributions.comments == 0
+    assert first is not second
+
+
+def test_expired_analysis_results_are_pruned_on_store():
+    """Test that storing a result drops entries whose TTL has passed."""
+    from agent.gitlab import analytics
+
+    with patch.object(analytics.time, "monotonic", return_value=1000.0):
+        analytics._store_cached_analysis(("old",), "stale")
+    with patch.object(
+        analytics.time,
+        "monotonic",
+        return_value=1000.0 + analytics._ANALYSIS_CACHE_TTL_SECONDS,
+    ):
+        analytics._store_cached_analysis(("new",), "fresh")
+
+    assert list(analytics._analysis_cache) == [("new",)]
+
+
 @pytest.mark.asyncio
 async def test_merge_contribution_stats():
     """Test merging contribution statistics."""
@@ -488,6 +937,48 @@ async def test_report_workflow_error_handling():
     assert "No services" in result.summary
 
 
+@pytest.mark.asyncio
+async def test_report_workflow_exception_recorded_on_span():
+    """Test that workflow failures are recorded on the span, with tracebacks logged at DEBUG."""
+    error = RuntimeError("config unavailable")
+
+    with patch("agent.workflows.report_workflow.AgentConfig", side_effect=error):
+        with patch("agent.workflows.report_workflow.tracer") as mock_tracer:
+            with patch("agent.workflows.report_workflow.logger") as mock_logger:
+                mock_logger.isEnabledFor.return_value = False
+                mock_span = mock_tracer.start_as_current_span.return_value.__enter__.return_value
+
+                result = await run_report_workflow(args_string="", services=["partition"])
+
+    assert result.status == "error"
+    mock_span.record_exception.assert_called_once_with(error)
+    assert mock_logger.error.call_args.kwargs == {"exc_info": False}
+
+
+@pytest.mark.asyncio
+async def test_report_workflow_early_errors_record_metrics():
+    """Test that early-exit errors are still recorded as failed workflow runs."""
+    with patch("agent.workflows.report_workflow.record_workflow_run") as mock_record:
+        result = await run_report_workflow(args_string="", services=[])
+
+    assert result.status == "error"
+    mock_record.assert_called_once()
+    workflow_type, _, status, service_count = mock_record.call_args.args
+    assert (workflow_type, status, service_count) == ("report", "error", 0)
+
+    with patch("agent.workflows.report_workflow.GitLabDirectClient") as mock_client_class:
+        with patch("agent.workflows.report_workflow.AgentConfig"):
+            with patch("agent.workflows.report_workflow.record_workflow_run") as mock_record:
+                mock_client = mock_client_class.return_value
+                mock_client._get_upstream_url = AsyncMock(return_value=None)
+
+                result = await run_report_workflow(args_string="", services=["a", "b"])
+
+    assert result.summary == "No valid GitLab projects found"
+    assert result.services == ["a", "b"]
+    assert mock_record.call_args.args[2:] == ("error", 2)
+
+
 @pytest.mark.asyncio
 async def test_adr_details_formatting():
     """Test ADR details table formatting."""
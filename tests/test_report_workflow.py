@@ -1,11 +1,12 @@
 """Tests for report workflow."""
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from agent.gitlab.models import ReportMode
 from agent.workflows.report_workflow import (
     _calculate_period_dates,
     _parse_report_arguments,
+    _trend_labels,
 )
 
 
@@ -81,6 +82,30 @@ def test_parse_report_arguments_contributions_mode():
     assert periods == 1
 
 
+def test_parse_report_arguments_periods_option():
+    """Test --periods option with a separate value."""
+    mode, days, periods = _parse_report_arguments("compare 14 --periods 3")
+    assert mode == ReportMode.COMPARISON
+    assert days == 14
+    assert periods == 3
+
+
+def test_parse_report_arguments_periods_option_without_days():
+    """Test that the --periods value is not mistaken for days."""
+    mode, days, periods = _parse_report_arguments("--periods 3")
+    assert mode == ReportMode.COMPARISON
+    assert days == 30
+    assert periods == 3
+
+
+def test_parse_report_arguments_mode_precedence():
+    """Test that adr takes precedence over other mode keywords regardless of order."""
+    mode, days, periods = _parse_report_arguments("trends 60 adr")
+    assert mode == ReportMode.ADR
+    assert days == 60
+    assert periods == 1
+
+
 def test_calculate_period_dates_single():
     """Test calculating single period."""
     periods = _calculate_period_dates(30, 1)
@@ -118,3 +143,30 @@ def test_calculate_period_dates_custom_days():
     start, end = periods[0]
     delta = (end - start).days
     assert delta == 7
+
+
+def test_calculate_period_dates_end_on_five_minute_boundary():
+    """Test that the current period ends on the last 5-minute boundary before now."""
+    before = datetime.now(timezone.utc)
+    periods = _calculate_period_dates(30, 2)
+    after = datetime.now(timezone.utc)
+
+    _, end = periods[0]
+    assert (end.minute % 5, end.second, end.microsecond) == (0, 0, 0)
+    assert before - timedelta(minutes=5) < end <= after
+
+
+def test_calculate_period_dates_explicit_end():
+    """Test that periods are anchored to a given end date."""
+    end = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    periods = _calculate_period_dates(10, 3, end)
+
+    assert periods[0] == (end - timedelta(days=10), end)
+    assert periods[2] == (end - timedelta(days=30), end - timedelta(days=20))
+
+
+def test_trend_labels():
+    """Test trend chart labels are newest-first and reused per period count."""
+    assert _trend_labels(3) == ("Current", "Month -1", "Month -2")
+    assert _trend_labels(1) == ("Current",)
+    assert _trend_labels(3) is _trend_labels(3)
@@ -1,7 +1,9 @@
 """Tests for --actions flag functionality in status command."""
 
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 
 from agent.copilot.runners.status_runner import StatusRunner
@@ -117,6 +119,29 @@ class TestStatusRunnerActionsFlag:
         assert table_printed
 
 
+class TestStatusRunnerDirectClient:
+    """Tests for StatusRunner direct mode client lifecycle."""
+
+    @pytest.mark.asyncio
+    @patch("agent.copilot.runners.status_runner.console")
+    async def test_run_direct_closes_gitlab_client(self, mock_console):
+        """Test that direct GitLab mode closes the client's pooled connections."""
+        runner = StatusRunner(None, ["partition"], providers=["Azure"])
+        client = MagicMock()
+        client.__aenter__.return_value = client
+        client.get_all_status = AsyncMock(return_value={"services": {}})
+
+        with (
+            patch("agent.config.AgentConfig"),
+            patch("agent.gitlab.direct_client.GitLabDirectClient", return_value=client),
+            patch.object(runner, "display_status"),
+        ):
+            assert await runner.run_direct() == 0
+
+        client.get_all_status.assert_awaited_once()
+        client.__aexit__.assert_awaited_once()
+
+
 class TestStatusWorkflowActionsFlag:
     """Tests for run_status_workflow with show_actions parameter."""
 
@@ -2,6 +2,7 @@
 
 from unittest.mock import patch
 
+import pytest
 
 from agent.utils.terminal import (
     clear_screen,
@@ -10,6 +11,16 @@ from agent.utils.terminal import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_detection_cache():
+    """Re-run terminal detection in every test (results are cached per process)."""
+    supports_ansi_codes.cache_clear()
+    get_clear_command.cache_clear()
+    yield
+    supports_ansi_codes.cache_clear()
+    get_clear_command.cache_clear()
+
+
 def test_supports_ansi_codes_tty():
     """Test ANSI support detection when terminal is a TTY."""
     with (
@@ -31,6 +42,14 @@ def test_supports_ansi_codes_dumb_terminal():
         assert supports_ansi_codes() is False
 
 
+def test_supports_ansi_codes_is_cached():
+    """Test that terminal detection runs only once."""
+    with patch("sys.stdout.isatty", return_value=False) as mock_isatty:
+        assert supports_ansi_codes() is False
+        assert supports_ansi_codes() is False
+        mock_isatty.assert_called_once()
+
+
 def test_get_clear_command_darwin():
     """Test clear command detection on macOS."""
     with patch("sys.platform", "darwin"):
@@ -59,11 +78,13 @@ def test_clear_screen_ansi_success():
     """Test screen clearing with ANSI escape codes."""
     with (
         patch("agent.utils.terminal.supports_ansi_codes", return_value=True),
-        patch("builtins.print") as mock_print,
+        patch("agent.utils.terminal.sys.stdout") as mock_stdout,
+        patch("os.write") as mock_write,
     ):
+        mock_stdout.fileno.return_value = 1
         result = clear_screen()
         assert result is True
-        mock_print.assert_called_once_with("\033[2J\033[H", end="", flush=True)
+        mock_write.assert_called_once_with(1, b"\033[2J\033[H")
 
 
 def test_clear_screen_command_success():
@@ -82,7 +103,8 @@ def test_clear_screen_ansi_failure_fallback():
     """Test screen clearing falls back to command when ANSI fails."""
     with (
         patch("agent.utils.terminal.supports_ansi_codes", return_value=True),
-        patch("builtins.print", side_effect=Exception("ANSI failed")),
+        patch("agent.utils.terminal.sys.stdout"),
+        patch("os.write", side_effect=OSError("ANSI failed")),
         patch("agent.utils.terminal.get_clear_command", return_value="clear"),
         patch("os.system", return_value=0) as mock_system,
     ):
@@ -8,8 +8,10 @@ import pytest
 from agent.workflows import (
     WorkflowResult,
     WorkflowResultStore,
+    flush_pending_stores,
     get_result_store,
     reset_result_store,
+    store_result_soon,
 )
 
 
@@ -210,6 +212,95 @@ class TestWorkflowResultStore:
         assert "Grade: A" in summary
         assert "coverage" in summary.lower()
 
+    @pytest.mark.asyncio
+    async def test_get_context_summary_cached_until_store_or_clear(self, store):
+        """Test that the summary is reused until the stored results change."""
+
+        def make_result(summary):
+            return WorkflowResult(
+                workflow_type="test",
+                timestamp=datetime.now(),
+                services=["partition"],
+                status="success",
+                summary=summary,
+                detailed_results={},
+            )
+
+        await store.store(make_result("First run"))
+        first = await store.get_context_summary(limit=3)
+
+        with patch.object(store, "_build_context_summary") as mock_build:
+            assert await store.get_context_summary(limit=3) is first
+            mock_build.assert_not_called()
+
+        await store.store(make_result("Second run"))
+        assert "Second run" in await store.get_context_summary(limit=3)
+
+        await store.clear()
+        assert await store.get_context_summary(limit=3) == ""
+
+    @pytest.mark.asyncio
+    async def test_get_context_summary_with_status(self, store):
+        """Test status summary lists service status, then workflow references, then details."""
+        result = WorkflowResult(
+            workflow_type="status",
+            timestamp=datetime(2025, 10, 15, 16, 0),
+            services=["partition", "legal"],
+            status="success",
+            summary="Status gathered",
+            detailed_results={
+                "status_data": {
+                    "services": {
+                        "partition": {
+                            "workflows": {
+                                "recent": [
+                                    {
+                                        "conclusion": "failure",
+                                        "name": "CodeQL",
+                                        "path": ".github/workflows/codeql.yml",
+                                    }
+                                ]
+                            },
+                            "pull_requests": {
+                                "items": [
+                                    {"number": 7, "approved_count": 1, "mergeable_state": "clean"}
+                                ]
+                            },
+                        }
+                    }
+                }
+            },
+            pr_status={
+                "partition": {
+                    "open_prs": 1,
+                    "open_issues": 0,
+                    "pr_details": [{"number": 7, "title": "Bump spring"}],
+                },
+                "legal": {
+                    "open_prs": 0,
+                    "open_issues": 1,
+                    "issue_details": [
+                        {"number": 3, "title": "Flaky test", "assignees": ["Copilot"]}
+                    ],
+                },
+            },
+        )
+
+        await store.store(result)
+        summary = await store.get_context_summary(limit=1)
+
+        positions = [
+            summary.index(text)
+            for text in (
+                "- partition: 1 open PRs",
+                "- legal: 0 open PRs",
+                "'CodeQL' → `codeql.yml`",
+                "PR #7: Bump spring ✓ 1 approval(s) | ✓ ready to merge",
+                "Issue #3: Flaky test (Assigned: Copilot)",
+            )
+        ]
+        assert positions == sorted(positions)
+
     @pytest.mark.asyncio
     async def test_get_context_summary_empty(self, store):
         """Test context summary with no results."""
@@ -235,6 +326,53 @@ class TestWorkflowResultStore:
         results = await store.get_recent("triage", limit=100)
         assert len(results) <= 5
 
+    @pytest.mark.asyncio
+    async def test_cleanup_evicts_oldest_per_type(self, store):
+        """Test that storing past the limit evicts only that type's oldest results."""
+        test_result = WorkflowResult(
+            workflow_type="test",
+            timestamp=datetime(2025, 10, 15, 9, 0),
+            services=["partition"],
+            status="success",
+            summary="Test",
+            detailed_results={},
+        )
+        await store.store(test_result)
+
+        for i in range(7):
+            await store.store(
+                WorkflowResult(
+                    workflow_type="triage",
+                    timestamp=datetime(2025, 10, 15, 10, i),
+                    services=[f"service-{i}"],
+                    status="success",
+                    summary=f"Result {i}",
+                    detailed_results={},
+                )
+            )
+
+        results = await store.get_recent("triage", limit=100)
+        assert [r.services[0] for r in results] == [f"service-{i}" for i in range(6, 1, -1)]
+        assert await store.get_recent("test") == [test_result]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_evicts_oldest_timestamp_not_first_stored(self, store):
+        """Test that a late-arriving older result is evicted before newer ones."""
+        for minute in (5, 0, 1, 2, 3, 4):
+            await store.store(
+                WorkflowResult(
+                    workflow_type="triage",
+                    timestamp=datetime(2025, 10, 15, 10, minute),
+                    services=[f"service-{minute}"],
+                    status="success",
+                    summary=f"Result {minute}",
+                    detailed_results={},
+                )
+            )
+
+        results = await store.get_recent("triage", limit=100)
+        assert [r.services[0] for r in results] == [f"service-{i}" for i in range(5, 0, -1)]
+
     @pytest.mark.asyncio
     async def test_clear_all_results(self, store):
         """Test clearing all results."""
@@ -312,6 +450,24 @@ class TestWorkflowResultStore:
         assert stats["oldest_timestamp"] is not None
         assert stats["newest_timestamp"] is not None
 
+    @pytest.mark.asyncio
+    async def test_reads_do_not_wait_for_lock(self, store):
+        """Test that reads complete while a mutation holds the lock."""
+        result = WorkflowResult(
+            workflow_type="test",
+            timestamp=datetime.now(),
+            services=["partition"],
+            status="success",
+            summary="Test",
+            detailed_results={},
+        )
+        await store.store(result)
+
+        async with store._lock:
+            assert await store.get_recent("test") == [result]
+            assert (await store.get_stats())["total_results"] == 1
+            assert "Test" in await store.get_context_summary()
+
 
 class TestSingletonPattern:
     """Tests for singleton pattern."""
@@ -363,6 +519,53 @@ class TestSingletonPattern:
         # Should be different instances after reset
         assert store1 is not store2
 
+    @pytest.mark.asyncio
+    async def test_store_result_soon_visible_after_flush(self):
+        """Test that background stores complete once pending stores are flushed."""
+        reset_result_store()
+
+        result = WorkflowResult(
+            workflow_type="depends",
+            timestamp=datetime.now(),
+            services=["partition"],
+            status="success",
+            summary="Test",
+            detailed_results={},
+        )
+        store_result_soon(result)
+        await flush_pending_stores()
+
+        results = await get_result_store().get_recent("depends", limit=1)
+        assert results == [result]
+
+        # Nothing left pending, so flushing again returns immediately
+        await flush_pending_stores()
+
+        reset_result_store()
+
+    @pytest.mark.asyncio
+    async def test_store_result_soon_logs_failures(self):
+        """Test that a failed background store is logged rather than lost."""
+        result = WorkflowResult(
+            workflow_type="depends",
+            timestamp=datetime.now(),
+            services=["partition"],
+            status="success",
+            summary="Test",
+            detailed_results={},
+        )
+        failing_store = Mock()
+        failing_store.store = AsyncMock(side_effect=RuntimeError("disk full"))
+
+        with (
+            patch("agent.workflows.get_result_store", return_value=failing_store),
+            patch("agent.workflows.logger") as mock_logger,
+        ):
+            store_result_soon(result)
+            await flush_pending_stores()
+
+        mock_logger.error.assert_called_once()
+
 
 class TestWorkflowIntegration:
     """Integration tests for workflow functions."""
@@ -424,3 +627,58 @@ class TestWorkflowIntegration:
 
                 # Cleanup
                 reset_result_store()
+
+    @pytest.mark.asyncio
+    async def test_run_depends_workflow_copies_update_counts(self):
+        """Test that depends results hold count copies, not the tracker's live dicts."""
+        from agent.workflows.depends_workflow import run_depends_workflow
+
+        tracked = {
+            "partition": {
+                "status": "complete",
+                "details": "Done",
+                "icon": "✓",
+                "major_updates": 1,
+                "minor_updates": 2,
+                "patch_updates": 3,
+                "total_dependencies": 40,
+                "outdated_dependencies": 6,
+                "report_id": "",
+                "top_updates": [],
+                "modules": {},
+            }
+        }
+
+        with (
+            patch("agent.workflows.depends_workflow.DependsRunner") as MockRunner,
+            patch("agent.workflows.depends_workflow.get_prompt_file"),
+            patch("agent.workflows.depends_workflow.store_result_soon"),
+        ):
+            mock_runner = Mock()
+            mock_runner.run = AsyncMock(return_value=0)
+            mock_runner.tracker.services = tracked
+            mock_runner.full_output = []
+            MockRunner.return_value = mock_runner
+
+            result = await run_depends_workflow(Mock(), ["partition", "legal"], ["azure"])
+
+        assert result.dependency_updates == {
+            "partition": {
+                "major_updates": 1,
+                "minor_updates": 2,
+                "patch_updates": 3,
+                "total_dependencies": 40,
+                "outdated_dependencies": 6,
+                "status": "complete",
+            },
+            "legal": {
+                "major_updates": 0,
+                "minor_updates": 0,
+                "patch_updates": 0,
+                "total_dependencies": 0,
+                "outdated_dependencies": 0,
+                "status": "unknown",
+            },
+        }
+        assert result.dependency_updates["partition"] is not tracked["partition"]
+        assert result.summary.endswith("1M / 2m / 3p updates available")